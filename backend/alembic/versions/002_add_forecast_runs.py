@@ -0,0 +1,51 @@
+"""add forecast runs
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-16 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Create forecast_runs table; readers use the latest complete run
+    op.create_table(
+        'forecast_runs',
+        sa.Column('run_id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('status', sa.String(20), server_default=sa.text("'running'"), nullable=False),
+        sa.Column('backend', sa.String(20), nullable=True),
+        sa.Column('series_count', sa.Integer(), nullable=True),
+        sa.Column('rows_written', sa.Integer(), server_default=sa.text('0'), nullable=False),
+        sa.Column('started_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+        sa.Column('completed_at', sa.TIMESTAMP(), nullable=True),
+        sa.CheckConstraint("status IN ('running', 'complete', 'failed')", name='chk_forecast_run_status')
+    )
+
+    # Tag forecast rows with the run that wrote them
+    op.add_column(
+        'forecasts',
+        sa.Column('run_id', sa.Integer(), sa.ForeignKey('forecast_runs.run_id', ondelete='CASCADE'), nullable=True)
+    )
+
+    op.create_index('idx_forecasts_run_hospital_date', 'forecasts', ['run_id', 'hospital_id', 'forecast_date'])
+    op.create_index(
+        'idx_forecast_runs_complete',
+        'forecast_runs',
+        ['run_id'],
+        postgresql_where=sa.text("status = 'complete'")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_forecast_runs_complete', table_name='forecast_runs')
+    op.drop_index('idx_forecasts_run_hospital_date', table_name='forecasts')
+    op.drop_column('forecasts', 'run_id')
+    op.drop_table('forecast_runs')
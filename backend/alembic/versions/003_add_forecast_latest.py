@@ -0,0 +1,56 @@
+"""add forecast latest
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-16 21:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Create forecast_latest table: one row per series and date, replaced
+    # wholesale when a forecast run completes. The primary key serves both
+    # the forecast API (hospital [, blood group, component], date range)
+    # and the per-series totals used for transfer recommendations.
+    op.create_table(
+        'forecast_latest',
+        sa.Column('hospital_id', sa.String(50), sa.ForeignKey('hospitals.hospital_id'), nullable=False),
+        sa.Column('blood_group', sa.String(5), nullable=False),
+        sa.Column('component', sa.String(20), nullable=False),
+        sa.Column('forecast_date', sa.Date(), nullable=False),
+        sa.Column('predicted_units', sa.Numeric(10, 2), nullable=False),
+        sa.Column('lower_bound', sa.Numeric(10, 2), nullable=True),
+        sa.Column('upper_bound', sa.Numeric(10, 2), nullable=True),
+        sa.Column('run_id', sa.Integer(), nullable=True),
+        sa.Column('generated_at', sa.TIMESTAMP(), nullable=False),
+        sa.PrimaryKeyConstraint('hospital_id', 'blood_group', 'component', 'forecast_date', name='pk_forecast_latest')
+    )
+
+    # Backfill with the newest row per series and date, ignoring rows of
+    # runs that never completed
+    op.execute("""
+        INSERT INTO forecast_latest (
+            hospital_id, blood_group, component, forecast_date,
+            predicted_units, lower_bound, upper_bound, run_id, generated_at
+        )
+        SELECT DISTINCT ON (f.hospital_id, f.blood_group, f.component, f.forecast_date)
+            f.hospital_id, f.blood_group, f.component, f.forecast_date,
+            f.predicted_units, f.lower_bound, f.upper_bound, f.run_id, f.generated_at
+        FROM forecasts f
+        LEFT JOIN forecast_runs r ON r.run_id = f.run_id
+        WHERE f.run_id IS NULL OR r.status = 'complete'
+        ORDER BY f.hospital_id, f.blood_group, f.component, f.forecast_date,
+                 f.generated_at DESC, f.forecast_id DESC
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('forecast_latest')
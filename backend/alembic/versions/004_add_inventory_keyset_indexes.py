@@ -0,0 +1,54 @@
+"""add inventory keyset indexes
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-16 22:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Inventory pages are ordered by (unit_expiry_date, record_id). Each
+    # index puts the equality filters of a listing first and ends with the
+    # keyset, so a page is a range scan that stops after LIMIT rows. Other
+    # filter combinations (e.g. hospital + blood group) walk the closest
+    # index in order and filter the remaining columns on the way.
+    op.create_index('idx_inventory_expiry_record', 'inventory', ['unit_expiry_date', 'record_id'])
+    op.create_index(
+        'idx_inventory_hospital_expiry',
+        'inventory',
+        ['hospital_id', 'unit_expiry_date', 'record_id']
+    )
+    op.create_index(
+        'idx_inventory_hospital_group_component_expiry',
+        'inventory',
+        ['hospital_id', 'blood_group', 'component', 'unit_expiry_date', 'record_id']
+    )
+    op.create_index(
+        'idx_inventory_group_component_expiry',
+        'inventory',
+        ['blood_group', 'component', 'unit_expiry_date', 'record_id']
+    )
+
+    # The single-column indexes are prefixes of the composites above
+    op.drop_index('idx_inventory_expiry', table_name='inventory')
+    op.drop_index('idx_inventory_hospital', table_name='inventory')
+    op.drop_index('idx_inventory_blood_group', table_name='inventory')
+
+
+def downgrade() -> None:
+    op.create_index('idx_inventory_blood_group', 'inventory', ['blood_group'])
+    op.create_index('idx_inventory_hospital', 'inventory', ['hospital_id'])
+    op.create_index('idx_inventory_expiry', 'inventory', ['unit_expiry_date'])
+    op.drop_index('idx_inventory_group_component_expiry', table_name='inventory')
+    op.drop_index('idx_inventory_hospital_group_component_expiry', table_name='inventory')
+    op.drop_index('idx_inventory_hospital_expiry', table_name='inventory')
+    op.drop_index('idx_inventory_expiry_record', table_name='inventory')
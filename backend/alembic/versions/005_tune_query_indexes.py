@@ -0,0 +1,64 @@
+"""tune indexes to query patterns
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-16 23:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+SERIES_EXPIRY_COLUMNS = ['hospital_id', 'blood_group', 'component', 'unit_expiry_date', 'record_id']
+
+
+def upgrade() -> None:
+    # Per-series inventory reads (unit totals, earliest-expiry lots and the
+    # oldest-first walk when a transfer is approved) only need units beyond
+    # the key, so including it lets them run as index-only scans
+    op.drop_index('idx_inventory_hospital_group_component_expiry', table_name='inventory')
+    op.create_index(
+        'idx_inventory_hospital_group_component_expiry',
+        'inventory',
+        SERIES_EXPIRY_COLUMNS,
+        postgresql_include=['units']
+    )
+
+    # Donor searches filter eligible donors by blood group; a boolean index
+    # on eligible alone is too unselective to be used
+    op.create_index(
+        'idx_donors_eligible_blood_group',
+        'donors',
+        ['blood_group'],
+        postgresql_where=sa.text('eligible')
+    )
+    op.drop_index('idx_donors_eligible', table_name='donors')
+
+    # Forecast rows are read per series and date range; the hospital/date
+    # index is a prefix of this one
+    op.create_index(
+        'idx_forecasts_series_date',
+        'forecasts',
+        ['hospital_id', 'blood_group', 'component', 'forecast_date']
+    )
+    op.drop_index('idx_forecasts_hospital_date', table_name='forecasts')
+
+    # Transfer listings match a hospital on either side, newest first
+    op.create_index('idx_transfers_source_created', 'transfers', ['source_hospital_id', 'created_at'])
+    op.create_index('idx_transfers_destination_created', 'transfers', ['destination_hospital_id', 'created_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_transfers_destination_created', table_name='transfers')
+    op.drop_index('idx_transfers_source_created', table_name='transfers')
+    op.create_index('idx_forecasts_hospital_date', 'forecasts', ['hospital_id', 'forecast_date'])
+    op.drop_index('idx_forecasts_series_date', table_name='forecasts')
+    op.create_index('idx_donors_eligible', 'donors', ['eligible'])
+    op.drop_index('idx_donors_eligible_blood_group', table_name='donors')
+    op.drop_index('idx_inventory_hospital_group_component_expiry', table_name='inventory')
+    op.create_index('idx_inventory_hospital_group_component_expiry', 'inventory', SERIES_EXPIRY_COLUMNS)
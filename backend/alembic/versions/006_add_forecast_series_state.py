@@ -0,0 +1,43 @@
+"""add forecast series state
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Create forecast_series_state table: per series, the usage high-water
+    # marks seen by its last fit. The daily job refits a series only when
+    # usage rows newer than its marks have arrived.
+    op.create_table(
+        'forecast_series_state',
+        sa.Column('hospital_id', sa.String(50), sa.ForeignKey('hospitals.hospital_id'), nullable=False),
+        sa.Column('blood_group', sa.String(5), nullable=False),
+        sa.Column('component', sa.String(20), nullable=False),
+        sa.Column('backend', sa.String(20), nullable=False),
+        sa.Column('usage_created_at', sa.TIMESTAMP(), nullable=True),
+        sa.Column('usage_date', sa.Date(), nullable=True),
+        sa.Column('history_end', sa.Date(), nullable=False),
+        sa.Column('fit_seconds', sa.Float(), nullable=False),
+        sa.Column('run_id', sa.Integer(), sa.ForeignKey('forecast_runs.run_id', ondelete='SET NULL'), nullable=True),
+        sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+        sa.PrimaryKeyConstraint('hospital_id', 'blood_group', 'component', name='pk_forecast_series_state')
+    )
+
+    # Finds usage rows created since the oldest high-water mark
+    op.create_index('idx_usage_created_at', 'usage', ['created_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_usage_created_at', table_name='usage')
+    op.drop_table('forecast_series_state')
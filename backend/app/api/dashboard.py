@@ -1,69 +1,134 @@
 """Dashboard API endpoints."""
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
+from typing import Any, Callable, Hashable, Optional
 from app.database import get_db
+from app.repositories.hospital import HospitalRepository
 from app.services.expiry import ExpiryService
+from app.utils.dashboard_cache import dashboard_cache, etag_matches
 
 router = APIRouter()
 
+# Inventory columns returned for high-risk units
+HIGH_RISK_FIELDS = [
+    "record_id",
+    "hospital_id",
+    "blood_group",
+    "component",
+    "units",
+    "unit_expiry_date",
+    "collection_date"
+]
+
+
+def cached_response(request: Request, response: Response, key: Hashable, build: Callable[[], Any]):
+    """
+    Serve a dashboard payload from the snapshot cache with an ETag.
+    
+    Args:
+        request: Incoming request, checked for If-None-Match
+        response: Outgoing response, given ETag and Cache-Control headers
+        key: Cache key for the endpoint and scope
+        build: Callable computing the payload on a cache miss
+        
+    Returns:
+        Payload, or an empty 304 response if the client's copy is current
+    """
+    payload, etag = dashboard_cache.get(key, build)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    
+    response.headers.update(headers)
+    return payload
+
 
 @router.get("/summary")
-def get_dashboard_summary(db: Session = Depends(get_db)):
+def get_dashboard_summary(
+    request: Request,
+    response: Response,
+    hospital_id: Optional[str] = Query(None, description="Hospital ID filter"),
+    db: Session = Depends(get_db)
+):
     """
     Get dashboard summary with key metrics.
     
     Args:
+        request: Incoming request
+        response: Outgoing response
+        hospital_id: Optional hospital ID filter
         db: Database session
         
     Returns:
         Dashboard summary with expiry metrics
     """
-    expiry_service = ExpiryService(db)
-    summary = expiry_service.get_expiry_summary()
+    # Only known hospitals get a cache entry, so arbitrary IDs cannot grow the cache
+    hospital_id = (hospital_id or "").strip() or None
+    if hospital_id is not None and HospitalRepository(db).get_by_id(hospital_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Hospital {hospital_id} not found"
+        )
+    
+    def build():
+        expiry_service = ExpiryService(db)
+        return {
+            "status": "success",
+            "data": expiry_service.get_expiry_summary(hospital_id)
+        }
     
-    return {
-        "status": "success",
-        "data": summary
-    }
+    return cached_response(request, response, ("summary", hospital_id), build)
 
 
 @router.get("/high-risk-inventory")
-def get_high_risk_inventory(db: Session = Depends(get_db)):
+def get_high_risk_inventory(request: Request, response: Response, db: Session = Depends(get_db)):
     """
     Get all high-risk inventory units.
     
     Args:
+        request: Incoming request
+        response: Outgoing response
         db: Database session
         
     Returns:
         List of high-risk inventory records
     """
-    expiry_service = ExpiryService(db)
-    high_risk_units = expiry_service.get_high_risk_units()
+    def build():
+        expiry_service = ExpiryService(db)
+        high_risk_units = [
+            {field: getattr(record, field) for field in HIGH_RISK_FIELDS}
+            for record in expiry_service.get_high_risk_units()
+        ]
+        return {
+            "status": "success",
+            "count": len(high_risk_units),
+            "data": high_risk_units
+        }
     
-    return {
-        "status": "success",
-        "count": len(high_risk_units),
-        "data": high_risk_units
-    }
+    return cached_response(request, response, ("high-risk-inventory",), build)
 
 
 @router.get("/inventory-with-risk")
-def get_inventory_with_risk(db: Session = Depends(get_db)):
+def get_inventory_with_risk(request: Request, response: Response, db: Session = Depends(get_db)):
     """
     Get all inventory with risk scores.
     
     Args:
+        request: Incoming request
+        response: Outgoing response
         db: Database session
         
     Returns:
         List of inventory records with risk calculations
     """
-    expiry_service = ExpiryService(db)
-    inventory_with_risk = expiry_service.get_inventory_with_risk_scores()
+    def build():
+        expiry_service = ExpiryService(db)
+        inventory_with_risk = expiry_service.get_inventory_with_risk_scores()
+        return {
+            "status": "success",
+            "count": len(inventory_with_risk),
+            "data": inventory_with_risk
+        }
     
-    return {
-        "status": "success",
-        "count": len(inventory_with_risk),
-        "data": inventory_with_risk
-    }
+    return cached_response(request, response, ("inventory-with-risk",), build)
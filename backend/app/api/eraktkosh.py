@@ -3,7 +3,8 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.services.eraktkosh import ERaktKoshService
-from app.repositories.inventory import InventoryRepository
+from app.repositories.inventory import InventoryRepository, LOAD_MODES
+from app.schemas.inventory import InventoryCreate
 
 router = APIRouter()
 
@@ -11,6 +12,11 @@ router = APIRouter()
 @router.post("/sync/{hospital_id}")
 async def sync_inventory(
     hospital_id: str,
+    load_mode: str = Query(
+        "upsert",
+        pattern=f"^({'|'.join(LOAD_MODES)})$",
+        description="Bulk load mode: batched upsert or COPY into a staging table"
+    ),
     db: Session = Depends(get_db)
 ):
     """
@@ -18,10 +24,11 @@ async def sync_inventory(
     
     Args:
         hospital_id: Hospital ID
+        load_mode: Bulk load mode ("upsert" or "copy")
         db: Database session
         
     Returns:
-        Sync result
+        Sync result with load phase timings
     """
     service = ERaktKoshService()
     result = await service.sync_inventory(hospital_id)
@@ -33,20 +40,29 @@ async def sync_inventory(
         )
     
     # Save records to database
+    timings = {}
     if result.get("records"):
         repository = InventoryRepository(db)
         try:
-            repository.create_many(result["records"])
+            records = [InventoryCreate(**record) for record in result["records"]]
+            load_result = repository.load_many(records, mode=load_mode)
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to save records: {str(e)}"
             )
+        timings = {
+            key: round(value, 4)
+            for key, value in load_result.items()
+            if key.endswith("_seconds")
+        }
     
     return {
         "success": True,
         "hospital_id": hospital_id,
-        "records_synced": result["count"]
+        "records_synced": result["count"],
+        "load_mode": load_mode,
+        "timings": timings
     }
 
 
@@ -0,0 +1,109 @@
+"""Streaming export API endpoints."""
+from datetime import date
+from typing import Callable, Dict, Iterator, List, Optional
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app.repositories.usage import UsageRepository, EXPORT_COLUMNS as USAGE_FIELDS
+from app.services.expiry import ExpiryService, RISK_FIELDS
+from app.utils.export import EXPORT_FORMATS, EXPORT_MEDIA_TYPES, render_batches
+
+router = APIRouter()
+
+FORMAT_QUERY = Query(
+    "ndjson",
+    pattern=f"^({'|'.join(EXPORT_FORMATS)})$",
+    description="Output format: newline-delimited JSON or CSV"
+)
+
+
+def stream_batches(read: Callable[[Session], Iterator[List[Dict]]]) -> Iterator[List[Dict]]:
+    """
+    Run a batch reader on a database session owned by the stream.
+    
+    A StreamingResponse is sent after the endpoint returns, when a session
+    from ``get_db`` has already been closed, so the session is opened on
+    the first batch and closed once the stream ends or is abandoned.
+    
+    Args:
+        read: Callable returning an iterator of row dictionary lists
+        
+    Yields:
+        Row dictionary lists
+    """
+    db = SessionLocal()
+    try:
+        yield from read(db)
+    finally:
+        db.close()
+
+
+def export_response(batches, fields, fmt: str, name: str) -> StreamingResponse:
+    """
+    Stream row batches as an NDJSON or CSV attachment.
+    
+    Args:
+        batches: Iterator of row dictionary lists
+        fields: Keys to write, in column order
+        fmt: "ndjson" or "csv"
+        name: Base file name of the attachment
+        
+    Returns:
+        Streaming response rendering one batch at a time
+    """
+    return StreamingResponse(
+        render_batches(batches, fields, fmt),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'}
+    )
+
+
+@router.get("/inventory-with-risk")
+def export_inventory_with_risk(
+    format: str = FORMAT_QUERY,
+    hospital_id: Optional[str] = Query(None, description="Hospital ID filter")
+):
+    """
+    Export inventory with risk scores.
+    
+    Rows are read through a server-side cursor and scored per batch while
+    the response is being sent, so memory stays constant whatever the
+    table size.
+    
+    Args:
+        format: Output format ("ndjson" or "csv")
+        hospital_id: Optional hospital ID filter
+        
+    Returns:
+        Streaming NDJSON or CSV response
+    """
+    batches = stream_batches(lambda db: ExpiryService(db).iter_inventory_with_risk_scores(hospital_id))
+    return export_response(batches, RISK_FIELDS, format, "inventory-with-risk")
+
+
+@router.get("/usage")
+def export_usage(
+    format: str = FORMAT_QUERY,
+    hospital_id: Optional[str] = Query(None, description="Hospital ID filter"),
+    start_date: Optional[date] = Query(None, description="First usage date (inclusive)"),
+    end_date: Optional[date] = Query(None, description="Last usage date (inclusive)")
+):
+    """
+    Export usage records.
+    
+    Args:
+        format: Output format ("ndjson" or "csv")
+        hospital_id: Optional hospital ID filter
+        start_date: Optional first usage date
+        end_date: Optional last usage date
+        
+    Returns:
+        Streaming NDJSON or CSV response
+    """
+    def read(db: Session) -> Iterator[List[Dict]]:
+        for batch in UsageRepository(db).stream_rows(hospital_id, start_date, end_date):
+            yield [dict(row._mapping) for row in batch]
+    
+    batches = stream_batches(read)
+    return export_response(batches, USAGE_FIELDS, format, "usage")
@@ -3,7 +3,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from typing import Optional
 from app.database import get_db
-from app.services.forecast import ForecastService
+from app.services.forecast import ForecastService, FORECAST_BACKENDS
 
 router = APIRouter()
 
@@ -14,6 +14,11 @@ def get_forecast(
     blood_group: Optional[str] = Query(None, description="Blood group filter"),
     component: Optional[str] = Query(None, description="Component filter"),
     days: int = Query(7, ge=1, le=30, description="Number of days to forecast"),
+    backend: Optional[str] = Query(
+        None,
+        pattern=f"^({'|'.join(FORECAST_BACKENDS)})$",
+        description="prophet or statistical (defaults to FORECAST_BACKEND)"
+    ),
     db: Session = Depends(get_db)
 ):
     """
@@ -24,12 +29,13 @@ def get_forecast(
         blood_group: Optional blood group filter
         component: Optional component filter
         days: Number of days to forecast (1-30)
+        backend: Optional forecasting backend override
         db: Database session
         
     Returns:
         Forecast data with predictions and confidence intervals
     """
-    forecast_service = ForecastService(db)
+    forecast_service = ForecastService(db, backend=backend)
     
     # If blood_group and component are specified, generate forecast
     if blood_group and component:
@@ -83,6 +89,11 @@ def generate_and_store_forecast(
     blood_group: str = Query(..., description="Blood group"),
     component: str = Query(..., description="Component"),
     days: int = Query(7, ge=1, le=30, description="Number of days to forecast"),
+    backend: Optional[str] = Query(
+        None,
+        pattern=f"^({'|'.join(FORECAST_BACKENDS)})$",
+        description="prophet or statistical (defaults to FORECAST_BACKEND)"
+    ),
     db: Session = Depends(get_db)
 ):
     """
@@ -93,12 +104,13 @@ def generate_and_store_forecast(
         blood_group: Blood group
         component: Component
         days: Number of days to forecast (1-30)
+        backend: Optional forecasting backend override
         db: Database session
         
     Returns:
         Generated forecast data
     """
-    forecast_service = ForecastService(db)
+    forecast_service = ForecastService(db, backend=backend)
     
     try:
         result = forecast_service.generate_and_store_forecast(
@@ -1,14 +1,17 @@
 """Inventory API endpoints."""
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, status
+import time
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Dict, List, Optional, Union
+from app.config import settings
 from app.database import get_db
-from app.repositories.inventory import InventoryRepository
+from app.repositories.inventory import InventoryRepository, INVENTORY_SORTS, LOAD_MODES
 from app.services.ingestion import IngestionService
 from app.schemas.inventory import (
     InventoryCreate,
     InventoryResponse,
-    InventoryFilters
+    InventoryFilters,
+    InventoryPage
 )
 
 router = APIRouter()
@@ -17,17 +20,30 @@ router = APIRouter()
 @router.post("/upload", status_code=status.HTTP_200_OK)
 async def upload_inventory_csv(
     file: UploadFile = File(...),
+    streaming: bool = Query(False, description="Validate and save the file chunk by chunk"),
+    load_mode: str = Query(
+        "upsert",
+        pattern=f"^({'|'.join(LOAD_MODES)})$",
+        description="Bulk load mode: batched upsert or COPY into a staging table"
+    ),
     db: Session = Depends(get_db)
 ):
     """
     Upload and process inventory CSV file.
     
+    In streaming mode the file is read in fixed-size chunks and each batch
+    of complete rows is validated and saved as it arrives, so memory stays
+    flat regardless of file size. The ``copy`` load mode is much faster for
+    very large files. The response reports the seconds spent in each phase.
+    
     Args:
         file: CSV file to upload
+        streaming: Whether to process the file chunk by chunk
+        load_mode: Bulk load mode ("upsert" or "copy")
         db: Database session
         
     Returns:
-        Upload result with success count and errors
+        Upload result with success count, errors and phase timings
     """
     # Validate file type
     if not file.filename.endswith('.csv'):
@@ -36,6 +52,12 @@ async def upload_inventory_csv(
             detail="File must be a CSV file"
         )
     
+    if streaming:
+        return await _upload_inventory_csv_streaming(file, load_mode, db)
+    
+    timings: Dict[str, float] = {}
+    
+    start = time.perf_counter()
     try:
         # Read file content
         content = await file.read()
@@ -45,33 +67,112 @@ async def upload_inventory_csv(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Failed to read file: {str(e)}"
         )
+    _add_timing(timings, "read_seconds", time.perf_counter() - start)
     
     # Parse and validate CSV
+    start = time.perf_counter()
     ingestion_service = IngestionService()
     result = ingestion_service.parse_csv(file_content)
+    _add_timing(timings, "parse_seconds", time.perf_counter() - start)
     
     # If there are valid records, save them to database
-    if result.valid_records:
-        repository = InventoryRepository(db)
+    _save_records(InventoryRepository(db), result.valid_records, load_mode, timings)
+    
+    # Return result
+    return {
+        "success": result.success_count > 0,
+        "message": f"Processed {result.success_count + result.error_count} rows",
+        "success_count": result.success_count,
+        "error_count": result.error_count,
+        "errors": result.errors,
+        "duplicates": result.duplicates,
+        "load_mode": load_mode,
+        "timings": _round_timings(timings)
+    }
+
+
+async def _upload_inventory_csv_streaming(file: UploadFile, load_mode: str, db: Session) -> dict:
+    """
+    Validate and save an uploaded CSV one chunk at a time.
+    
+    Args:
+        file: CSV file to upload
+        load_mode: Bulk load mode ("upsert" or "copy")
+        db: Database session
+        
+    Returns:
+        Upload result with success count, errors and phase timings
+    """
+    stream = IngestionService().stream()
+    repository = InventoryRepository(db)
+    timings: Dict[str, float] = {}
+    
+    while True:
+        start = time.perf_counter()
         try:
-            repository.create_many(result.valid_records)
+            chunk = await file.read(settings.upload_chunk_size_bytes)
         except Exception as e:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to save records to database: {str(e)}"
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Failed to read file: {str(e)}"
             )
+        _add_timing(timings, "read_seconds", time.perf_counter() - start)
+        
+        start = time.perf_counter()
+        records = stream.feed(chunk) if chunk else stream.close()
+        _add_timing(timings, "parse_seconds", time.perf_counter() - start)
+        
+        _save_records(repository, records, load_mode, timings)
+        if not chunk:
+            break
     
-    # Return result
+    result = stream.result
     return {
         "success": result.success_count > 0,
         "message": f"Processed {result.success_count + result.error_count} rows",
         "success_count": result.success_count,
         "error_count": result.error_count,
         "errors": result.errors,
-        "duplicates": result.duplicates
+        "duplicates": result.duplicates,
+        "chunks_processed": stream.chunks_processed,
+        "load_mode": load_mode,
+        "timings": _round_timings(timings)
     }
 
 
+def _save_records(
+    repository: InventoryRepository,
+    records: List[InventoryCreate],
+    load_mode: str,
+    timings: Dict[str, float]
+):
+    """Bulk load records and accumulate the load phase timings."""
+    if not records:
+        return
+    
+    try:
+        load_result = repository.load_many(records, mode=load_mode)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to save records to database: {str(e)}"
+        )
+    
+    for key, value in load_result.items():
+        if key.endswith("_seconds"):
+            _add_timing(timings, key, value)
+
+
+def _add_timing(timings: Dict[str, float], key: str, seconds: float):
+    """Accumulate seconds spent in a phase."""
+    timings[key] = timings.get(key, 0.0) + seconds
+
+
+def _round_timings(timings: Dict[str, float]) -> Dict[str, float]:
+    """Round phase timings for the response."""
+    return {key: round(value, 4) for key, value in timings.items()}
+
+
 @router.post("", response_model=InventoryResponse, status_code=status.HTTP_201_CREATED)
 def create_inventory(
     inventory: InventoryCreate,
@@ -106,24 +207,46 @@ def create_inventory(
         )
 
 
-@router.get("", response_model=List[InventoryResponse])
+@router.get("", response_model=Union[List[InventoryResponse], InventoryPage])
 def get_inventory(
     hospital_id: str = None,
     blood_group: str = None,
     component: str = None,
+    limit: Optional[int] = Query(
+        None,
+        ge=1,
+        le=settings.inventory_max_page_size,
+        description="Page size (defaults to INVENTORY_PAGE_SIZE)"
+    ),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    sort: str = Query(
+        "expiry_asc",
+        pattern=f"^({'|'.join(INVENTORY_SORTS)})$",
+        description="Order by expiry date, soonest first or latest first"
+    ),
     db: Session = Depends(get_db)
 ):
     """
     Get inventory records with optional filtering.
     
+    Without ``limit`` or ``cursor`` every matching record is returned as a
+    bare list, as before pagination was added. Passing either returns an
+    InventoryPage instead: records are ordered by expiry date (ties broken
+    by record ID), and the returned ``next_cursor`` is passed back as
+    ``cursor`` to fetch the following page; it is null on the last page.
+    
     Args:
         hospital_id: Optional hospital ID filter
         blood_group: Optional blood group filter
         component: Optional component filter
+        limit: Page size
+        cursor: Cursor of the previous page
+        sort: Sort order of a page ("expiry_asc" or "expiry_desc")
         db: Database session
         
     Returns:
-        List of inventory records
+        List of inventory records, or a page of them with the cursor of the
+        next page if limit or cursor was passed
     """
     # Build filters
     filters = InventoryFilters(
@@ -134,9 +257,23 @@ def get_inventory(
     
     # Get records
     repository = InventoryRepository(db)
-    records = repository.get_all(filters)
+    if limit is None and cursor is None:
+        return repository.get_all(filters)
+    
+    try:
+        records, next_cursor = repository.get_page(filters, limit=limit, cursor=cursor, sort=sort)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     
-    return records
+    return {
+        "items": records,
+        "limit": limit or settings.inventory_page_size,
+        "sort": sort,
+        "next_cursor": next_cursor
+    }
 
 
 @router.get("/{record_id}", response_model=InventoryResponse)
@@ -3,7 +3,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from typing import Optional
 from app.database import get_db
-from app.services.transfer import TransferService
+from app.services.transfer import TransferService, RECOMMENDATION_MODES
 
 router = APIRouter()
 
@@ -30,16 +30,22 @@ def get_transfers(
 @router.get("/recommendations")
 def get_transfer_recommendations(
     hospital_id: Optional[str] = Query(None, description="Hospital ID filter"),
+    mode: str = Query(
+        "greedy",
+        pattern=f"^({'|'.join(RECOMMENDATION_MODES)})$",
+        description="greedy: every deficit/surplus pair; optimal: globally consistent allocation plan"
+    ),
     db: Session = Depends(get_db)
 ):
     """Get transfer recommendations."""
     transfer_service = TransferService(db)
     
     try:
-        recommendations = transfer_service.generate_recommendations(hospital_id)
+        recommendations = transfer_service.generate_recommendations(hospital_id, mode=mode)
         
         return {
             "count": len(recommendations),
+            "mode": mode,
             "recommendations": recommendations
         }
     except Exception as e:
@@ -32,6 +32,16 @@ class Settings(BaseSettings):
     forecast_horizon_days: int = Field(default=7, alias="FORECAST_HORIZON_DAYS")
     forecast_history_days: int = Field(default=180, alias="FORECAST_HISTORY_DAYS")
     forecast_confidence_interval: float = Field(default=0.95, alias="FORECAST_CONFIDENCE_INTERVAL")
+    forecast_backend: str = Field(default="prophet", alias="FORECAST_BACKEND")
+    forecast_incremental_refresh: bool = Field(default=True, alias="FORECAST_INCREMENTAL_REFRESH")
+    forecast_refit_max_age_days: int = Field(default=7, alias="FORECAST_REFIT_MAX_AGE_DAYS")
+    forecast_reconciliation: str = Field(default="none", alias="FORECAST_RECONCILIATION")
+    forecast_model_cache_enabled: bool = Field(default=True, alias="FORECAST_MODEL_CACHE_ENABLED")
+    forecast_model_cache_dir: str = Field(default="cache/forecast_models", alias="FORECAST_MODEL_CACHE_DIR")
+    # Must hold one nightly run: hospitals x 24 series, about 40 KB per model
+    forecast_model_cache_max_entries: int = Field(default=10000, alias="FORECAST_MODEL_CACHE_MAX_ENTRIES")
+    forecast_model_cache_max_bytes: int = Field(default=536870912, alias="FORECAST_MODEL_CACHE_MAX_BYTES")
+    forecast_model_cache_evict_every: int = Field(default=50, alias="FORECAST_MODEL_CACHE_EVICT_EVERY")
     
     # Transfer Recommendations
     transfer_radius_km: float = Field(default=50.0, alias="TRANSFER_RADIUS_KM")
@@ -40,10 +50,18 @@ class Settings(BaseSettings):
     transfer_weight_distance: float = Field(default=0.2, alias="TRANSFER_WEIGHT_DISTANCE")
     transfer_weight_surplus: float = Field(default=0.2, alias="TRANSFER_WEIGHT_SURPLUS")
     transfer_speed_kmh: float = Field(default=40.0, alias="TRANSFER_SPEED_KMH")
+    transfer_optimal_candidates: int = Field(default=30, alias="TRANSFER_OPTIMAL_CANDIDATES")
     
     # Expiry Risk
     expiry_risk_threshold_days: int = Field(default=3, alias="EXPIRY_RISK_THRESHOLD_DAYS")
     
+    # Dashboard
+    dashboard_cache_ttl_seconds: float = Field(default=30.0, alias="DASHBOARD_CACHE_TTL_SECONDS")
+    dashboard_cache_max_entries: int = Field(default=256, alias="DASHBOARD_CACHE_MAX_ENTRIES")
+    
+    # Hospital distance index
+    hospital_index_ttl_seconds: float = Field(default=300.0, alias="HOSPITAL_INDEX_TTL_SECONDS")
+    
     # Donor Eligibility
     donor_eligibility_days: int = Field(default=90, alias="DONOR_ELIGIBILITY_DAYS")
     
@@ -76,6 +94,10 @@ class Settings(BaseSettings):
     log_level: str = Field(default="INFO", alias="LOG_LEVEL")
     log_file: str = Field(default="logs/app.log", alias="LOG_FILE")
     
+    # Metrics
+    metrics_enabled: bool = Field(default=True, alias="METRICS_ENABLED")
+    server_timing_enabled: bool = Field(default=False, alias="SERVER_TIMING_ENABLED")
+    
     # Encryption
     encryption_key: Optional[str] = Field(default=None, alias="ENCRYPTION_KEY")
     
@@ -83,6 +105,12 @@ class Settings(BaseSettings):
     max_workers: int = Field(default=4, alias="MAX_WORKERS")
     connection_pool_size: int = Field(default=10, alias="CONNECTION_POOL_SIZE")
     connection_pool_max_overflow: int = Field(default=20, alias="CONNECTION_POOL_MAX_OVERFLOW")
+    upload_chunk_size_bytes: int = Field(default=1048576, alias="UPLOAD_CHUNK_SIZE_BYTES")
+    inventory_upsert_batch_size: int = Field(default=1000, alias="INVENTORY_UPSERT_BATCH_SIZE")
+    forecast_insert_batch_size: int = Field(default=1000, alias="FORECAST_INSERT_BATCH_SIZE")
+    inventory_page_size: int = Field(default=100, alias="INVENTORY_PAGE_SIZE")
+    inventory_max_page_size: int = Field(default=1000, alias="INVENTORY_MAX_PAGE_SIZE")
+    export_batch_size: int = Field(default=5000, alias="EXPORT_BATCH_SIZE")
     
     # Feature Flags
     enable_model_drift_monitoring: bool = Field(default=True, alias="ENABLE_MODEL_DRIFT_MONITORING")
@@ -2,6 +2,7 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
 from app.config import settings
+from app.utils.metrics import instrument_engine
 
 # Create database engine
 engine = create_engine(
@@ -11,6 +12,9 @@ engine = create_engine(
     echo=settings.debug
 )
 
+# Count statements per request for /metrics
+instrument_engine(engine)
+
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -1,7 +1,9 @@
 """Main FastAPI application entry point."""
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from app.config import settings
+from app.utils.metrics import metrics_middleware, route_metrics
 
 # Create FastAPI app
 app = FastAPI(
@@ -21,6 +23,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-route statement counts and latency
+app.middleware("http")(metrics_middleware)
+
 
 @app.get("/")
 async def root():
@@ -38,6 +43,12 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """Per-route request, SQL statement and latency counters in Prometheus text format."""
+    return PlainTextResponse(route_metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.on_event("startup")
 async def startup_event():
     """Run on application startup."""
@@ -53,7 +64,7 @@ async def shutdown_event():
 
 
 # API routers
-from app.api import inventory, hospital, dashboard, forecast, transfer, donor, notification, auth, eraktkosh
+from app.api import inventory, hospital, dashboard, forecast, transfer, donor, notification, auth, eraktkosh, export
 
 app.include_router(auth.router, prefix="/api/auth", tags=["authentication"])
 app.include_router(inventory.router, prefix="/api/inventory", tags=["inventory"])
@@ -63,6 +74,7 @@ app.include_router(forecast.router, prefix="/api/forecast", tags=["forecast"])
 app.include_router(transfer.router, prefix="/api/transfers", tags=["transfers"])
 app.include_router(donor.router, prefix="/api/donors", tags=["donors"])
 app.include_router(notification.router, prefix="/api/notifications", tags=["notifications"])
+app.include_router(export.router, prefix="/api/export", tags=["export"])
 
 # Additional routers will be added in subsequent tasks
 # from app.api import forecast, transfer, donor, auth
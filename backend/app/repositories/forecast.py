@@ -1,9 +1,87 @@
 """Forecast repository for database operations."""
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import date
 from sqlalchemy.orm import Session
+from sqlalchemy import column, func, insert, select, table, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.config import settings
 from app.models.forecast import Forecast
 
+# Columns written per forecast row by create_many
+FORECAST_COLUMNS = [
+    'run_id',
+    'hospital_id',
+    'blood_group',
+    'component',
+    'forecast_date',
+    'predicted_units',
+    'lower_bound',
+    'upper_bound'
+]
+
+# PostgreSQL allows at most 65535 bind parameters per statement
+MAX_INSERT_BATCH_SIZE = 65535 // len(FORECAST_COLUMNS)
+
+# Core constructs for the run tables added in migration 002
+forecast_rows = table('forecasts', *(column(name) for name in FORECAST_COLUMNS))
+forecast_runs = table(
+    'forecast_runs',
+    column('run_id'),
+    column('status'),
+    column('backend'),
+    column('series_count'),
+    column('rows_written'),
+    column('started_at'),
+    column('completed_at')
+)
+
+# One row per series and date, added in migration 003
+LATEST_KEY = ['hospital_id', 'blood_group', 'component', 'forecast_date']
+forecast_latest = table(
+    'forecast_latest',
+    *(column(name) for name in FORECAST_COLUMNS),
+    column('generated_at')
+)
+
+# Usage high-water marks of each series' last fit, added in migration 006
+SERIES_KEY = ['hospital_id', 'blood_group', 'component']
+SERIES_STATE_COLUMNS = SERIES_KEY + [
+    'backend',
+    'usage_created_at',
+    'usage_date',
+    'history_end',
+    'fit_seconds',
+    'run_id'
+]
+forecast_series_state = table(
+    'forecast_series_state',
+    *(column(name) for name in SERIES_STATE_COLUMNS),
+    column('updated_at')
+)
+
+# Replace the forecast_latest rows of every series a completed run wrote.
+# Runs in the transaction that marks the run complete, so readers see either
+# the old or the new forecasts. Series the run failed or skipped keep their
+# last good forecast; a written series loses dates it no longer forecasts.
+CLEAR_LATEST_SQL = """
+DELETE FROM forecast_latest
+WHERE EXISTS (
+    SELECT 1
+    FROM forecasts
+    WHERE forecasts.run_id = :run_id
+      AND forecasts.hospital_id = forecast_latest.hospital_id
+      AND forecasts.blood_group = forecast_latest.blood_group
+      AND forecasts.component = forecast_latest.component
+)
+"""
+
+FILL_LATEST_SQL = f"""
+INSERT INTO forecast_latest ({', '.join(FORECAST_COLUMNS)}, generated_at)
+SELECT {', '.join(FORECAST_COLUMNS)}, generated_at
+FROM forecasts
+WHERE run_id = :run_id
+"""
+
 
 class ForecastRepository:
     """Repository for forecast CRUD operations."""
@@ -41,6 +119,213 @@ class ForecastRepository:
         self.db.refresh(db_forecast)
         return db_forecast
     
+    def create_many(
+        self,
+        forecasts: List[dict],
+        run_id: Optional[int] = None,
+        batch_size: Optional[int] = None
+    ) -> int:
+        """
+        Create multiple forecast records with one multi-row INSERT per batch.
+        
+        All batches are committed together.
+        
+        Args:
+            forecasts: List of dictionaries with forecast data
+            run_id: Optional forecast run the rows belong to
+            batch_size: Rows per INSERT (uses config default if not provided)
+            
+        Returns:
+            Number of records created
+        """
+        if not forecasts:
+            return 0
+        
+        batch_size = min(batch_size or settings.forecast_insert_batch_size, MAX_INSERT_BATCH_SIZE)
+        rows = [
+            {
+                'run_id': run_id,
+                'hospital_id': forecast['hospital_id'],
+                'blood_group': forecast['blood_group'],
+                'component': forecast['component'],
+                'forecast_date': forecast['forecast_date'],
+                'predicted_units': forecast['predicted_units'],
+                'lower_bound': forecast.get('lower_bound'),
+                'upper_bound': forecast.get('upper_bound')
+            }
+            for forecast in forecasts
+        ]
+        
+        for start in range(0, len(rows), batch_size):
+            self.db.execute(insert(forecast_rows).values(rows[start:start + batch_size]))
+        
+        self.db.commit()
+        return len(rows)
+    
+    def start_run(self, backend: Optional[str] = None, series_count: Optional[int] = None) -> int:
+        """
+        Open a forecast run.
+        
+        Rows written under the run stay invisible to latest-forecast readers
+        until ``complete_run`` is called.
+        
+        Args:
+            backend: Forecasting backend used for the run
+            series_count: Number of series the run will forecast
+            
+        Returns:
+            New run ID
+        """
+        run_id = self.db.execute(
+            insert(forecast_runs)
+            .values(status='running', backend=backend, series_count=series_count)
+            .returning(forecast_runs.c.run_id)
+        ).scalar_one()
+        self.db.commit()
+        return run_id
+    
+    def complete_run(self, run_id: int, rows_written: int, series_state: Optional[List[dict]] = None):
+        """
+        Mark a run complete and swap its rows into forecast_latest.
+        
+        Only the series the run wrote are replaced; series it failed or
+        skipped keep their previous forecasts. Both happen in one
+        transaction, so readers of forecast_latest switch to the new rows
+        at commit. Series state rows are written in the same transaction,
+        so marks never run ahead of the forecasts they describe.
+        
+        Args:
+            run_id: Run ID
+            rows_written: Number of forecast rows written by the run
+            series_state: Optional state rows of the series fitted by the run
+        """
+        self.db.execute(text(CLEAR_LATEST_SQL), {"run_id": run_id})
+        self.db.execute(text(FILL_LATEST_SQL), {"run_id": run_id})
+        if series_state:
+            self._upsert_series_state(series_state)
+        self._finish_run(run_id, 'complete', rows_written)
+    
+    def fail_run(self, run_id: int, rows_written: int = 0):
+        """
+        Mark a run failed; its rows are never read as latest forecasts.
+        
+        Args:
+            run_id: Run ID
+            rows_written: Number of forecast rows written before the failure
+        """
+        self._finish_run(run_id, 'failed', rows_written)
+    
+    def upsert_latest(self, forecasts: List[dict]) -> int:
+        """
+        Replace forecast_latest rows for individually generated forecasts.
+        
+        Args:
+            forecasts: List of dictionaries with forecast data
+            
+        Returns:
+            Number of rows written
+        """
+        if not forecasts:
+            return 0
+        
+        rows = [
+            {
+                'run_id': forecast.get('run_id'),
+                'hospital_id': forecast['hospital_id'],
+                'blood_group': forecast['blood_group'],
+                'component': forecast['component'],
+                'forecast_date': forecast['forecast_date'],
+                'predicted_units': forecast['predicted_units'],
+                'lower_bound': forecast.get('lower_bound'),
+                'upper_bound': forecast.get('upper_bound'),
+                'generated_at': func.now()
+            }
+            for forecast in forecasts
+        ]
+        
+        statement = pg_insert(forecast_latest).values(rows)
+        self.db.execute(statement.on_conflict_do_update(
+            index_elements=LATEST_KEY,
+            set_={
+                name: statement.excluded[name]
+                for name in ['run_id', 'predicted_units', 'lower_bound', 'upper_bound', 'generated_at']
+            }
+        ))
+        self.db.commit()
+        return len(rows)
+    
+    def get_series_state(self) -> Dict[tuple, Dict]:
+        """
+        Get the stored state of every fitted series.
+        
+        Returns:
+            State dictionaries keyed by (hospital_id, blood_group, component)
+        """
+        rows = self.db.execute(select(*(forecast_series_state.c[name] for name in SERIES_STATE_COLUMNS))).mappings()
+        return {
+            (row['hospital_id'], row['blood_group'], row['component']): dict(row)
+            for row in rows
+        }
+    
+    def get_latest_points(self) -> List:
+        """
+        Get every row of forecast_latest, for rolling forecasts forward.
+        
+        Returns:
+            Rows of (hospital_id, blood_group, component, forecast_date,
+            predicted_units, lower_bound, upper_bound)
+        """
+        return self.db.execute(select(
+            forecast_latest.c.hospital_id,
+            forecast_latest.c.blood_group,
+            forecast_latest.c.component,
+            forecast_latest.c.forecast_date,
+            forecast_latest.c.predicted_units,
+            forecast_latest.c.lower_bound,
+            forecast_latest.c.upper_bound
+        )).all()
+    
+    def _upsert_series_state(self, rows: List[dict]):
+        """
+        Insert or update the fit state of series, without committing.
+        
+        Rows are written in batches that stay under PostgreSQL's limit of
+        65535 bind parameters per statement.
+        
+        Args:
+            rows: State dictionaries with the SERIES_STATE_COLUMNS keys;
+                missing keys are stored as NULL
+        """
+        batch_size = min(settings.forecast_insert_batch_size, 65535 // len(SERIES_STATE_COLUMNS))
+        for start in range(0, len(rows), batch_size):
+            statement = pg_insert(forecast_series_state).values([
+                {**{name: row.get(name) for name in SERIES_STATE_COLUMNS}, 'updated_at': func.now()}
+                for row in rows[start:start + batch_size]
+            ])
+            self.db.execute(statement.on_conflict_do_update(
+                index_elements=SERIES_KEY,
+                set_={
+                    name: statement.excluded[name]
+                    for name in SERIES_STATE_COLUMNS[len(SERIES_KEY):] + ['updated_at']
+                }
+            ))
+    
+    def _finish_run(self, run_id: int, status: str, rows_written: int):
+        """
+        Close a forecast run and commit.
+        
+        Args:
+            run_id: Run ID from ``start_run``
+            status: Final status, 'complete' or 'failed'
+            rows_written: Number of forecast rows the run wrote
+        """
+        self.db.execute(
+            update(forecast_runs)
+            .where(forecast_runs.c.run_id == run_id)
+            .values(status=status, rows_written=rows_written, completed_at=func.now())
+        )
+        self.db.commit()
+    
     def get_by_id(self, forecast_id: int) -> Optional[Forecast]:
         """
         Get forecast record by ID.
@@ -87,11 +372,52 @@ class ForecastRepository:
         
         return query.order_by(Forecast.forecast_date).all()
     
+    def get_latest(
+        self,
+        hospital_id: str,
+        blood_group: Optional[str] = None,
+        component: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> List[Dict]:
+        """
+        Get the latest forecast per series and date for a hospital.
+        
+        Reads forecast_latest through its primary key.
+        
+        Args:
+            hospital_id: Hospital ID
+            blood_group: Optional blood group filter
+            component: Optional component filter
+            start_date: Optional start date filter
+            end_date: Optional end date filter
+            
+        Returns:
+            List of forecast dictionaries ordered by date
+        """
+        query = select(forecast_latest).where(forecast_latest.c.hospital_id == hospital_id)
+        
+        if blood_group:
+            query = query.where(forecast_latest.c.blood_group == blood_group)
+        if component:
+            query = query.where(forecast_latest.c.component == component)
+        if start_date:
+            query = query.where(forecast_latest.c.forecast_date >= start_date)
+        if end_date:
+            query = query.where(forecast_latest.c.forecast_date <= end_date)
+        
+        query = query.order_by(
+            forecast_latest.c.forecast_date,
+            forecast_latest.c.blood_group,
+            forecast_latest.c.component
+        )
+        return [dict(row) for row in self.db.execute(query).mappings()]
+    
     def get_latest_forecasts(
         self,
         hospital_id: str,
         days: int = 7
-    ) -> List[Forecast]:
+    ) -> List[Dict]:
         """
         Get latest forecasts for a hospital.
         
@@ -100,18 +426,59 @@ class ForecastRepository:
             days: Number of days to retrieve
             
         Returns:
-            List of latest forecast records
+            List of latest forecast dictionaries
         """
         from datetime import timedelta
         start_date = date.today()
         end_date = start_date + timedelta(days=days)
         
-        return self.get_by_hospital(
+        return self.get_latest(
             hospital_id=hospital_id,
             start_date=start_date,
             end_date=end_date
         )
     
+    def get_predicted_totals(
+        self,
+        hospital_id: Optional[str] = None,
+        days: int = 7
+    ) -> List:
+        """
+        Get total predicted units per hospital, blood group and component.
+        
+        Reads forecast_latest over the same date window as
+        ``get_latest_forecasts``, so each series and date counts once.
+        
+        Args:
+            hospital_id: Optional hospital ID filter
+            days: Number of days to include
+            
+        Returns:
+            Rows of (hospital_id, blood_group, component, total_predicted)
+        """
+        from datetime import timedelta
+        start_date = date.today()
+        end_date = start_date + timedelta(days=days)
+        
+        query = select(
+            forecast_latest.c.hospital_id,
+            forecast_latest.c.blood_group,
+            forecast_latest.c.component,
+            func.sum(forecast_latest.c.predicted_units).label('total_predicted')
+        ).where(
+            forecast_latest.c.forecast_date >= start_date,
+            forecast_latest.c.forecast_date <= end_date
+        )
+        
+        if hospital_id:
+            query = query.where(forecast_latest.c.hospital_id == hospital_id)
+        
+        return self.db.execute(query.group_by(
+            forecast_latest.c.hospital_id,
+            forecast_latest.c.blood_group,
+            forecast_latest.c.component
+        )).all()
+    
     def delete_old_forecasts(self, days_old: int = 30) -> int:
         """
         Delete forecasts older than specified days.
@@ -3,6 +3,7 @@ from typing import List, Optional
 from sqlalchemy.orm import Session
 from app.models.hospital import Hospital
 from app.schemas.hospital import HospitalCreate
+from app.utils.geo import invalidate_hospital_index
 
 
 class HospitalRepository:
@@ -40,6 +41,7 @@ class HospitalRepository:
         self.db.add(db_hospital)
         self.db.commit()
         self.db.refresh(db_hospital)
+        invalidate_hospital_index()
         return db_hospital
     
     def get_by_id(self, hospital_id: str) -> Optional[Hospital]:
@@ -84,6 +86,7 @@ class HospitalRepository:
         
         self.db.commit()
         self.db.refresh(db_hospital)
+        invalidate_hospital_index()
         return db_hospital
     
     def delete(self, hospital_id: str) -> bool:
@@ -102,4 +105,5 @@ class HospitalRepository:
         
         self.db.delete(db_hospital)
         self.db.commit()
+        invalidate_hospital_index()
         return True
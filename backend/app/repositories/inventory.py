@@ -1,11 +1,139 @@
 """Inventory repository for database operations."""
-from typing import List, Optional
+import base64
+import binascii
+import csv
+import io
+import json
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, case, func, literal_column, select, text, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from app.config import settings
 from app.models.inventory import Inventory
 from app.schemas.inventory import InventoryCreate, InventoryFilters
+from app.utils.dashboard_cache import invalidate_dashboard_cache
 from datetime import date
 
+# Columns overwritten when an uploaded record ID already exists
+UPSERT_COLUMNS = [
+    'hospital_id',
+    'blood_group',
+    'component',
+    'units',
+    'unit_expiry_date',
+    'collection_date'
+]
+
+# PostgreSQL allows at most 65535 bind parameters per statement (7 per row)
+MAX_UPSERT_BATCH_SIZE = 65535 // (len(UPSERT_COLUMNS) + 1)
+
+# Bulk load modes accepted by load_many
+LOAD_MODES = ("upsert", "copy")
+
+# Sort orders accepted by get_page; both walk the (unit_expiry_date,
+# record_id) keyset, which the composite indexes of migration 004 end with
+INVENTORY_SORTS = ("expiry_asc", "expiry_desc")
+
+COPY_COLUMNS = ['record_id'] + UPSERT_COLUMNS
+
+# Columns read by stream_rows
+EXPORT_COLUMNS = COPY_COLUMNS
+
+# Per-transaction staging table for COPY loads; seq keeps input order so the
+# last occurrence of a record ID wins, as with create_many
+CREATE_STAGING_SQL = """
+CREATE TEMP TABLE inventory_staging (
+    seq BIGINT GENERATED ALWAYS AS IDENTITY,
+    record_id VARCHAR(50) NOT NULL,
+    hospital_id VARCHAR(50) NOT NULL,
+    blood_group VARCHAR(5) NOT NULL,
+    component VARCHAR(20) NOT NULL,
+    units INTEGER NOT NULL,
+    unit_expiry_date DATE NOT NULL,
+    collection_date DATE NOT NULL
+) ON COMMIT DROP
+"""
+
+COPY_STAGING_SQL = f"COPY inventory_staging ({', '.join(COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv)"
+
+MERGE_STAGING_SQL = f"""
+WITH merged AS (
+    INSERT INTO inventory ({', '.join(COPY_COLUMNS)})
+    SELECT DISTINCT ON (record_id) {', '.join(COPY_COLUMNS)}
+    FROM inventory_staging
+    ORDER BY record_id, seq DESC
+    ON CONFLICT (record_id) DO UPDATE SET
+        {', '.join(f'{column} = EXCLUDED.{column}' for column in UPSERT_COLUMNS)}
+    RETURNING (xmax = 0) AS inserted
+)
+SELECT
+    COUNT(*) FILTER (WHERE inserted) AS inserted,
+    COUNT(*) FILTER (WHERE NOT inserted) AS updated
+FROM merged
+"""
+
+
+def encode_cursor(unit_expiry_date: date, record_id: str) -> str:
+    """
+    Encode the keyset position of a record as an opaque page cursor.
+    
+    Args:
+        unit_expiry_date: Expiry date of the last record on the page
+        record_id: Record ID of the last record on the page
+        
+    Returns:
+        URL-safe cursor string
+    """
+    payload = json.dumps([unit_expiry_date.isoformat(), record_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[date, str]:
+    """
+    Decode a page cursor produced by ``encode_cursor``.
+    
+    Args:
+        cursor: Cursor string
+        
+    Returns:
+        Tuple of (unit_expiry_date, record_id)
+        
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        expiry, record_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return date.fromisoformat(expiry), str(record_id)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+class _CopyStream:
+    """File-like object that renders CSV lines lazily for COPY FROM STDIN."""
+    
+    def __init__(self, lines: Iterator[str]):
+        self._lines = lines
+        self._buffer = ""
+    
+    def read(self, size: int = -1) -> str:
+        parts = [self._buffer]
+        length = len(self._buffer)
+        while size < 0 or length < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            parts.append(line)
+            length += len(line)
+        
+        data = "".join(parts)
+        if size < 0:
+            self._buffer = ""
+            return data
+        self._buffer = data[size:]
+        return data[:size]
+
 
 class InventoryRepository:
     """Repository for inventory CRUD operations."""
@@ -41,44 +169,168 @@ class InventoryRepository:
         self.db.add(db_inventory)
         self.db.commit()
         self.db.refresh(db_inventory)
+        invalidate_dashboard_cache()
         return db_inventory
     
-    def create_many(self, inventories: List[InventoryCreate]) -> List[Inventory]:
+    def create_many(
+        self,
+        inventories: List[InventoryCreate],
+        batch_size: Optional[int] = None
+    ) -> Dict[str, int]:
         """
         Create multiple inventory records in bulk with upsert.
         
+        Records are sent as one multi-row ``INSERT ... ON CONFLICT (record_id)
+        DO UPDATE`` statement per batch. When a record ID appears more than
+        once, the last occurrence wins, as it would with row-by-row upserts.
+        
         Args:
             inventories: List of inventory data to create
+            batch_size: Rows per statement (uses config default if not provided)
             
         Returns:
-            List of created inventory records
+            Dictionary with the number of inserted and updated rows
         """
-        from sqlalchemy.dialects.postgresql import insert
+        if batch_size is None:
+            batch_size = settings.inventory_upsert_batch_size
+        batch_size = max(1, min(batch_size, MAX_UPSERT_BATCH_SIZE))
+        
+        rows = list({row["record_id"]: row for row in map(self._to_row, inventories)}.values())
         
+        inserted = 0
+        updated = 0
+        try:
+            for start in range(0, len(rows), batch_size):
+                result = self.db.execute(self._upsert_statement(rows[start:start + batch_size]))
+                for (was_inserted,) in result:
+                    if was_inserted:
+                        inserted += 1
+                    else:
+                        updated += 1
+            
+            self.db.commit()
+        except Exception:
+            # Leave the session usable and no batch half-applied
+            self.db.rollback()
+            raise
+        invalidate_dashboard_cache()
+        return {"inserted": inserted, "updated": updated}
+    
+    def load_many(self, inventories: List[InventoryCreate], mode: str = "upsert") -> Dict[str, float]:
+        """
+        Bulk load inventory records using the selected load mode.
+        
+        Args:
+            inventories: Inventory data to load
+            mode: "upsert" for batched INSERT ... ON CONFLICT, "copy" for a
+                COPY staging table merge
+                
+        Returns:
+            Dictionary with inserted and updated row counts plus the seconds
+            spent in each phase (keys ending in ``_seconds``)
+            
+        Raises:
+            ValueError: If the load mode is not recognized
+        """
+        if mode == "copy":
+            return self.copy_many(inventories)
+        if mode != "upsert":
+            raise ValueError(f"Unknown load mode: {mode}. Must be one of: {', '.join(LOAD_MODES)}")
+        
+        start = time.perf_counter()
+        result = self.create_many(inventories)
+        result["upsert_seconds"] = time.perf_counter() - start
+        return result
+    
+    def copy_many(self, inventories: Iterable[InventoryCreate]) -> Dict[str, float]:
+        """
+        Load inventory records through a COPY staging table.
+        
+        Rows are streamed into a temporary table with ``COPY FROM STDIN`` and
+        merged into ``inventory`` with a single set-based upsert. This is the
+        fastest path for very large imports; results match ``create_many``.
+        
+        Args:
+            inventories: Inventory data to load
+            
+        Returns:
+            Dictionary with inserted and updated row counts plus the seconds
+            spent in the copy and merge phases
+        """
+        start = time.perf_counter()
+        try:
+            connection = self.db.connection()
+            connection.execute(text(CREATE_STAGING_SQL))
+            
+            cursor = connection.connection.cursor()
+            try:
+                lines = self._csv_lines(inventories)
+                if hasattr(cursor, "copy_expert"):
+                    cursor.copy_expert(COPY_STAGING_SQL, _CopyStream(lines))
+                else:
+                    # psycopg 3
+                    with cursor.copy(COPY_STAGING_SQL) as copy:
+                        for line in lines:
+                            copy.write(line)
+            finally:
+                cursor.close()
+            copied = time.perf_counter()
+            
+            counts = connection.execute(text(MERGE_STAGING_SQL)).one()
+            self.db.commit()
+        except Exception:
+            # A failed COPY or merge aborts the transaction; roll back so the
+            # session is usable again and the staging table is dropped
+            self.db.rollback()
+            raise
+        invalidate_dashboard_cache()
+        merged = time.perf_counter()
+        
+        return {
+            "inserted": counts.inserted,
+            "updated": counts.updated,
+            "copy_seconds": copied - start,
+            "merge_seconds": merged - copied
+        }
+    
+    @classmethod
+    def _csv_lines(cls, inventories: Iterable[InventoryCreate]) -> Iterator[str]:
+        """Render inventory records as CSV lines in COPY_COLUMNS order."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
         for inventory in inventories:
-            stmt = insert(Inventory).values(
-                record_id=inventory.record_id,
-                hospital_id=inventory.hospital_id,
-                blood_group=inventory.blood_group.value,
-                component=inventory.component.value,
-                units=inventory.units,
-                unit_expiry_date=inventory.unit_expiry_date,
-                collection_date=inventory.collection_date
-            ).on_conflict_do_update(
-                index_elements=['record_id'],
-                set_={
-                    'hospital_id': inventory.hospital_id,
-                    'blood_group': inventory.blood_group.value,
-                    'component': inventory.component.value,
-                    'units': inventory.units,
-                    'unit_expiry_date': inventory.unit_expiry_date,
-                    'collection_date': inventory.collection_date
-                }
-            )
-            self.db.execute(stmt)
+            row = cls._to_row(inventory)
+            writer.writerow([row[column] for column in COPY_COLUMNS])
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    
+    @staticmethod
+    def _to_row(inventory: InventoryCreate) -> dict:
+        """Convert an inventory schema to a column dictionary."""
+        return {
+            "record_id": inventory.record_id,
+            "hospital_id": inventory.hospital_id,
+            "blood_group": inventory.blood_group.value,
+            "component": inventory.component.value,
+            "units": inventory.units,
+            "unit_expiry_date": inventory.unit_expiry_date,
+            "collection_date": inventory.collection_date
+        }
+    
+    @staticmethod
+    def _upsert_statement(rows: List[dict]):
+        """
+        Build a multi-row upsert that reports whether each row was inserted.
         
-        self.db.commit()
-        return []
+        ``xmax`` is zero only for tuples created by this statement, so it
+        tells fresh inserts apart from conflict updates.
+        """
+        stmt = insert(Inventory).values(rows)
+        return stmt.on_conflict_do_update(
+            index_elements=['record_id'],
+            set_={column: stmt.excluded[column] for column in UPSERT_COLUMNS}
+        ).returning(literal_column("(xmax = 0)").label("inserted"))
     
     def get_by_id(self, record_id: str) -> Optional[Inventory]:
         """
@@ -104,22 +356,185 @@ class InventoryRepository:
         """
         query = self.db.query(Inventory)
         
-        if filters:
-            conditions = []
+        conditions = self._filter_conditions(filters)
+        if conditions:
+            query = query.filter(and_(*conditions))
+        
+        return query.all()
+    
+    def get_series_by_expiry(self, hospital_id: str, blood_group: str, component: str) -> List[Inventory]:
+        """
+        Get the records of one hospital, blood group and component, soonest
+        expiry first.
+        
+        Args:
+            hospital_id: Hospital ID
+            blood_group: Blood group
+            component: Component
             
-            if filters.hospital_id:
-                conditions.append(Inventory.hospital_id == filters.hospital_id)
+        Returns:
+            List of inventory records ordered by (unit_expiry_date, record_id)
+        """
+        return self.db.query(Inventory).filter(
+            Inventory.hospital_id == hospital_id,
+            Inventory.blood_group == blood_group,
+            Inventory.component == component
+        ).order_by(Inventory.unit_expiry_date, Inventory.record_id).all()
+    
+    def consume_oldest_first(
+        self,
+        hospital_id: str,
+        blood_group: str,
+        component: str,
+        units: int
+    ) -> int:
+        """
+        Take units from one series, soonest-expiring records first.
+        
+        Fully used records are deleted and the last one is reduced. The
+        changes are flushed together and committed once, so the statement
+        count does not grow with the number of records consumed.
+        
+        Args:
+            hospital_id: Hospital ID
+            blood_group: Blood group
+            component: Component
+            units: Units to take
             
-            if filters.blood_group:
-                conditions.append(Inventory.blood_group == filters.blood_group.value)
+        Returns:
+            Units taken (less than requested if the series runs out)
+        """
+        remaining = units
+        for record in self.get_series_by_expiry(hospital_id, blood_group, component):
+            if remaining <= 0:
+                break
+            
+            if record.units <= remaining:
+                remaining -= record.units
+                self.db.delete(record)
+            else:
+                record.units -= remaining
+                remaining = 0
+        
+        if remaining == units:
+            return 0
+        
+        self.db.commit()
+        invalidate_dashboard_cache()
+        return units - remaining
+    
+    def get_page(
+        self,
+        filters: Optional[InventoryFilters] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        sort: str = "expiry_asc"
+    ) -> Tuple[List[Inventory], Optional[str]]:
+        """
+        Get one page of inventory records ordered by expiry date.
+        
+        Pages are keyed on (unit_expiry_date, record_id) rather than an
+        offset, so each page is an index range scan that starts right after
+        the previous page no matter how deep the listing goes, and rows
+        inserted meanwhile never shift or repeat records.
+        
+        Args:
+            filters: Optional filters to apply
+            limit: Page size (uses config default if not provided, capped
+                at the configured maximum)
+            cursor: Cursor returned with the previous page
+            sort: "expiry_asc" (soonest expiry first) or "expiry_desc"
             
-            if filters.component:
-                conditions.append(Inventory.component == filters.component.value)
+        Returns:
+            Tuple of (records, next_cursor); next_cursor is None on the
+            last page
             
-            if conditions:
-                query = query.filter(and_(*conditions))
+        Raises:
+            ValueError: If the sort order or cursor is not recognized
+        """
+        if sort not in INVENTORY_SORTS:
+            raise ValueError(f"Unknown sort: {sort}. Must be one of: {', '.join(INVENTORY_SORTS)}")
+        if limit is None:
+            limit = settings.inventory_page_size
+        limit = max(1, min(limit, settings.inventory_max_page_size))
         
-        return query.all()
+        descending = sort == "expiry_desc"
+        key = tuple_(Inventory.unit_expiry_date, Inventory.record_id)
+        
+        conditions = self._filter_conditions(filters)
+        if cursor:
+            position = tuple_(*decode_cursor(cursor))
+            conditions.append(key < position if descending else key > position)
+        
+        query = self.db.query(Inventory)
+        if conditions:
+            query = query.filter(and_(*conditions))
+        
+        if descending:
+            query = query.order_by(Inventory.unit_expiry_date.desc(), Inventory.record_id.desc())
+        else:
+            query = query.order_by(Inventory.unit_expiry_date, Inventory.record_id)
+        
+        # One extra row tells whether another page follows
+        records = query.limit(limit + 1).all()
+        if len(records) <= limit:
+            return records, None
+        
+        records = records[:limit]
+        last = records[-1]
+        return records, encode_cursor(last.unit_expiry_date, last.record_id)
+    
+    def stream_rows(
+        self,
+        filters: Optional[InventoryFilters] = None,
+        batch_size: Optional[int] = None
+    ) -> Iterator[List]:
+        """
+        Stream inventory rows in batches through a server-side cursor.
+        
+        Rows are plain column tuples (no ORM objects or identity map) in
+        (unit_expiry_date, record_id) order, so memory is bounded by one
+        batch however large the table is.
+        
+        Args:
+            filters: Optional filters to apply
+            batch_size: Rows fetched per round trip (uses config default if
+                not provided)
+                
+        Returns:
+            Iterator of row lists with the EXPORT_COLUMNS attributes
+        """
+        if batch_size is None:
+            batch_size = settings.export_batch_size
+        
+        stmt = select(*(getattr(Inventory, column) for column in EXPORT_COLUMNS))
+        conditions = self._filter_conditions(filters)
+        if conditions:
+            stmt = stmt.where(and_(*conditions))
+        stmt = stmt.order_by(Inventory.unit_expiry_date, Inventory.record_id)
+        
+        # yield_per implies stream_results, i.e. a named cursor on PostgreSQL
+        result = self.db.execute(stmt.execution_options(yield_per=max(1, batch_size)))
+        for rows in result.partitions():
+            yield rows
+    
+    @staticmethod
+    def _filter_conditions(filters: Optional[InventoryFilters]) -> list:
+        """Build WHERE conditions for the filters that are set."""
+        conditions = []
+        if not filters:
+            return conditions
+        
+        if filters.hospital_id:
+            conditions.append(Inventory.hospital_id == filters.hospital_id)
+        
+        if filters.blood_group:
+            conditions.append(Inventory.blood_group == filters.blood_group.value)
+        
+        if filters.component:
+            conditions.append(Inventory.component == filters.component.value)
+        
+        return conditions
     
     def update(self, record_id: str, updates: dict) -> Optional[Inventory]:
         """
@@ -147,6 +562,7 @@ class InventoryRepository:
         
         self.db.commit()
         self.db.refresh(db_inventory)
+        invalidate_dashboard_cache()
         return db_inventory
     
     def delete(self, record_id: str) -> bool:
@@ -165,6 +581,7 @@ class InventoryRepository:
         
         self.db.delete(db_inventory)
         self.db.commit()
+        invalidate_dashboard_cache()
         return True
     
     def get_by_expiry_range(self, days: int) -> List[Inventory]:
@@ -185,6 +602,112 @@ class InventoryRepository:
             Inventory.unit_expiry_date >= date.today()
         ).all()
     
+    def get_expiry_summary(self, threshold_days: int, hospital_id: Optional[str] = None):
+        """
+        Aggregate units by days to expiry in a single statement.
+        
+        Cumulative buckets include records that have already expired; the
+        high-risk bucket covers records expiring from today up to
+        ``threshold_days`` ahead, as in ``get_by_expiry_range``.
+        
+        Args:
+            threshold_days: High-risk threshold in days
+            hospital_id: Optional hospital ID filter
+            
+        Returns:
+            Row with total_records, total_units, high_risk_count,
+            high_risk_units and units_expiring_today/_tomorrow/_3_days/_7_days
+        """
+        from datetime import timedelta
+        today = date.today()
+        expiry = Inventory.unit_expiry_date
+        
+        def units_where(condition):
+            return func.coalesce(func.sum(case((condition, Inventory.units), else_=0)), 0)
+        
+        high_risk = and_(expiry >= today, expiry <= today + timedelta(days=threshold_days))
+        
+        query = self.db.query(
+            func.count().label('total_records'),
+            func.coalesce(func.sum(Inventory.units), 0).label('total_units'),
+            func.count(case((high_risk, 1))).label('high_risk_count'),
+            units_where(high_risk).label('high_risk_units'),
+            units_where(expiry == today).label('units_expiring_today'),
+            units_where(expiry <= today + timedelta(days=1)).label('units_expiring_tomorrow'),
+            units_where(expiry <= today + timedelta(days=3)).label('units_expiring_3_days'),
+            units_where(expiry <= today + timedelta(days=7)).label('units_expiring_7_days')
+        )
+        
+        if hospital_id:
+            query = query.filter(Inventory.hospital_id == hospital_id)
+        
+        return query.one()
+    
+    def get_unit_totals(self, hospital_id: Optional[str] = None) -> List:
+        """
+        Get total units per hospital, blood group and component.
+        
+        Args:
+            hospital_id: Optional hospital ID filter
+            
+        Returns:
+            Rows of (hospital_id, blood_group, component, total_units)
+        """
+        query = self.db.query(
+            Inventory.hospital_id,
+            Inventory.blood_group,
+            Inventory.component,
+            func.sum(Inventory.units).label('total_units')
+        )
+        
+        if hospital_id:
+            query = query.filter(Inventory.hospital_id == hospital_id)
+        
+        return query.group_by(
+            Inventory.hospital_id,
+            Inventory.blood_group,
+            Inventory.component
+        ).all()
+    
+    def get_earliest_expiry_lots(self, hospital_id: Optional[str] = None) -> List:
+        """
+        Get the earliest-expiring record per hospital, blood group and component.
+        
+        Args:
+            hospital_id: Optional hospital ID filter
+            
+        Returns:
+            Rows of (hospital_id, blood_group, component, record_id, units,
+            unit_expiry_date)
+        """
+        rank = func.row_number().over(
+            partition_by=(Inventory.hospital_id, Inventory.blood_group, Inventory.component),
+            order_by=(Inventory.unit_expiry_date, Inventory.record_id)
+        ).label('expiry_rank')
+        
+        query = self.db.query(
+            Inventory.hospital_id,
+            Inventory.blood_group,
+            Inventory.component,
+            Inventory.record_id,
+            Inventory.units,
+            Inventory.unit_expiry_date,
+            rank
+        )
+        
+        if hospital_id:
+            query = query.filter(Inventory.hospital_id == hospital_id)
+        
+        ranked = query.subquery()
+        return self.db.query(
+            ranked.c.hospital_id,
+            ranked.c.blood_group,
+            ranked.c.component,
+            ranked.c.record_id,
+            ranked.c.units,
+            ranked.c.unit_expiry_date
+        ).filter(ranked.c.expiry_rank == 1).all()
+    
     def exists(self, record_id: str) -> bool:
         """
         Check if a record exists.
@@ -1,11 +1,23 @@
 """Usage repository for database operations."""
-from typing import List, Optional
-from datetime import date, timedelta
+from typing import Iterator, List, Optional
+from datetime import date, datetime, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select
+from app.config import settings
 from app.models.usage import Usage
 from app.schemas.usage import UsageCreate
 
+# Columns read by stream_rows
+EXPORT_COLUMNS = [
+    'usage_id',
+    'hospital_id',
+    'blood_group',
+    'component',
+    'units_used',
+    'usage_date',
+    'purpose'
+]
+
 
 class UsageRepository:
     """Repository for usage CRUD operations."""
@@ -162,6 +174,82 @@ class UsageRepository:
             for result in results
         ]
     
+    def get_daily_totals(
+        self,
+        start_date: date,
+        end_date: date,
+        hospital_id: Optional[str] = None,
+        blood_group: Optional[str] = None,
+        component: Optional[str] = None
+    ) -> List:
+        """
+        Get daily usage totals for every series in one aggregate query.
+        
+        Args:
+            start_date: First usage date (inclusive)
+            end_date: Last usage date (inclusive)
+            hospital_id: Optional hospital ID filter
+            blood_group: Optional blood group filter
+            component: Optional component filter
+            
+        Returns:
+            Rows of (hospital_id, blood_group, component, usage_date, total_units)
+        """
+        query = self.db.query(
+            Usage.hospital_id,
+            Usage.blood_group,
+            Usage.component,
+            Usage.usage_date,
+            func.sum(Usage.units_used).label('total_units')
+        ).filter(
+            Usage.usage_date >= start_date,
+            Usage.usage_date <= end_date
+        )
+        
+        if hospital_id:
+            query = query.filter(Usage.hospital_id == hospital_id)
+        if blood_group:
+            query = query.filter(Usage.blood_group == blood_group)
+        if component:
+            query = query.filter(Usage.component == component)
+        
+        return query.group_by(
+            Usage.hospital_id,
+            Usage.blood_group,
+            Usage.component,
+            Usage.usage_date
+        ).all()
+    
+    def get_change_marks(self, start_date: date, since: Optional[datetime] = None) -> List:
+        """
+        Get per-series high-water marks of recently created usage rows.
+        
+        Args:
+            start_date: First usage date of the history window (inclusive);
+                older rows cannot change a forecast
+            since: Only count rows created after this time (all rows if None)
+            
+        Returns:
+            Rows of (hospital_id, blood_group, component, max_created_at,
+            max_usage_date)
+        """
+        query = self.db.query(
+            Usage.hospital_id,
+            Usage.blood_group,
+            Usage.component,
+            func.max(Usage.created_at).label('max_created_at'),
+            func.max(Usage.usage_date).label('max_usage_date')
+        ).filter(Usage.usage_date >= start_date)
+        
+        if since is not None:
+            query = query.filter(Usage.created_at > since)
+        
+        return query.group_by(
+            Usage.hospital_id,
+            Usage.blood_group,
+            Usage.component
+        ).all()
+    
     def get_all(self) -> List[Usage]:
         """
         Get all usage records.
@@ -170,3 +258,40 @@ class UsageRepository:
             List of usage records
         """
         return self.db.query(Usage).all()
+    
+    def stream_rows(
+        self,
+        hospital_id: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        batch_size: Optional[int] = None
+    ) -> Iterator[List]:
+        """
+        Stream usage rows in batches through a server-side cursor.
+        
+        Args:
+            hospital_id: Optional hospital ID filter
+            start_date: Optional first usage date (inclusive)
+            end_date: Optional last usage date (inclusive)
+            batch_size: Rows fetched per round trip (uses config default if
+                not provided)
+                
+        Returns:
+            Iterator of row lists with the EXPORT_COLUMNS attributes, in
+            (usage_date, usage_id) order
+        """
+        if batch_size is None:
+            batch_size = settings.export_batch_size
+        
+        stmt = select(*(getattr(Usage, column) for column in EXPORT_COLUMNS))
+        if hospital_id:
+            stmt = stmt.where(Usage.hospital_id == hospital_id)
+        if start_date:
+            stmt = stmt.where(Usage.usage_date >= start_date)
+        if end_date:
+            stmt = stmt.where(Usage.usage_date <= end_date)
+        stmt = stmt.order_by(Usage.usage_date, Usage.usage_id)
+        
+        result = self.db.execute(stmt.execution_options(yield_per=max(1, batch_size)))
+        for rows in result.partitions():
+            yield rows
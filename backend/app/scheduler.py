@@ -1,5 +1,6 @@
 """Background job scheduler."""
 import logging
+from typing import Optional
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 from app.config import settings
@@ -11,42 +12,124 @@ logger = logging.getLogger(__name__)
 scheduler = None
 
 
-def generate_daily_forecasts():
-    """Background job to generate daily forecasts for all hospitals."""
+def generate_daily_forecasts(incremental: Optional[bool] = None, reconciliation: Optional[str] = None):
+    """
+    Background job to generate daily forecasts for all hospitals.
+    
+    Usage history is pre-fetched in this process, series are fitted in a
+    process pool sized by ``settings.max_workers`` (or all at once with the
+    statistical backend) and results are written back in bulk under a new
+    forecast run. The run becomes the latest forecast only once every
+    series has been written. Prophet models fitted by the job are written
+    to the model cache, so on-demand forecasts of unchanged series only predict.
+    
+    With incremental refresh, only series with usage rows created since
+    their last fit (or last fitted more than FORECAST_REFIT_MAX_AGE_DAYS
+    ago) are refitted; the latest forecasts of the others are rolled
+    forward into the new run.
+    
+    With a reconciliation method, each hospital's 24 series come from 1-4
+    fits of hospital and component totals (see ``forecast_hierarchy``);
+    hospitals are then refitted or reused as a whole.
+    
+    Args:
+        incremental: Refit only changed series (uses config default if
+            not provided)
+        reconciliation: "none" for one fit per series, or one of
+            RECONCILIATION_METHODS (uses config default if not provided)
+    
+    Returns:
+        Job summary dictionary, or None if the job failed
+        
+    Raises:
+        ValueError: If the reconciliation method is not recognized
+    """
     from app.repositories.hospital import HospitalRepository
     from app.services.forecast import ForecastService
+    from app.services.forecast_hierarchy import RECONCILIATION_METHODS
+    from app.services.forecast_pool import ForecastJobSummary, ForecastPool, run_hierarchical, run_vectorized
     from app.schemas.enums import BloodGroup, Component
     
+    if incremental is None:
+        incremental = settings.forecast_incremental_refresh
+    reconciliation = reconciliation or settings.forecast_reconciliation
+    if reconciliation != "none" and reconciliation not in RECONCILIATION_METHODS:
+        raise ValueError(
+            f"Unknown reconciliation method: {reconciliation}. "
+            f"Must be one of: none, {', '.join(RECONCILIATION_METHODS)}"
+        )
+    
     logger.info("Starting daily forecast generation job...")
     db = SessionLocal()
+    run_id = None
     
     try:
         hospital_repo = HospitalRepository(db)
         forecast_service = ForecastService(db)
         
-        hospitals = hospital_repo.get_all()
-        blood_groups = list(BloodGroup)
-        components = list(Component)
+        hospital_ids = [hospital.hospital_id for hospital in hospital_repo.get_all()]
+        series = [
+            (hospital_id, blood_group.value, component.value)
+            for hospital_id in hospital_ids
+            for blood_group in BloodGroup
+            for component in Component
+        ]
+        
+        model_cache = forecast_service.model_cache
+        if model_cache is not None and len(series) > model_cache.max_entries:
+            logger.warning(
+                f"Model cache holds {model_cache.max_entries} models but the run fits up to {len(series)} series; "
+                f"raise FORECAST_MODEL_CACHE_MAX_ENTRIES or the run evicts its own models"
+            )
+        
+        plan = forecast_service.plan_refresh(series, days=7, reuse=incremental)
+        if reconciliation != "none":
+            plan.expand_to_hospitals()
+        run_id = forecast_service.forecast_repo.start_run(forecast_service.backend, len(series))
         
-        forecast_count = 0
-        for hospital in hospitals:
-            for blood_group in blood_groups:
-                for component in components:
-                    try:
-                        forecast_service.generate_and_store_forecast(
-                            hospital_id=hospital.hospital_id,
-                            blood_group=blood_group.value,
-                            component=component.value,
-                            days=7
-                        )
-                        forecast_count += 1
-                    except Exception as e:
-                        logger.error(f"Failed to generate forecast for {hospital.hospital_id}, {blood_group.value}, {component.value}: {str(e)}")
+        def write(results):
+            return forecast_service.store_forecasts(results, run_id=run_id)
         
-        logger.info(f"Daily forecast generation completed. Generated {forecast_count} forecasts.")
+        if not plan.dirty:
+            job = ForecastJobSummary(0)
+        elif reconciliation != "none":
+            job = run_hierarchical(forecast_service, plan.dirty, write=write, method=reconciliation, days=7)
+        elif forecast_service.backend == "statistical":
+            # Vectorized backend fits every series at once in this process
+            job = run_vectorized(forecast_service, plan.dirty, write=write, days=7)
+        else:
+            tasks = forecast_service.build_forecast_tasks(plan.dirty, days=7)
+            job = ForecastPool().run(tasks, write=write, total=len(plan.dirty))
         
+        if plan.reused:
+            job.forecasts_written += write(plan.reused)
+        job.record_reused(len(plan.reused), plan.fit_seconds_saved)
+        
+        forecast_service.forecast_repo.complete_run(
+            run_id,
+            job.forecasts_written,
+            series_state=plan.state_rows(job.fitted_seconds, run_id=run_id)
+        )
+        if forecast_service.model_cache is not None:
+            # Workers only evict every few writes; trim what they left over the limits
+            forecast_service.model_cache.evict()
+        summary = job.to_dict()
+        summary["run_id"] = run_id
+        
+        logger.info(
+            f"Daily forecast generation completed. Generated {summary['completed']} forecasts "
+            f"({summary['skipped']} skipped, {summary['failed']} failed, "
+            f"{summary['forecasts_written']} rows written) from {summary['model_fits']} model fits "
+            f"in {summary['elapsed_seconds']}s; mean fit {summary['fit_seconds_mean']}s, max fit {summary['fit_seconds_max']}s. "
+            f"Reused {summary['reused']} unchanged series, saving about {summary['fit_seconds_saved']}s of fitting."
+        )
+        return summary
+    
     except Exception as e:
         logger.error(f"Error in daily forecast job: {str(e)}")
+        if run_id is not None:
+            db.rollback()
+            forecast_service.forecast_repo.fail_run(run_id)
     finally:
         db.close()
 
@@ -1,6 +1,6 @@
 """Inventory schemas"""
 from pydantic import BaseModel, Field, field_validator
-from typing import Optional
+from typing import List, Optional
 from datetime import date, datetime
 from .enums import BloodGroup, Component
 
@@ -50,3 +50,11 @@ class InventoryFilters(BaseModel):
     hospital_id: Optional[str] = None
     blood_group: Optional[BloodGroup] = None
     component: Optional[Component] = None
+
+
+class InventoryPage(BaseModel):
+    """Schema for one page of an inventory listing"""
+    items: List[InventoryResponse]
+    limit: int
+    sort: str
+    next_cursor: Optional[str] = None
@@ -1,10 +1,29 @@
 """Expiry risk calculation service."""
+from __future__ import annotations
 from datetime import date, timedelta
-from typing import List, Dict
+from typing import Iterator, List, Dict, Optional, Sequence, Union
 from sqlalchemy.orm import Session
 from app.models.inventory import Inventory
 from app.repositories.inventory import InventoryRepository
+from app.schemas.inventory import InventoryFilters
 from app.config import settings
+from app.utils.lazy_import import lazy_module
+
+np = lazy_module("numpy")
+
+# Keys of the records returned with risk scores, in export column order
+RISK_FIELDS = [
+    "record_id",
+    "hospital_id",
+    "blood_group",
+    "component",
+    "units",
+    "unit_expiry_date",
+    "collection_date",
+    "days_to_expiry",
+    "expiry_risk_score",
+    "is_high_risk"
+]
 
 
 class ExpiryService:
@@ -21,6 +40,47 @@ class ExpiryService:
         self.repository = InventoryRepository(db)
         self.threshold_days = settings.expiry_risk_threshold_days
     
+    def calculate_risk_scores(
+        self,
+        expiry_dates: Union[np.ndarray, Sequence[date]],
+        units: Union[np.ndarray, Sequence[int]],
+        threshold_days: Optional[int] = None,
+        today: Optional[date] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Score a batch of inventory records in one pass.
+        
+        Formula: risk_score = units / max(days_to_expiry + 1, 1)
+        
+        Every record is measured against the same reference date, so a batch
+        scored across midnight stays consistent. The denominator is clamped
+        to 1, so expired units score like units expiring today instead of
+        infinity (which is not valid JSON) or a negative value.
+        
+        Args:
+            expiry_dates: Unit expiry dates (datetime64[D] array or dates)
+            units: Number of units per record
+            threshold_days: Optional custom threshold (uses config default if not provided)
+            today: Reference date (defaults to today)
+            
+        Returns:
+            Dictionary of arrays: days_to_expiry (int64), risk_score
+            (float64) and is_high_risk (bool)
+        """
+        if threshold_days is None:
+            threshold_days = self.threshold_days
+        reference = np.datetime64(today or date.today(), 'D')
+        
+        expiry = np.asarray(expiry_dates, dtype='datetime64[D]')
+        days_to_expiry = (expiry - reference).astype(np.int64)
+        risk_score = np.asarray(units, dtype=np.float64) / np.maximum(days_to_expiry + 1, 1)
+        
+        return {
+            "days_to_expiry": days_to_expiry,
+            "risk_score": risk_score,
+            "is_high_risk": days_to_expiry <= threshold_days
+        }
+    
     def calculate_days_to_expiry(self, expiry_date: date) -> int:
         """
         Calculate days until expiry.
@@ -31,13 +91,13 @@ class ExpiryService:
         Returns:
             Number of days until expiry (negative if expired)
         """
-        return (expiry_date - date.today()).days
+        return int(self.calculate_risk_scores([expiry_date], [0])["days_to_expiry"][0])
     
     def calculate_expiry_risk_score(self, expiry_date: date, units: int) -> float:
         """
         Calculate expiry risk score.
         
-        Formula: risk_score = (1 / (days_to_expiry + 1)) * units
+        Formula: risk_score = units / max(days_to_expiry + 1, 1)
         
         Args:
             expiry_date: Unit expiry date
@@ -46,9 +106,7 @@ class ExpiryService:
         Returns:
             Expiry risk score
         """
-        days_to_expiry = self.calculate_days_to_expiry(expiry_date)
-        risk_score = (1.0 / (days_to_expiry + 1)) * units
-        return risk_score
+        return float(self.calculate_risk_scores([expiry_date], [units])["risk_score"][0])
     
     def is_high_risk(self, expiry_date: date, threshold_days: int = None) -> bool:
         """
@@ -61,11 +119,7 @@ class ExpiryService:
         Returns:
             True if high risk, False otherwise
         """
-        if threshold_days is None:
-            threshold_days = self.threshold_days
-        
-        days_to_expiry = self.calculate_days_to_expiry(expiry_date)
-        return days_to_expiry <= threshold_days
+        return bool(self.calculate_risk_scores([expiry_date], [0], threshold_days)["is_high_risk"][0])
     
     def get_high_risk_units(self, threshold_days: int = None) -> List[Inventory]:
         """
@@ -82,53 +136,29 @@ class ExpiryService:
         
         return self.repository.get_by_expiry_range(threshold_days)
     
-    def get_expiry_summary(self) -> Dict:
+    def get_expiry_summary(self, hospital_id: Optional[str] = None) -> Dict:
         """
         Get summary of expiry risk across all inventory.
         
+        Computed with one aggregate query; no inventory rows are loaded.
+        
+        Args:
+            hospital_id: Optional hospital ID filter
+            
         Returns:
             Dictionary with expiry summary statistics
         """
-        # Get all inventory
-        all_inventory = self.repository.get_all()
-        
-        # Get high-risk units
-        high_risk_units = self.get_high_risk_units()
-        
-        # Calculate statistics
-        total_units = sum(record.units for record in all_inventory)
-        high_risk_count = len(high_risk_units)
-        high_risk_total_units = sum(record.units for record in high_risk_units)
-        
-        # Calculate units near expiry by days
-        units_expiring_today = 0
-        units_expiring_tomorrow = 0
-        units_expiring_3_days = 0
-        units_expiring_7_days = 0
-        
-        today = date.today()
-        
-        for record in all_inventory:
-            days_to_expiry = self.calculate_days_to_expiry(record.unit_expiry_date)
-            
-            if days_to_expiry == 0:
-                units_expiring_today += record.units
-            if days_to_expiry <= 1:
-                units_expiring_tomorrow += record.units
-            if days_to_expiry <= 3:
-                units_expiring_3_days += record.units
-            if days_to_expiry <= 7:
-                units_expiring_7_days += record.units
+        row = self.repository.get_expiry_summary(self.threshold_days, hospital_id)
         
         return {
-            "total_units": total_units,
-            "total_records": len(all_inventory),
-            "high_risk_count": high_risk_count,
-            "high_risk_units": high_risk_total_units,
-            "units_expiring_today": units_expiring_today,
-            "units_expiring_tomorrow": units_expiring_tomorrow,
-            "units_expiring_3_days": units_expiring_3_days,
-            "units_expiring_7_days": units_expiring_7_days,
+            "total_units": int(row.total_units),
+            "total_records": int(row.total_records),
+            "high_risk_count": int(row.high_risk_count),
+            "high_risk_units": int(row.high_risk_units),
+            "units_expiring_today": int(row.units_expiring_today),
+            "units_expiring_tomorrow": int(row.units_expiring_tomorrow),
+            "units_expiring_3_days": int(row.units_expiring_3_days),
+            "units_expiring_7_days": int(row.units_expiring_7_days),
             "threshold_days": self.threshold_days
         }
     
@@ -140,14 +170,42 @@ class ExpiryService:
             List of inventory records with risk scores
         """
         all_inventory = self.repository.get_all()
+        return self._with_risk_scores(all_inventory)
+    
+    def iter_inventory_with_risk_scores(
+        self,
+        hospital_id: Optional[str] = None,
+        batch_size: Optional[int] = None
+    ) -> Iterator[List[Dict]]:
+        """
+        Stream inventory with risk scores, one batch at a time.
         
-        results = []
-        for record in all_inventory:
-            days_to_expiry = self.calculate_days_to_expiry(record.unit_expiry_date)
-            risk_score = self.calculate_expiry_risk_score(record.unit_expiry_date, record.units)
-            is_high_risk = self.is_high_risk(record.unit_expiry_date)
+        Rows are read through a server-side cursor and scored per batch, so
+        memory stays bounded by the batch size for exports of any size.
+        
+        Args:
+            hospital_id: Optional hospital ID filter
+            batch_size: Rows per batch (uses config default if not provided)
             
-            results.append({
+        Returns:
+            Iterator of lists of inventory records with risk scores
+        """
+        filters = InventoryFilters(hospital_id=hospital_id)
+        for rows in self.repository.stream_rows(filters, batch_size):
+            yield self._with_risk_scores(rows)
+    
+    def _with_risk_scores(self, records) -> List[Dict]:
+        """Build RISK_FIELDS dictionaries for inventory records or rows."""
+        if not records:
+            return []
+        
+        scores = self.calculate_risk_scores(
+            np.array([record.unit_expiry_date for record in records], dtype='datetime64[D]'),
+            np.fromiter((record.units for record in records), dtype=np.float64, count=len(records))
+        )
+        
+        return [
+            {
                 "record_id": record.record_id,
                 "hospital_id": record.hospital_id,
                 "blood_group": record.blood_group,
@@ -156,8 +214,13 @@ class ExpiryService:
                 "unit_expiry_date": record.unit_expiry_date,
                 "collection_date": record.collection_date,
                 "days_to_expiry": days_to_expiry,
-                "expiry_risk_score": round(risk_score, 4),
+                "expiry_risk_score": risk_score,
                 "is_high_risk": is_high_risk
-            })
-        
-        return results
+            }
+            for record, days_to_expiry, risk_score, is_high_risk in zip(
+                records,
+                scores["days_to_expiry"].tolist(),
+                np.round(scores["risk_score"], 4).tolist(),
+                scores["is_high_risk"].tolist()
+            )
+        ]
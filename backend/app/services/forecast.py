@@ -1,30 +1,77 @@
-"""Forecasting service using Prophet."""
-import pandas as pd
-import numpy as np
+"""Forecasting service using Prophet or a vectorized statistical backend."""
+from __future__ import annotations
+import hashlib
+import json
 from datetime import date, timedelta
-from typing import List, Dict, Optional, Tuple
+from typing import Callable, List, Dict, Iterator, Optional, Tuple, TYPE_CHECKING
 from sqlalchemy.orm import Session
-from prophet import Prophet
 from app.repositories.usage import UsageRepository
 from app.repositories.forecast import ForecastRepository
+from app.services.forecast_history import HistoryMatrix, SeriesKey
+from app.services.forecast_hierarchy import Hierarchy, TOTAL
+from app.services.forecast_refresh import RefreshPlan, changes_since
+from app.services.forecast_statistical import StatisticalForecaster
+from app.utils.model_cache import ModelCache, model_cache as default_model_cache
 from app.config import settings
+from app.utils.lazy_import import lazy_module
+
+np = lazy_module("numpy")
+pd = lazy_module("pandas")
+
+if TYPE_CHECKING:
+    from prophet import Prophet
+
+# Forecasting backends accepted by ForecastService
+FORECAST_BACKENDS = ("prophet", "statistical")
+
+# Minimum history needed to fit any backend
+MIN_HISTORY_DAYS = 14
+
+# Trailing days held out to evaluate each fit
+TEST_DAYS = 30
+
+PROPHET_PARAMS = {
+    "yearly_seasonality": False,
+    "weekly_seasonality": True,
+    "daily_seasonality": False
+}
 
 
 class ForecastService:
-    """Service for demand forecasting using Prophet."""
+    """Service for demand forecasting."""
     
-    def __init__(self, db: Session):
+    def __init__(
+        self,
+        db: Session,
+        backend: Optional[str] = None,
+        model_cache: Optional[ModelCache] = None
+    ):
         """
         Initialize service with database session.
         
         Args:
             db: SQLAlchemy database session
+            backend: "prophet" or "statistical" (uses config default if not provided)
+            model_cache: Cache of fitted Prophet models (uses the global cache
+                if not provided and FORECAST_MODEL_CACHE_ENABLED is set)
+            
+        Raises:
+            ValueError: If the backend is not recognized
         """
+        backend = backend or settings.forecast_backend
+        if backend not in FORECAST_BACKENDS:
+            raise ValueError(f"Unknown forecast backend: {backend}. Must be one of: {', '.join(FORECAST_BACKENDS)}")
+        
         self.db = db
         self.usage_repo = UsageRepository(db)
         self.forecast_repo = ForecastRepository(db)
         self.history_days = settings.forecast_history_days
         self.confidence_interval = settings.forecast_confidence_interval
+        self.backend = backend
+        
+        if model_cache is None and settings.forecast_model_cache_enabled:
+            model_cache = default_model_cache
+        self.model_cache = model_cache
     
     def preprocess_data(
         self,
@@ -69,10 +116,38 @@ class ForecastService:
         
         return merged_df
     
+    @staticmethod
+    def frame_from_units(units: np.ndarray, start_date: date) -> pd.DataFrame:
+        """
+        Build a forecasting DataFrame from a dense daily usage array.
+        
+        Args:
+            units: Daily units, one value per day starting at start_date
+            start_date: Date of the first value
+            
+        Returns:
+            DataFrame with ds/y columns
+        """
+        return pd.DataFrame({
+            'ds': pd.date_range(start=start_date, periods=len(units), freq='D'),
+            'y': units
+        })
+    
+    def history_window(self) -> Tuple[date, date]:
+        """
+        Get the history window used for training.
+        
+        Returns:
+            Tuple of (start_date, end_date), both inclusive
+        """
+        end_date = date.today()
+        start_date = end_date - timedelta(days=self.history_days)
+        return start_date, end_date
+    
     def train_test_split(
         self,
         df: pd.DataFrame,
-        test_days: int = 30
+        test_days: int = TEST_DAYS
     ) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """
         Split data into train and test sets.
@@ -94,34 +169,121 @@ class ForecastService:
         
         return train_df, test_df
     
-    def train_model(self, train_df: pd.DataFrame) -> Prophet:
+    def train_model(self, train_df: pd.DataFrame, init: Optional[Dict] = None) -> "Prophet":
         """
         Train Prophet model on historical data.
         
         Args:
             train_df: Training data DataFrame
+            init: Optional starting parameters (see ``warm_start_params``)
             
         Returns:
             Trained Prophet model
         """
-        model = Prophet(
-            yearly_seasonality=False,
-            weekly_seasonality=True,
-            daily_seasonality=False,
-            interval_width=self.confidence_interval
-        )
+        from prophet import Prophet
+        
+        model = Prophet(interval_width=self.confidence_interval, **PROPHET_PARAMS)
         
         # Suppress Prophet's verbose output
         import logging
         logging.getLogger('prophet').setLevel(logging.WARNING)
         logging.getLogger('cmdstanpy').setLevel(logging.WARNING)
         
-        model.fit(train_df)
+        if init is None:
+            model.fit(train_df)
+        else:
+            model.fit(train_df, init=init)
         return model
     
+    @staticmethod
+    def warm_start_params(model: "Prophet") -> Dict:
+        """
+        Extract fitted parameters to start the optimizer of a later fit from.
+        
+        Args:
+            model: Fitted Prophet model
+            
+        Returns:
+            Stan initial values
+        """
+        params = {name: model.params[name][0][0] for name in ("k", "m", "sigma_obs")}
+        params.update({name: model.params[name][0] for name in ("delta", "beta")})
+        return params
+    
+    def model_config(self) -> Dict:
+        """
+        Settings a fitted model depends on, hashed into its cache key.
+        
+        Returns:
+            Model configuration dictionary
+        """
+        return {
+            "backend": self.backend,
+            "confidence_interval": self.confidence_interval,
+            "history_days": self.history_days,
+            "test_days": TEST_DAYS,
+            "prophet": PROPHET_PARAMS
+        }
+    
+    def fit_prophet(
+        self,
+        hospital_id: str,
+        blood_group: str,
+        component: str,
+        df: pd.DataFrame
+    ) -> Tuple["Prophet", Dict[str, float]]:
+        """
+        Get a fitted and evaluated Prophet model for a series.
+        
+        A model cached for the same series, configuration and history is
+        loaded instead of refitted. Otherwise the model is fitted, starting
+        from the parameters of the series' newest cached model if there is
+        one, and cached for later requests.
+        
+        Args:
+            hospital_id: Hospital ID
+            blood_group: Blood group
+            component: Component type
+            df: Continuous daily series with ds/y columns
+            
+        Returns:
+            Tuple of (model, metrics)
+        """
+        from prophet.serialize import model_from_json, model_to_json
+        
+        if self.model_cache is None:
+            train_df, test_df = self.train_test_split(df)
+            model = self.train_model(train_df)
+            return model, self.evaluate_model(model, test_df)
+        
+        series_key = ModelCache.series_key(hospital_id, blood_group, component, self.model_config())
+        digest = hashlib.sha1(df['y'].to_numpy(dtype=np.float64).tobytes()).hexdigest()
+        history_key = ModelCache.history_key(df['ds'].iloc[-1].date().isoformat(), digest)
+        
+        cached = self.model_cache.get(series_key, history_key)
+        if cached is not None:
+            entry = json.loads(cached)
+            return model_from_json(entry["model"]), entry["metrics"]
+        
+        previous = self.model_cache.latest(series_key)
+        init = None
+        if previous is not None:
+            init = self.warm_start_params(model_from_json(json.loads(previous)["model"]))
+        
+        train_df, test_df = self.train_test_split(df)
+        model = self.train_model(train_df, init=init)
+        metrics = self.evaluate_model(model, test_df)
+        
+        self.model_cache.put(
+            series_key,
+            history_key,
+            json.dumps({"model": model_to_json(model), "metrics": metrics})
+        )
+        return model, metrics
+    
     def evaluate_model(
         self,
-        model: Prophet,
+        model: "Prophet",
         test_df: pd.DataFrame
     ) -> Dict[str, float]:
         """
@@ -180,43 +342,59 @@ class ForecastService:
         Returns:
             Dictionary with forecast results and metrics
         """
-        # Get historical usage data
-        usage_data = self.usage_repo.get_aggregated_daily(
+        # Get historical usage data as a continuous daily series
+        history = self.load_history(
+            [(hospital_id, blood_group, component)],
             hospital_id=hospital_id,
             blood_group=blood_group,
-            component=component,
-            days=self.history_days
+            component=component
         )
+        df = self.frame_from_units(history.units[0], history.start_date)
         
-        # Preprocess data
-        end_date = date.today()
-        start_date = end_date - timedelta(days=self.history_days)
-        df = self.preprocess_data(usage_data, start_date, end_date)
-        
-        # Check if we have enough data
-        if len(df) < 14:  # Need at least 2 weeks of data
-            return {
-                "error": "Insufficient historical data for forecasting",
-                "min_required_days": 14,
-                "available_days": len(df)
-            }
+        return self.forecast_series(hospital_id, blood_group, component, df, days)
+    
+    def forecast_series(
+        self,
+        hospital_id: str,
+        blood_group: str,
+        component: str,
+        df: pd.DataFrame,
+        days: int = 7
+    ) -> Dict:
+        """
+        Train, evaluate and forecast one preprocessed daily series.
         
-        # Train-test split
-        train_df, test_df = self.train_test_split(df)
+        Does not touch the database, so it can run in a worker process.
+        Prophet models come from the model cache when the series' history
+        is unchanged, so only the prediction step runs.
         
-        # Train model
-        model = self.train_model(train_df)
+        Args:
+            hospital_id: Hospital ID
+            blood_group: Blood group
+            component: Component type
+            df: Continuous daily series with ds/y columns
+            days: Number of days to forecast (default 7)
+            
+        Returns:
+            Dictionary with forecast results and metrics
+        """
+        # Check if we have enough data
+        if len(df) < MIN_HISTORY_DAYS:  # Need at least 2 weeks of data
+            return self.insufficient_history(len(df))
         
-        # Evaluate model
-        metrics = self.evaluate_model(model, test_df)
+        if self.backend == "statistical":
+            units = df['y'].to_numpy(dtype=np.float64)[np.newaxis, :]
+            start_date = df['ds'].iloc[0].date()
+            return self.forecast_many([(hospital_id, blood_group, component)], units, start_date, days)[0]
         
-        # Generate future forecast
-        future_dates = model.make_future_dataframe(periods=days, freq='D')
-        forecast = model.predict(future_dates)
+        # Train and evaluate, or load the cached model
+        model, metrics = self.fit_prophet(hospital_id, blood_group, component, df)
         
-        # Extract forecast for future dates only
-        forecast_start_idx = len(df)
-        future_forecast = forecast.iloc[forecast_start_idx:].copy()
+        # Forecast the days following the history
+        future_dates = pd.DataFrame({
+            'ds': pd.date_range(start=df['ds'].iloc[-1] + pd.Timedelta(days=1), periods=days, freq='D')
+        })
+        future_forecast = model.predict(future_dates)
         
         # Format forecast results
         forecast_points = []
@@ -234,11 +412,315 @@ class ForecastService:
             "component": component,
             "forecast": forecast_points,
             "metrics": metrics,
+            "backend": self.backend,
             "generated_at": date.today().isoformat(),
             "history_days": self.history_days,
             "forecast_days": days
         }
     
+    @staticmethod
+    def insufficient_history(available_days: int) -> Dict:
+        """
+        Build the error result for a series too short to forecast.
+        
+        Args:
+            available_days: Days of history available
+            
+        Returns:
+            Error dictionary
+        """
+        return {
+            "error": "Insufficient historical data for forecasting",
+            "min_required_days": MIN_HISTORY_DAYS,
+            "available_days": available_days
+        }
+    
+    def forecast_many(
+        self,
+        series: List[SeriesKey],
+        units: np.ndarray,
+        start_date: date,
+        days: int = 7
+    ) -> List[Dict]:
+        """
+        Forecast many series given as a dense [series x days] usage array.
+        
+        The statistical backend fits every row at once with array
+        operations; the Prophet backend fits the rows one after another.
+        
+        Args:
+            series: (hospital_id, blood_group, component) key of each row
+            units: Daily usage, one row per series starting at start_date
+            start_date: Date of the first column
+            days: Number of days to forecast (default 7)
+            
+        Returns:
+            One forecast result (or error) dictionary per series, in order
+        """
+        n_days = units.shape[1]
+        if n_days < MIN_HISTORY_DAYS:
+            return [self.insufficient_history(n_days) for _ in series]
+        
+        if self.backend == "prophet":
+            return [
+                self.forecast_series(hospital_id, blood_group, component, self.frame_from_units(row, start_date), days)
+                for (hospital_id, blood_group, component), row in zip(series, units)
+            ]
+        
+        fitted = StatisticalForecaster(self.confidence_interval).fit_predict(units, days)
+        
+        # Round and clip all series at once, then convert to plain floats
+        predicted = np.maximum(0, np.round(fitted["predicted"], 2)).tolist()
+        lower = np.maximum(0, np.round(fitted["lower"], 2)).tolist()
+        upper = np.maximum(0, np.round(fitted["upper"], 2)).tolist()
+        mae = fitted["mae"].tolist()
+        mape = fitted["mape"].tolist()
+        
+        first_day = start_date + timedelta(days=n_days)
+        dates = [(first_day + timedelta(days=i)).isoformat() for i in range(days)]
+        generated_at = date.today().isoformat()
+        
+        results = []
+        for i, (hospital_id, blood_group, component) in enumerate(series):
+            results.append({
+                "hospital_id": hospital_id,
+                "blood_group": blood_group,
+                "component": component,
+                "forecast": [
+                    {"date": day, "predicted": p, "lower": lo, "upper": up}
+                    for day, p, lo, up in zip(dates, predicted[i], lower[i], upper[i])
+                ],
+                "metrics": {"mae": mae[i], "mape": mape[i]},
+                "backend": self.backend,
+                "generated_at": generated_at,
+                "history_days": self.history_days,
+                "forecast_days": days
+            })
+        
+        return results
+    
+    def forecast_hierarchy(
+        self,
+        series: List[SeriesKey],
+        units: np.ndarray,
+        start_date: date,
+        days: int = 7,
+        method: str = "mint",
+        fit: Optional[Callable[[List[SeriesKey], np.ndarray], List[Dict]]] = None
+    ) -> Tuple[List[Dict], int]:
+        """
+        Forecast many series from a few aggregated fits per hospital.
+        
+        Hospital and/or component totals are fitted, reconciled with
+        ``method`` and split to blood groups by historical shares, so each
+        hospital needs 1-4 fits instead of one per series. Metrics are the
+        fitted parent's holdout metrics, with MAE scaled by the share.
+        
+        Args:
+            series: (hospital_id, blood_group, component) key of each row
+            units: Daily usage, one row per series starting at start_date
+            start_date: Date of the first column
+            days: Number of days to forecast (default 7)
+            method: Reconciliation method (see RECONCILIATION_METHODS)
+            fit: Callable fitting aggregated (keys, units) into results like
+                ``forecast_many`` (defaults to ``forecast_many``)
+            
+        Returns:
+            Tuple of (one forecast result or error dictionary per series, in
+            order; number of aggregated series fitted)
+            
+        Raises:
+            ValueError: If the method is not recognized
+        """
+        hierarchy = Hierarchy(series, units)
+        keys, aggregate_units = hierarchy.aggregates(method)
+        
+        if fit is None:
+            fitted = self.forecast_many(keys, aggregate_units, start_date, days)
+        else:
+            fitted = fit(keys, aggregate_units)
+        
+        # A hospital with an aggregate that could not be fitted gets its error
+        errors = {}
+        for (hospital_id, _, _), result in zip(keys, fitted):
+            if "error" in result:
+                errors.setdefault(hospital_id, result)
+        
+        def values(name: str) -> np.ndarray:
+            return np.array([
+                [0.0] * days if "error" in result else [point[name] for point in result["forecast"]]
+                for result in fitted
+            ], dtype=np.float64).reshape(len(fitted), days)
+        
+        mae = np.array([result.get("metrics", {}).get("mae", 0.0) for result in fitted])
+        mape = np.array([result.get("metrics", {}).get("mape", 0.0) for result in fitted])
+        reconciled = hierarchy.reconcile(method, values("predicted"), values("lower"), values("upper"), mae)
+        
+        predicted = np.maximum(0, np.round(reconciled["predicted"], 2)).tolist()
+        lower = np.maximum(0, np.round(reconciled["lower"], 2)).tolist()
+        upper = np.maximum(0, np.round(reconciled["upper"], 2)).tolist()
+        
+        # Row of the aggregate each series was split from
+        row_of = {key: i for i, key in enumerate(keys)}
+        parent_component = method != "top_down"
+        
+        first_day = start_date + timedelta(days=units.shape[1])
+        dates = [(first_day + timedelta(days=i)).isoformat() for i in range(days)]
+        generated_at = date.today().isoformat()
+        
+        results = []
+        for i, (hospital_id, blood_group, component) in enumerate(series):
+            if hospital_id in errors:
+                results.append(errors[hospital_id])
+                continue
+            
+            parent = row_of[(hospital_id, TOTAL, component if parent_component else TOTAL)]
+            results.append({
+                "hospital_id": hospital_id,
+                "blood_group": blood_group,
+                "component": component,
+                "forecast": [
+                    {"date": day, "predicted": p, "lower": lo, "upper": up}
+                    for day, p, lo, up in zip(dates, predicted[i], lower[i], upper[i])
+                ],
+                "metrics": {
+                    "mae": float(mae[parent] * hierarchy.blood_group_share[i]),
+                    "mape": float(mape[parent])
+                },
+                "backend": self.backend,
+                "reconciliation": method,
+                "generated_at": generated_at,
+                "history_days": self.history_days,
+                "forecast_days": days
+            })
+        
+        return results, len(keys)
+    
+    def load_history(
+        self,
+        series: List[Tuple[str, str, str]],
+        hospital_id: Optional[str] = None,
+        blood_group: Optional[str] = None,
+        component: Optional[str] = None
+    ) -> HistoryMatrix:
+        """
+        Load the training window for many series with one aggregate query.
+        
+        Args:
+            series: (hospital_id, blood_group, component) keys to load
+            hospital_id: Optional hospital ID filter pushed into the query
+            blood_group: Optional blood group filter pushed into the query
+            component: Optional component filter pushed into the query
+            
+        Returns:
+            Zero-filled [series x days] history matrix
+        """
+        start_date, end_date = self.history_window()
+        
+        rows = self.usage_repo.get_daily_totals(
+            start_date=start_date,
+            end_date=end_date,
+            hospital_id=hospital_id,
+            blood_group=blood_group,
+            component=component
+        )
+        
+        return HistoryMatrix.from_rows(rows, series, start_date, end_date)
+    
+    def plan_refresh(self, series: List[SeriesKey], days: int = 7, reuse: bool = True) -> RefreshPlan:
+        """
+        Find the series whose usage changed since their last fit.
+        
+        Reads the stored series state, the marks of usage rows created
+        since the oldest stored mark, and (when reusing) the latest
+        forecasts to roll forward.
+        
+        Args:
+            series: Series the job forecasts
+            days: Number of days to forecast
+            reuse: False to refit every series while still tracking marks
+            
+        Returns:
+            Refresh plan
+        """
+        start_date, end_date = self.history_window()
+        states = self.forecast_repo.get_series_state()
+        changes = self.usage_repo.get_change_marks(start_date, since=changes_since(states, series))
+        latest_points = self.forecast_repo.get_latest_points() if reuse else []
+        
+        return RefreshPlan(
+            series,
+            states,
+            changes,
+            latest_points,
+            backend=self.backend,
+            history_end=end_date,
+            days=days,
+            max_age_days=settings.forecast_refit_max_age_days,
+            reuse=reuse
+        )
+    
+    def build_forecast_tasks(self, series: List[SeriesKey], days: int = 7) -> Iterator[Dict]:
+        """
+        Pre-fetch usage history and yield forecast pool tasks.
+        
+        History for all series is loaded with one aggregate query; each
+        task's units are a view of its row in the history matrix.
+        
+        Args:
+            series: (hospital_id, blood_group, component) keys to forecast
+            days: Number of days to forecast
+            
+        Yields:
+            Task dictionaries for ``run_forecast_task``
+        """
+        history = self.load_history(series)
+        
+        for (hospital_id, blood_group, component), units in zip(history.series, history.units):
+            yield {
+                "hospital_id": hospital_id,
+                "blood_group": blood_group,
+                "component": component,
+                "units": units,
+                "start_date": history.start_date,
+                "days": days,
+                "backend": self.backend
+            }
+    
+    def store_forecasts(self, results: List[Dict], run_id: Optional[int] = None) -> int:
+        """
+        Store forecast results in database with one bulk write.
+        
+        Args:
+            results: Forecast result dictionaries from ``generate_forecast``
+            run_id: Optional forecast run the rows belong to
+            
+        Returns:
+            Number of forecast rows written
+        """
+        rows = [
+            {
+                "hospital_id": result["hospital_id"],
+                "blood_group": result["blood_group"],
+                "component": result["component"],
+                "forecast_date": date.fromisoformat(point["date"]),
+                "predicted_units": point["predicted"],
+                "lower_bound": point["lower"],
+                "upper_bound": point["upper"]
+            }
+            for result in results
+            for point in result["forecast"]
+        ]
+        
+        written = self.forecast_repo.create_many(rows, run_id=run_id)
+        
+        # Rows of a run reach forecast_latest when the run completes;
+        # individually generated forecasts replace their series right away
+        if run_id is None:
+            self.forecast_repo.upsert_latest(rows)
+        
+        return written
+    
     def generate_and_store_forecast(
         self,
         hospital_id: str,
@@ -262,16 +744,7 @@ class ForecastService:
         
         if "error" not in result:
             # Store forecast in database
-            for point in result["forecast"]:
-                self.forecast_repo.create({
-                    "hospital_id": hospital_id,
-                    "blood_group": blood_group,
-                    "component": component,
-                    "forecast_date": point["date"],
-                    "predicted_units": point["predicted"],
-                    "lower_bound": point["lower"],
-                    "upper_bound": point["upper"]
-                })
+            self.store_forecasts([result])
         
         return result
     
@@ -283,7 +756,7 @@ class ForecastService:
         days: int = 7
     ) -> List[Dict]:
         """
-        Get stored forecasts from database.
+        Get the latest stored forecast per series and date.
         
         Args:
             hospital_id: Hospital ID
@@ -297,7 +770,7 @@ class ForecastService:
         start_date = date.today()
         end_date = start_date + timedelta(days=days)
         
-        forecasts = self.forecast_repo.get_by_hospital(
+        forecasts = self.forecast_repo.get_latest(
             hospital_id=hospital_id,
             blood_group=blood_group,
             component=component,
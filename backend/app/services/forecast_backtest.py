@@ -0,0 +1,287 @@
+"""Rolling-origin backtests of forecast backends over many series at once."""
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+from typing import Dict, Iterator, Optional
+import numpy as np
+from app.config import settings
+
+# Metrics reported by every backtest, in table order
+BACKTEST_METRICS = ("mae", "mape", "smape", "coverage", "below_lower", "above_upper")
+
+# Shortest training window of a fold; shorter folds mostly score the
+# forecasters' warm-up
+MIN_TRAIN_DAYS = 56
+
+# Series per task for backends that fit one series at a time
+SERIES_PER_TASK = 10
+
+
+def rolling_cutoffs(
+    n_days: int,
+    horizon: int,
+    folds: int,
+    step: int,
+    min_train_days: int = MIN_TRAIN_DAYS
+) -> np.ndarray:
+    """
+    Get the training window lengths of a rolling-origin backtest.
+    
+    The last fold forecasts the final ``horizon`` days of the history and
+    each earlier fold moves the origin back by ``step`` days.
+    
+    Args:
+        n_days: Days of history
+        horizon: Days forecast from each origin
+        folds: Maximum number of origins
+        step: Days between origins
+        min_train_days: Shortest training window; earlier origins are dropped
+    
+    Returns:
+        Ascending cutoffs: fold k trains on days [0, cutoff) and is scored
+        on days [cutoff, cutoff + horizon)
+    
+    Raises:
+        ValueError: If the history is too short for a single fold
+    """
+    last = n_days - horizon
+    cutoffs = np.arange(last, last - folds * step, -step)
+    cutoffs = cutoffs[cutoffs >= min_train_days][::-1]
+    if len(cutoffs) == 0:
+        raise ValueError(
+            f"History of {n_days} days is too short for a {horizon}-day horizon "
+            f"after {min_train_days} training days"
+        )
+    return cutoffs
+
+
+def score(actual: np.ndarray, predicted: np.ndarray, lower: np.ndarray, upper: np.ndarray) -> Dict[str, float]:
+    """
+    Score forecasts against actuals over every point at once.
+    
+    Arrays share any shape, typically [series x folds x horizon]; points
+    without a forecast are NaN in ``predicted`` and ignored. MAPE skips
+    zero actuals and sMAPE counts points where both values are zero as
+    exact, so sparse series do not divide by zero.
+    
+    Args:
+        actual: Observed usage
+        predicted: Point forecasts
+        lower: Lower interval bounds
+        upper: Upper interval bounds
+    
+    Returns:
+        Dictionary of BACKTEST_METRICS plus the number of scored points;
+        mape and smape are percentages, coverage, below_lower and
+        above_upper are shares of points
+    """
+    scored = ~np.isnan(predicted)
+    points = int(scored.sum())
+    if points == 0:
+        return {"points": 0, **{metric: float("nan") for metric in BACKTEST_METRICS}}
+    
+    actual, predicted = actual[scored], predicted[scored]
+    lower, upper = lower[scored], upper[scored]
+    error = np.abs(actual - predicted)
+    
+    nonzero = actual != 0
+    mape = (error[nonzero] / actual[nonzero]).mean() * 100 if nonzero.any() else float("nan")
+    
+    denominator = np.abs(actual) + np.abs(predicted)
+    smape = np.where(denominator > 0, 2 * error / np.where(denominator > 0, denominator, 1.0), 0.0).mean() * 100
+    
+    below = actual < lower
+    above = actual > upper
+    return {
+        "points": points,
+        "mae": float(error.mean()),
+        "mape": float(mape),
+        "smape": float(smape),
+        "coverage": float(1 - (below | above).mean()),
+        "below_lower": float(below.mean()),
+        "above_upper": float(above.mean())
+    }
+
+
+def run_backtest_task(task: Dict) -> Dict:
+    """
+    Fit one block of series on one training window inside a worker process.
+    
+    The statistical backend fits the whole block at once; other backends
+    go through ForecastService one series at a time, exactly as the daily
+    job fits them. A series that fails or is too short gets NaN forecasts.
+    
+    Args:
+        task: Dictionary with backend, fold, first_row, units (training
+            window, [series x cutoff]), start_date and horizon
+    
+    Returns:
+        Dictionary with fold, first_row, predicted/lower/upper arrays
+        ([series x horizon]), failed series count and fit seconds
+    """
+    start = time.perf_counter()
+    units, horizon = task["units"], task["horizon"]
+    outcome = {"fold": task["fold"], "first_row": task["first_row"], "failed": 0}
+    
+    if task["backend"] == "statistical":
+        from app.services.forecast_statistical import StatisticalForecaster
+        
+        fitted = StatisticalForecaster(settings.forecast_confidence_interval).fit_predict(units, horizon, test_days=0)
+        for name in ("predicted", "lower", "upper"):
+            outcome[name] = np.maximum(0, fitted[name])
+    else:
+        from app.services.forecast import ForecastService
+        
+        service = ForecastService(None, backend=task["backend"])
+        # Every fold has a new history, so cached models would never be hit
+        service.model_cache = None
+        
+        forecasts = {name: np.full((len(units), horizon), np.nan) for name in ("predicted", "lower", "upper")}
+        for i, row in enumerate(units):
+            try:
+                result = service.forecast_series("", "", "", service.frame_from_units(row, task["start_date"]), horizon)
+            except Exception:
+                outcome["failed"] += 1
+                continue
+            for day, point in enumerate(result.get("forecast", [])):
+                for name in forecasts:
+                    forecasts[name][i, day] = point[name]
+        outcome.update(forecasts)
+    
+    outcome["seconds"] = time.perf_counter() - start
+    return outcome
+
+
+class Backtest:
+    """
+    Rolling-origin cross-validation of forecast backends on a usage matrix.
+    
+    Every (fold, block of series) pair is an independent task, fanned out
+    across a process pool for backends that fit one series at a time;
+    forecasts are collected into [series x folds x horizon] arrays and
+    scored with array operations.
+    """
+    
+    def __init__(
+        self,
+        units: np.ndarray,
+        start_date: date,
+        horizon: int = 7,
+        folds: int = 8,
+        step: int = 7,
+        max_workers: Optional[int] = None,
+        series_per_task: Optional[int] = None
+    ):
+        """
+        Initialize a backtest.
+        
+        Args:
+            units: Daily usage, one row per series starting at start_date
+            start_date: Date of the first column
+            horizon: Days forecast from each origin
+            folds: Maximum number of origins
+            step: Days between origins
+            max_workers: Worker processes (uses config default if not provided);
+                1 runs every task in the calling process
+            series_per_task: Series per task; defaults to every series for
+                the statistical backend and SERIES_PER_TASK otherwise
+        """
+        self.units = np.asarray(units, dtype=np.float64)
+        self.start_date = start_date
+        self.horizon = horizon
+        self.cutoffs = rolling_cutoffs(self.units.shape[1], horizon, folds, step)
+        self.max_workers = max_workers or settings.max_workers
+        self.series_per_task = series_per_task
+        
+        # [series x folds x horizon] actuals of every fold
+        windows = self.cutoffs[:, None] + np.arange(horizon)
+        self.actual = self.units[:, windows]
+    
+    def tasks(self, backend: str) -> Iterator[Dict]:
+        """
+        Split the backtest of one backend into pool tasks.
+        
+        Args:
+            backend: Forecasting backend
+        
+        Yields:
+            Task dictionaries for ``run_backtest_task``
+        """
+        n_series = len(self.units)
+        block = self.series_per_task or (n_series if backend == "statistical" else SERIES_PER_TASK)
+        
+        for fold, cutoff in enumerate(self.cutoffs):
+            for first_row in range(0, n_series, block):
+                yield {
+                    "backend": backend,
+                    "fold": fold,
+                    "first_row": first_row,
+                    "units": self.units[first_row:first_row + block, :cutoff],
+                    "start_date": self.start_date,
+                    "horizon": self.horizon
+                }
+    
+    def forecast(self, backend: str) -> Dict:
+        """
+        Fit every fold of one backend.
+        
+        Args:
+            backend: Forecasting backend
+        
+        Returns:
+            Dictionary with predicted/lower/upper arrays ([series x folds x
+            horizon], NaN where no forecast was made), failed series-fold
+            count, summed fit seconds and wall-clock seconds
+        """
+        shape = self.actual.shape
+        forecasts = {name: np.full(shape, np.nan) for name in ("predicted", "lower", "upper")}
+        totals = {"failed": 0, "fit_seconds": 0.0}
+        start = time.perf_counter()
+        
+        def collect(outcome: Dict):
+            rows = slice(outcome["first_row"], outcome["first_row"] + len(outcome["predicted"]))
+            for name, values in forecasts.items():
+                values[rows, outcome["fold"]] = outcome[name]
+            totals["failed"] += outcome["failed"]
+            totals["fit_seconds"] += outcome["seconds"]
+        
+        # The statistical backend fits a whole fold in milliseconds, so
+        # starting worker processes would cost more than it saves
+        if self.max_workers <= 1 or backend == "statistical":
+            for task in self.tasks(backend):
+                collect(run_backtest_task(task))
+        else:
+            # Spawn rather than fork, like ForecastPool
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context) as executor:
+                futures = [executor.submit(run_backtest_task, task) for task in self.tasks(backend)]
+                for future in as_completed(futures):
+                    collect(future.result())
+        
+        return {**forecasts, **totals, "wall_seconds": time.perf_counter() - start}
+    
+    def run(self, backend: str) -> Dict:
+        """
+        Backtest one backend and summarize it as a results table row.
+        
+        Args:
+            backend: Forecasting backend
+        
+        Returns:
+            Dictionary with backend, series, folds, horizon, scored points,
+            BACKTEST_METRICS, failed series-fold count and timing
+        """
+        forecasts = self.forecast(backend)
+        metrics = score(self.actual, forecasts["predicted"], forecasts["lower"], forecasts["upper"])
+        
+        return {
+            "backend": backend,
+            "series": len(self.units),
+            "folds": len(self.cutoffs),
+            "horizon": self.horizon,
+            **metrics,
+            "failed": forecasts["failed"],
+            "fit_seconds": round(forecasts["fit_seconds"], 3),
+            "wall_seconds": round(forecasts["wall_seconds"], 3)
+        }
@@ -0,0 +1,181 @@
+"""Hospital / component / blood group forecast hierarchy and reconciliation."""
+from __future__ import annotations
+from typing import Dict, List, Tuple
+from app.services.forecast_history import SeriesKey
+from app.utils.lazy_import import lazy_module
+
+np = lazy_module("numpy")
+
+# How aggregated forecasts are turned into coherent component forecasts:
+# bottom_up fits component totals and sums them to the hospital total,
+# top_down fits the hospital total and splits it by historical component
+# shares, mint fits both levels and reconciles them by weighted least
+# squares (MinT with a diagonal error covariance)
+RECONCILIATION_METHODS = ("bottom_up", "top_down", "mint")
+
+# Blood group / component of aggregated series keys
+TOTAL = "*"
+
+# Error variance floor, so a series with a perfect holdout does not get
+# an infinite weight
+MIN_VARIANCE = 1e-6
+
+
+class Hierarchy:
+    """
+    Two-level hierarchy over a [series x days] usage matrix.
+    
+    Each hospital's total splits into component totals, and each component
+    total into blood group series. Only hospital and component totals are
+    fitted; blood group forecasts are their component's forecast times the
+    blood group's historical share of that component's usage.
+    """
+    
+    def __init__(self, series: List[SeriesKey], units: np.ndarray):
+        """
+        Aggregate the bottom-level series.
+        
+        Args:
+            series: (hospital_id, blood_group, component) key of each row
+            units: Daily usage, one row per series
+        """
+        self.series = list(series)
+        self.hospitals = sorted({hospital_id for hospital_id, _, _ in self.series})
+        self.components = sorted({component for _, _, component in self.series})
+        
+        hospital_index = {hospital_id: i for i, hospital_id in enumerate(self.hospitals)}
+        component_index = {component: i for i, component in enumerate(self.components)}
+        self._hospital = np.array([hospital_index[key[0]] for key in self.series], dtype=np.int64)
+        self._component = np.array([component_index[key[2]] for key in self.series], dtype=np.int64)
+        
+        units = np.asarray(units, dtype=np.float64)
+        self.component_units = np.zeros((len(self.hospitals), len(self.components), units.shape[1]))
+        np.add.at(self.component_units, (self._hospital, self._component), units)
+        self.hospital_units = self.component_units.sum(axis=1)
+        
+        # Blood group share of its component; even split if the component
+        # has no usage yet
+        component_totals = self.component_units.sum(axis=2)
+        siblings = np.zeros_like(component_totals)
+        np.add.at(siblings, (self._hospital, self._component), 1)
+        parent_totals = component_totals[self._hospital, self._component]
+        self.blood_group_share = np.where(
+            parent_totals > 0,
+            units.sum(axis=1) / np.where(parent_totals > 0, parent_totals, 1.0),
+            1.0 / siblings[self._hospital, self._component]
+        )
+        
+        # Component share of its hospital, over the components it uses
+        present = siblings > 0
+        hospital_totals = component_totals.sum(axis=1, keepdims=True)
+        self.component_share = np.where(
+            hospital_totals > 0,
+            component_totals / np.where(hospital_totals > 0, hospital_totals, 1.0),
+            present / np.maximum(present.sum(axis=1, keepdims=True), 1)
+        )
+    
+    def aggregates(self, method: str) -> Tuple[List[SeriesKey], np.ndarray]:
+        """
+        Get the aggregated series a reconciliation method fits.
+        
+        Args:
+            method: One of RECONCILIATION_METHODS
+        
+        Returns:
+            Tuple of (keys, units): hospital totals first (top_down, mint),
+            then component totals (bottom_up, mint), hospital by hospital
+        
+        Raises:
+            ValueError: If the method is not recognized
+        """
+        if method not in RECONCILIATION_METHODS:
+            raise ValueError(
+                f"Unknown reconciliation method: {method}. Must be one of: {', '.join(RECONCILIATION_METHODS)}"
+            )
+        
+        keys: List[SeriesKey] = []
+        rows = []
+        if method in ("top_down", "mint"):
+            keys += [(hospital_id, TOTAL, TOTAL) for hospital_id in self.hospitals]
+            rows.append(self.hospital_units)
+        if method in ("bottom_up", "mint"):
+            keys += [
+                (hospital_id, TOTAL, component)
+                for hospital_id in self.hospitals
+                for component in self.components
+            ]
+            rows.append(self.component_units.reshape(-1, self.component_units.shape[2]))
+        return keys, np.vstack(rows)
+    
+    def reconcile(
+        self,
+        method: str,
+        predicted: np.ndarray,
+        lower: np.ndarray,
+        upper: np.ndarray,
+        mae: np.ndarray
+    ) -> Dict[str, np.ndarray]:
+        """
+        Turn forecasts of the aggregated series into blood group forecasts.
+        
+        Interval bounds move with their point forecast: shifted by the
+        reconciliation adjustment, then scaled by the blood group share.
+        
+        Args:
+            method: Reconciliation method the aggregates were built for
+            predicted: Forecasts of the ``aggregates(method)`` rows, [rows x days]
+            lower: Lower bounds, [rows x days]
+            upper: Upper bounds, [rows x days]
+            mae: Holdout MAE of each row, used as error scale by mint
+        
+        Returns:
+            Dictionary of predicted, lower and upper arrays, one row per
+            bottom-level series in input order
+        """
+        n_hospitals, n_components = len(self.hospitals), len(self.components)
+        days = predicted.shape[1]
+        
+        def components(values: np.ndarray) -> np.ndarray:
+            return values[-n_hospitals * n_components:].reshape(n_hospitals, n_components, days)
+        
+        if method == "bottom_up":
+            component_forecasts = [components(values) for values in (predicted, lower, upper)]
+        elif method == "top_down":
+            share = self.component_share[:, :, None]
+            component_forecasts = [values[:n_hospitals, None, :] * share for values in (predicted, lower, upper)]
+        else:
+            reconciled = self._mint(predicted, mae)
+            adjustment = reconciled - components(predicted)
+            component_forecasts = [reconciled, components(lower) + adjustment, components(upper) + adjustment]
+        
+        share = self.blood_group_share[:, None]
+        bottom = [values[self._hospital, self._component] * share for values in component_forecasts]
+        return dict(zip(("predicted", "lower", "upper"), bottom))
+    
+    def _mint(self, predicted: np.ndarray, mae: np.ndarray) -> np.ndarray:
+        """
+        Reconcile hospital and component forecasts, all hospitals at once.
+        
+        Solves ``(S' W^-1 S)^-1 S' W^-1 y`` per hospital, where S sums the
+        components into [total, components] and W holds squared holdout MAEs.
+        
+        Returns:
+            Coherent component forecasts, [hospitals x components x days]
+        """
+        n_hospitals, n_components = len(self.hospitals), len(self.components)
+        days = predicted.shape[1]
+        
+        base = np.concatenate([
+            predicted[:n_hospitals, None, :],
+            predicted[n_hospitals:].reshape(n_hospitals, n_components, days)
+        ], axis=1)
+        variance = np.concatenate([
+            mae[:n_hospitals, None],
+            mae[n_hospitals:].reshape(n_hospitals, n_components)
+        ], axis=1) ** 2
+        weights = 1.0 / np.maximum(variance, MIN_VARIANCE)
+        
+        summing = np.vstack([np.ones((1, n_components)), np.eye(n_components)])
+        weighted = summing.T[None, :, :] * weights[:, None, :]
+        gain = np.linalg.solve(weighted @ summing, weighted)
+        return gain @ base
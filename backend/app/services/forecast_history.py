@@ -0,0 +1,95 @@
+"""Dense daily usage history for many forecast series."""
+from __future__ import annotations
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+from app.utils.lazy_import import lazy_module
+
+np = lazy_module("numpy")
+
+# (hospital_id, blood_group, component)
+SeriesKey = Tuple[str, str, str]
+
+
+class HistoryMatrix:
+    """
+    Daily usage for many series as one dense [series x days] array.
+    
+    Days without usage are zero. Rows are C-contiguous, so ``row`` returns
+    a view and handing a series to a forecaster copies nothing.
+    """
+    
+    def __init__(self, series: List[SeriesKey], start_date: date, n_days: int):
+        """
+        Initialize a zero-filled matrix.
+        
+        Args:
+            series: Series keys, one per row
+            start_date: Date of the first column
+            n_days: Number of days (columns)
+        """
+        self.series = list(series)
+        self.start_date = start_date
+        self.n_days = n_days
+        self.units = np.zeros((len(self.series), n_days), dtype=np.float64)
+        self._positions: Dict[SeriesKey, int] = {key: i for i, key in enumerate(self.series)}
+    
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Iterable,
+        series: List[SeriesKey],
+        start_date: date,
+        end_date: date
+    ) -> "HistoryMatrix":
+        """
+        Pivot aggregated usage rows into a matrix.
+        
+        Rows for series not listed, or dates outside the window, are ignored.
+        
+        Args:
+            rows: Rows of (hospital_id, blood_group, component, usage_date, units)
+            series: Series keys, one per row of the matrix
+            start_date: First day of the window (inclusive)
+            end_date: Last day of the window (inclusive)
+        
+        Returns:
+            History matrix
+        """
+        matrix = cls(series, start_date, (end_date - start_date).days + 1)
+        
+        positions, offsets, units = [], [], []
+        for hospital_id, blood_group, component, usage_date, total_units in rows:
+            positions.append(matrix._positions.get((hospital_id, blood_group, component), -1))
+            offsets.append((usage_date - start_date).days)
+            units.append(total_units)
+        
+        if not positions:
+            return matrix
+        
+        positions = np.asarray(positions, dtype=np.int64)
+        offsets = np.asarray(offsets, dtype=np.int64)
+        units = np.asarray(units, dtype=np.float64)
+        
+        valid = (positions >= 0) & (offsets >= 0) & (offsets < matrix.n_days)
+        np.add.at(matrix.units, (positions[valid], offsets[valid]), units[valid])
+        
+        return matrix
+    
+    def __len__(self) -> int:
+        return len(self.series)
+    
+    def __contains__(self, key: SeriesKey) -> bool:
+        return key in self._positions
+    
+    def row(self, key: SeriesKey) -> Optional[np.ndarray]:
+        """
+        Get the daily units of one series.
+        
+        Args:
+            key: Series key
+        
+        Returns:
+            View of the series' row, or None if the series is not in the matrix
+        """
+        position = self._positions.get(key)
+        return None if position is None else self.units[position]
@@ -0,0 +1,416 @@
+"""Process pool for fitting many forecast series in parallel."""
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Successful series buffered before the parent writes them in one batch
+WRITE_BATCH_SERIES = 50
+
+
+def series_label(task: Dict) -> str:
+    """Human-readable series identifier used in summaries and logs."""
+    return f"{task['hospital_id']}/{task['blood_group']}/{task['component']}"
+
+
+def run_forecast_task(task: Dict) -> Dict:
+    """
+    Fit and forecast one series inside a worker process.
+    
+    The task carries the series' daily usage array, so no database session
+    is needed in the worker. Errors are returned rather than raised, so one
+    bad series cannot break the rest of the job.
+    
+    Args:
+        task: Dictionary with hospital_id, blood_group, component, units
+            (daily usage array), start_date (date of units[0]), days and
+            optionally backend
+            
+    Returns:
+        Outcome dictionary with status ("ok", "skipped" or "failed"),
+        the forecast result, error message and fit seconds
+    """
+    from app.services.forecast import ForecastService
+    
+    start = time.perf_counter()
+    outcome = {
+        "hospital_id": task["hospital_id"],
+        "blood_group": task["blood_group"],
+        "component": task["component"],
+        "status": "ok",
+        "result": None,
+        "error": None
+    }
+    
+    try:
+        df = ForecastService.frame_from_units(task["units"], task["start_date"])
+        result = ForecastService(None, backend=task.get("backend")).forecast_series(
+            hospital_id=task["hospital_id"],
+            blood_group=task["blood_group"],
+            component=task["component"],
+            df=df,
+            days=task["days"]
+        )
+        
+        if "error" in result:
+            outcome["status"] = "skipped"
+            outcome["error"] = result["error"]
+        else:
+            outcome["result"] = result
+    except Exception as e:
+        outcome["status"] = "failed"
+        outcome["error"] = str(e)
+    
+    outcome["seconds"] = time.perf_counter() - start
+    return outcome
+
+
+class ForecastJobSummary:
+    """Progress, per-series timing and failures of a forecast job."""
+    
+    def __init__(self, total: Optional[int] = None):
+        """
+        Initialize an empty summary.
+        
+        Args:
+            total: Expected number of series, if known
+        """
+        self.total = total
+        self.completed = 0
+        self.skipped = 0
+        self.failed = 0
+        self.forecasts_written = 0
+        self.reused = 0
+        self.fit_seconds_saved = 0.0
+        self.model_fits: Optional[int] = None
+        self.series_seconds: Dict[str, float] = {}
+        self.fitted_seconds: Dict[Tuple[str, str, str], float] = {}
+        self.failures: List[Dict] = []
+        self.started_at = time.perf_counter()
+        self.elapsed_seconds = 0.0
+    
+    @property
+    def processed(self) -> int:
+        """Number of series that have finished, whatever the outcome."""
+        return self.completed + self.skipped + self.failed
+    
+    def record(self, outcome: Dict):
+        """
+        Record the outcome of one series.
+        
+        Args:
+            outcome: Outcome dictionary from run_forecast_task
+        """
+        label = series_label(outcome)
+        self.series_seconds[label] = outcome.get("seconds", 0.0)
+        
+        if outcome["status"] == "ok":
+            self.completed += 1
+            key = (outcome["hospital_id"], outcome["blood_group"], outcome["component"])
+            self.fitted_seconds[key] = outcome.get("seconds", 0.0)
+        elif outcome["status"] == "skipped":
+            self.skipped += 1
+        else:
+            self.failed += 1
+            self.failures.append({"series": label, "error": outcome["error"]})
+        
+        self.elapsed_seconds = time.perf_counter() - self.started_at
+    
+    def record_reused(self, count: int, fit_seconds_saved: float):
+        """
+        Record series whose previous forecast was reused instead of refitted.
+        
+        Args:
+            count: Number of reused series
+            fit_seconds_saved: Fit seconds those series took when last fitted
+        """
+        self.reused += count
+        self.fit_seconds_saved += fit_seconds_saved
+        if self.total is not None:
+            self.total += count
+    
+    def progress(self) -> str:
+        """Short progress line for logging."""
+        total = self.total if self.total is not None else "?"
+        return (
+            f"{self.processed}/{total} series processed "
+            f"({self.failed} failed) in {self.elapsed_seconds:.1f}s"
+        )
+    
+    def to_dict(self) -> Dict:
+        """
+        Convert summary to a dictionary.
+        
+        Returns:
+            Dictionary with counts, timing statistics, per-series timings
+            and failures
+        """
+        seconds = sorted(self.series_seconds.values())
+        fit_seconds = sum(seconds)
+        
+        return {
+            "total_series": self.total if self.total is not None else self.processed + self.reused,
+            "completed": self.completed,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "forecasts_written": self.forecasts_written,
+            "model_fits": self.model_fits if self.model_fits is not None else self.completed + self.failed,
+            "reused": self.reused,
+            "fit_seconds_saved": round(self.fit_seconds_saved, 3),
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "fit_seconds_total": round(fit_seconds, 3),
+            "fit_seconds_mean": round(fit_seconds / len(seconds), 3) if seconds else 0.0,
+            "fit_seconds_max": round(seconds[-1], 3) if seconds else 0.0,
+            "series_seconds": {label: round(s, 3) for label, s in self.series_seconds.items()},
+            "failures": self.failures
+        }
+
+
+def run_vectorized(
+    service,
+    series: List[Tuple[str, str, str]],
+    write: Callable[[List[Dict]], int],
+    days: int = 7,
+    write_batch_series: int = WRITE_BATCH_SERIES
+) -> ForecastJobSummary:
+    """
+    Fit all series in the calling process with one array-based fit.
+    
+    Used for backends that forecast a whole history matrix at once, where
+    a process pool would only add pickling overhead.
+    
+    Args:
+        service: ForecastService with a vectorized backend
+        series: (hospital_id, blood_group, component) keys to forecast
+        write: Callback storing a batch of forecast results and returning
+            the number of rows written
+        days: Number of days to forecast
+        write_batch_series: Successful series per write
+        
+    Returns:
+        Job summary; per-series seconds are the fit time split evenly
+    """
+    summary = ForecastJobSummary(len(series))
+    history = service.load_history(series)
+    
+    start = time.perf_counter()
+    results = service.forecast_many(history.series, history.units, history.start_date, days)
+    seconds = (time.perf_counter() - start) / max(len(results), 1)
+    
+    _record_results(summary, history.series, results, seconds, write, write_batch_series)
+    return summary
+
+
+def run_hierarchical(
+    service,
+    series: List[Tuple[str, str, str]],
+    write: Callable[[List[Dict]], int],
+    method: str,
+    days: int = 7,
+    write_batch_series: int = WRITE_BATCH_SERIES
+) -> ForecastJobSummary:
+    """
+    Forecast series from reconciled per-hospital aggregates.
+    
+    The aggregated series are fitted at once by the statistical backend,
+    or across a ForecastPool by other backends; reconciliation and the
+    split to blood groups run in the calling process.
+    
+    Args:
+        service: ForecastService
+        series: (hospital_id, blood_group, component) keys to forecast
+        write: Callback storing a batch of forecast results and returning
+            the number of rows written
+        method: Reconciliation method (see RECONCILIATION_METHODS)
+        days: Number of days to forecast
+        write_batch_series: Successful series per write
+        
+    Returns:
+        Job summary; per-series seconds are the fit time split evenly and
+        model_fits counts the aggregated series fitted
+    """
+    summary = ForecastJobSummary(len(series))
+    history = service.load_history(series)
+    
+    def fit_in_pool(keys: List[Tuple[str, str, str]], units) -> List[Dict]:
+        tasks = (
+            {
+                "hospital_id": hospital_id,
+                "blood_group": blood_group,
+                "component": component,
+                "units": row,
+                "start_date": history.start_date,
+                "days": days,
+                "backend": service.backend
+            }
+            for (hospital_id, blood_group, component), row in zip(keys, units)
+        )
+        fitted = {}
+        
+        def collect(results: List[Dict]) -> int:
+            for result in results:
+                fitted[(result["hospital_id"], result["blood_group"], result["component"])] = result
+            return 0
+        
+        failures = {
+            failure["series"]: failure["error"]
+            for failure in ForecastPool().run(tasks, write=collect, total=len(keys)).failures
+        }
+        
+        results = []
+        for key in keys:
+            label = "/".join(key)
+            if key in fitted:
+                results.append(fitted[key])
+            elif label in failures:
+                results.append({"error": failures[label], "failed": True})
+            else:
+                results.append(service.insufficient_history(history.n_days))
+        return results
+    
+    start = time.perf_counter()
+    results, summary.model_fits = service.forecast_hierarchy(
+        history.series,
+        history.units,
+        history.start_date,
+        days,
+        method=method,
+        fit=None if service.backend == "statistical" else fit_in_pool
+    )
+    seconds = (time.perf_counter() - start) / max(len(results), 1)
+    
+    _record_results(summary, history.series, results, seconds, write, write_batch_series)
+    return summary
+
+
+def _record_results(
+    summary: ForecastJobSummary,
+    series: List[Tuple[str, str, str]],
+    results: List[Dict],
+    seconds: float,
+    write: Callable[[List[Dict]], int],
+    write_batch_series: int
+):
+    """Record results fitted in one pass and write the successful ones."""
+    successful = []
+    for (hospital_id, blood_group, component), result in zip(series, results):
+        if "error" not in result:
+            status = "ok"
+            successful.append(result)
+        else:
+            status = "failed" if result.get("failed") else "skipped"
+        summary.record({
+            "hospital_id": hospital_id,
+            "blood_group": blood_group,
+            "component": component,
+            "status": status,
+            "result": result if status == "ok" else None,
+            "error": result.get("error"),
+            "seconds": seconds
+        })
+    
+    for i in range(0, len(successful), write_batch_series):
+        summary.forecasts_written += write(successful[i:i + write_batch_series])
+    
+    summary.elapsed_seconds = time.perf_counter() - summary.started_at
+
+
+class ForecastPool:
+    """
+    Fan forecast series out across a process pool.
+    
+    Workers receive pre-fetched usage arrays and return forecast results;
+    only the parent process touches the database, writing successful
+    results in batches through the ``write`` callback.
+    """
+    
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        fit: Callable[[Dict], Dict] = run_forecast_task,
+        write_batch_series: int = WRITE_BATCH_SERIES
+    ):
+        """
+        Initialize the pool.
+        
+        Args:
+            max_workers: Worker processes (uses config default if not provided);
+                1 runs every series in the calling process
+            fit: Picklable function fitting one task
+            write_batch_series: Successful series buffered per write
+        """
+        self.max_workers = max_workers or settings.max_workers
+        self.fit = fit
+        self.write_batch_series = write_batch_series
+    
+    def run(
+        self,
+        tasks: Iterable[Dict],
+        write: Callable[[List[Dict]], int],
+        total: Optional[int] = None
+    ) -> ForecastJobSummary:
+        """
+        Fit all tasks and write their results.
+        
+        Args:
+            tasks: Forecast tasks (see run_forecast_task)
+            write: Callback storing a batch of forecast results and
+                returning the number of rows written
+            total: Expected number of tasks, for progress reporting
+            
+        Returns:
+            Job summary
+        """
+        summary = ForecastJobSummary(total)
+        pending: List[Dict] = []
+        log_every = max(1, (total or 0) // 10) if total else 100
+        
+        def handle(outcome: Dict):
+            summary.record(outcome)
+            
+            if outcome["status"] == "ok":
+                pending.append(outcome["result"])
+                if len(pending) >= self.write_batch_series:
+                    summary.forecasts_written += write(pending)
+                    pending.clear()
+            elif outcome["status"] == "failed":
+                logger.error(f"Failed to generate forecast for {series_label(outcome)}: {outcome['error']}")
+            
+            if summary.processed % log_every == 0:
+                logger.info(f"Forecast job progress: {summary.progress()}")
+        
+        if self.max_workers <= 1:
+            for task in tasks:
+                handle(self.fit(task))
+        else:
+            # Spawn rather than fork: the job runs from the scheduler thread
+            # of a multi-threaded server process
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context) as executor:
+                futures = {executor.submit(self.fit, task): task for task in tasks}
+                
+                for future in as_completed(futures):
+                    try:
+                        outcome = future.result()
+                    except Exception as e:
+                        task = futures[future]
+                        outcome = {
+                            "hospital_id": task["hospital_id"],
+                            "blood_group": task["blood_group"],
+                            "component": task["component"],
+                            "status": "failed",
+                            "result": None,
+                            "error": str(e),
+                            "seconds": 0.0
+                        }
+                    handle(outcome)
+        
+        if pending:
+            summary.forecasts_written += write(pending)
+        
+        summary.elapsed_seconds = time.perf_counter() - summary.started_at
+        return summary
@@ -0,0 +1,226 @@
+"""Change tracking for incremental daily forecast refreshes."""
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+from app.services.forecast_history import SeriesKey
+
+# Days between forecast points of the same weekday
+WEEK_DAYS = 7
+
+# (usage.created_at high-water mark, usage_date high-water mark)
+UsageMarks = Tuple[Optional[datetime], Optional[date]]
+
+
+def changes_since(states: Mapping[SeriesKey, Mapping], series: Iterable[SeriesKey]) -> Optional[datetime]:
+    """
+    Get the creation time after which usage rows can make a series dirty.
+    
+    Args:
+        states: Stored state per series (see ``RefreshPlan.state_rows``)
+        series: Series to refresh
+    
+    Returns:
+        Oldest stored usage.created_at mark, or None if some series has no
+        state yet and every usage row in the history window must be read
+    """
+    marks = []
+    for key in series:
+        state = states.get(key)
+        if state is None:
+            return None
+        if state["usage_created_at"] is not None:
+            marks.append(state["usage_created_at"])
+    return min(marks) if marks else None
+
+
+def _later(stored, seen):
+    """Later of two possibly missing high-water marks."""
+    if stored is None or (seen is not None and seen > stored):
+        return seen
+    return stored
+
+
+def roll_forward(
+    points: Mapping[date, Tuple[float, float, float]],
+    first_day: date,
+    days: int
+) -> Optional[List[Dict]]:
+    """
+    Carry a stored forecast over to a later window.
+    
+    Each new date takes the stored point of the latest date on the same
+    weekday, which keeps the weekly pattern both backends forecast.
+    
+    Args:
+        points: Stored (predicted, lower, upper) per forecast date
+        first_day: First date of the new window
+        days: Number of days in the new window
+    
+    Returns:
+        Forecast points for the new window, or None if some weekday has no
+        stored point on or before its date
+    """
+    if not points:
+        return None
+    
+    earliest = min(points)
+    rolled = []
+    for offset in range(days):
+        day = first_day + timedelta(days=offset)
+        source = day
+        while source not in points and source >= earliest:
+            source -= timedelta(days=WEEK_DAYS)
+        if source not in points:
+            return None
+        
+        predicted, lower, upper = points[source]
+        rolled.append({
+            "date": day.isoformat(),
+            "predicted": float(predicted),
+            "lower": None if lower is None else float(lower),
+            "upper": None if upper is None else float(upper)
+        })
+    return rolled
+
+
+class RefreshPlan:
+    """
+    Split of a daily forecast job into series to refit and series to reuse.
+    
+    A series is reused, with its stored forecast rolled forward, when it
+    was last fitted by the same backend within ``max_age_days`` and no
+    usage row in the history window was created after its high-water mark.
+    Every other series is dirty and refitted.
+    """
+    
+    def __init__(
+        self,
+        series: List[SeriesKey],
+        states: Mapping[SeriesKey, Mapping],
+        changes: Iterable,
+        latest_points: Iterable,
+        backend: str,
+        history_end: date,
+        days: int,
+        max_age_days: int,
+        reuse: bool = True
+    ):
+        """
+        Plan a refresh.
+        
+        Args:
+            series: Series to forecast
+            states: Stored state per series
+            changes: Rows of (hospital_id, blood_group, component,
+                max_created_at, max_usage_date) for usage created since
+                ``changes_since``
+            latest_points: Rows of (hospital_id, blood_group, component,
+                forecast_date, predicted_units, lower_bound, upper_bound)
+                of the current latest forecasts
+            backend: Backend of this job
+            history_end: Last day of this job's history window
+            days: Number of days to forecast
+            max_age_days: Refit series whose last fit is older than this
+            reuse: False to refit every series while still tracking marks
+        """
+        self.series = list(series)
+        self.backend = backend
+        self.history_end = history_end
+        self.dirty: List[SeriesKey] = []
+        self.reused: List[Dict] = []
+        self.fit_seconds_saved = 0.0
+        self.marks: Dict[SeriesKey, UsageMarks] = {}
+        self._saved_seconds: Dict[SeriesKey, float] = {}
+        
+        changed = {}
+        for hospital_id, blood_group, component, created_at, usage_date in changes:
+            changed[(hospital_id, blood_group, component)] = (created_at, usage_date)
+        
+        points: Dict[SeriesKey, Dict[date, Tuple[float, float, float]]] = {}
+        for hospital_id, blood_group, component, forecast_date, predicted, lower, upper in latest_points:
+            points.setdefault((hospital_id, blood_group, component), {})[forecast_date] = (predicted, lower, upper)
+        
+        first_day = history_end + timedelta(days=1)
+        oldest_fit = history_end - timedelta(days=max_age_days)
+        
+        for key in series:
+            state = states.get(key)
+            stored_created_at = None if state is None else state["usage_created_at"]
+            stored_usage_date = None if state is None else state["usage_date"]
+            created_at, usage_date = changed.get(key, (None, None))
+            self.marks[key] = (_later(stored_created_at, created_at), _later(stored_usage_date, usage_date))
+            
+            rolled = None
+            if (
+                reuse
+                and state is not None
+                and state["backend"] == backend
+                and state["history_end"] >= oldest_fit
+                and self.marks[key][0] == stored_created_at
+            ):
+                rolled = roll_forward(points.get(key, {}), first_day, days)
+            
+            if rolled is None:
+                self.dirty.append(key)
+                continue
+            
+            hospital_id, blood_group, component = key
+            self.reused.append({
+                "hospital_id": hospital_id,
+                "blood_group": blood_group,
+                "component": component,
+                "forecast": rolled,
+                "backend": backend,
+                "fitted_history_end": state["history_end"].isoformat(),
+                "forecast_days": days
+            })
+            self.fit_seconds_saved += state["fit_seconds"]
+            self._saved_seconds[key] = state["fit_seconds"]
+    
+    def expand_to_hospitals(self):
+        """
+        Refit every series of a hospital that has any dirty series.
+        
+        Hierarchical forecasts fit whole hospitals, so a hospital's series
+        cannot be reused one by one.
+        """
+        dirty_hospitals = {hospital_id for hospital_id, _, _ in self.dirty}
+        reused = []
+        for result in self.reused:
+            key = (result["hospital_id"], result["blood_group"], result["component"])
+            if key[0] in dirty_hospitals:
+                self.fit_seconds_saved -= self._saved_seconds.pop(key)
+            else:
+                reused.append(result)
+        
+        self.reused = reused
+        self.dirty = [key for key in self.series if key[0] in dirty_hospitals]
+    
+    def state_rows(self, fitted_seconds: Mapping[SeriesKey, float], run_id: Optional[int] = None) -> List[Dict]:
+        """
+        Build state rows for the series refitted by the job.
+        
+        Reused series keep their state, so they age towards a forced refit.
+        
+        Args:
+            fitted_seconds: Fit seconds of every successfully refitted series
+            run_id: Forecast run that wrote the fits
+        
+        Returns:
+            Rows for ``ForecastRepository.upsert_series_state``
+        """
+        rows = []
+        for key, seconds in fitted_seconds.items():
+            hospital_id, blood_group, component = key
+            created_at, usage_date = self.marks.get(key, (None, None))
+            rows.append({
+                "hospital_id": hospital_id,
+                "blood_group": blood_group,
+                "component": component,
+                "backend": self.backend,
+                "usage_created_at": created_at,
+                "usage_date": usage_date,
+                "history_end": self.history_end,
+                "fit_seconds": seconds,
+                "run_id": run_id
+            })
+        return rows
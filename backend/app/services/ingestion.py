@@ -1,10 +1,23 @@
 """Data ingestion service for CSV validation and parsing."""
-import pandas as pd
+from __future__ import annotations
+import codecs
+import heapq
+import re
 from typing import List, Dict, Tuple, Optional
 from datetime import datetime
 from io import StringIO
+from app.config import settings
 from app.schemas.inventory import InventoryCreate
 from app.schemas.enums import BloodGroup, Component
+from app.utils.lazy_import import lazy_module
+
+np = lazy_module("numpy")
+pd = lazy_module("pandas")
+
+# Upload chunks a stream may buffer while waiting for the end of a row
+MAX_BUFFERED_CHUNKS = 4
+
+_QUOTE_OR_NEWLINE = re.compile(r'["\n]')
 
 
 class ValidationError(Exception):
@@ -42,6 +55,21 @@ class IngestionResult:
         """Add a duplicate record ID."""
         self.duplicates.append(record_id)
         self.error_count += 1
+        
+    def merge(self, other: "IngestionResult", keep_records: bool = True):
+        """
+        Merge another result into this one.
+        
+        Args:
+            other: Result to merge
+            keep_records: Whether to keep the other result's valid records
+        """
+        if keep_records:
+            self.valid_records.extend(other.valid_records)
+        self.errors.extend(other.errors)
+        self.duplicates.extend(other.duplicates)
+        self.success_count += other.success_count
+        self.error_count += other.error_count
 
 
 class IngestionService:
@@ -81,6 +109,8 @@ class IngestionService:
         "o positive": "O+", "o negative": "O-",
     }
     
+    _COMPONENT_VALUES = [c.value for c in Component]
+    
     REQUIRED_COLUMNS = [
         'record_id',
         'hospital_id',
@@ -91,6 +121,10 @@ class IngestionService:
         'collection_date'
     ]
     
+    # Read verbatim: numeric inference would drop leading zeros and depend on
+    # the other values of the batch, and "NA" is a valid identifier
+    ID_COLUMNS = ['record_id', 'hospital_id']
+    
     def normalize_blood_group(self, blood_group: str) -> str:
         """
         Normalize blood group value to standard format.
@@ -120,29 +154,63 @@ class IngestionService:
         
         raise ValueError(f"Unrecognized blood group: {blood_group}")
     
-    def validate_csv_format(self, file_content: str) -> Tuple[bool, Optional[str]]:
+    def _read_csv(self, file_content: str) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
         """
-        Validate CSV file format.
+        Read CSV content into a DataFrame and check its overall shape.
         
         Args:
             file_content: CSV file content as string
             
         Returns:
-            Tuple of (is_valid, error_message)
+            Tuple of (dataframe, error_message); dataframe is None on error
         """
         try:
-            df = pd.read_csv(StringIO(file_content))
+            df = self.read_frame(file_content)
         except Exception as e:
-            return False, f"Failed to parse CSV: {str(e)}"
+            return None, f"Failed to parse CSV: {str(e)}"
         
         # Check for required columns
         missing_columns = set(self.REQUIRED_COLUMNS) - set(df.columns)
         if missing_columns:
-            return False, f"Missing required columns: {', '.join(missing_columns)}"
+            return None, f"Missing required columns: {', '.join(missing_columns)}"
         
         # Check if file is empty
         if len(df) == 0:
-            return False, "CSV file is empty"
+            return None, "CSV file is empty"
+        
+        return df, None
+    
+    def read_frame(self, file_content: str) -> pd.DataFrame:
+        """
+        Read CSV content with identifier columns kept as strings.
+        
+        Blank identifiers are still read as missing values.
+        
+        Args:
+            file_content: CSV content including the header line
+            
+        Returns:
+            DataFrame of the content
+        """
+        df = pd.read_csv(StringIO(file_content), converters={column: str for column in self.ID_COLUMNS})
+        for column in self.ID_COLUMNS:
+            if column in df.columns:
+                df[column] = df[column].mask(df[column].str.strip() == "")
+        return df
+    
+    def validate_csv_format(self, file_content: str) -> Tuple[bool, Optional[str]]:
+        """
+        Validate CSV file format.
+        
+        Args:
+            file_content: CSV file content as string
+            
+        Returns:
+            Tuple of (is_valid, error_message)
+        """
+        df, error_msg = self._read_csv(file_content)
+        if df is None:
+            return False, error_msg
         
         return True, None
     
@@ -168,10 +236,22 @@ class IngestionService:
         
         return duplicates
     
+    def stream(self) -> "StreamingIngestion":
+        """
+        Start an incremental parse of a CSV upload.
+        
+        Returns:
+            StreamingIngestion fed with raw bytes as they arrive
+        """
+        return StreamingIngestion(self)
+    
     def parse_csv(self, file_content: str) -> IngestionResult:
         """
         Parse and validate CSV file content.
         
+        The file is parsed once and validated column by column; see
+        ``parse_dataframe`` for details.
+        
         Args:
             file_content: CSV file content as string
             
@@ -180,94 +260,494 @@ class IngestionService:
         """
         result = IngestionResult()
         
-        # Validate format first
-        is_valid, error_msg = self.validate_csv_format(file_content)
-        if not is_valid:
+        df, error_msg = self._read_csv(file_content)
+        if df is None:
             result.add_error(0, "file", error_msg)
             return result
         
-        # Parse CSV
-        df = pd.read_csv(StringIO(file_content))
+        return self.parse_dataframe(df, result)
+    
+    def parse_dataframe(
+        self,
+        df: pd.DataFrame,
+        result: Optional[IngestionResult] = None
+    ) -> IngestionResult:
+        """
+        Validate a parsed CSV DataFrame using whole-column operations.
         
-        # Check for duplicates
-        duplicates = self.check_duplicates(df['record_id'].tolist())
+        Every check is evaluated as a boolean mask over the column. Rows that
+        pass all masks are turned into records in bulk; the remaining rows
+        (duplicates, bad values, unusual formats) go through the row-level
+        validator so their error messages match a row-by-row parse exactly.
+        Row numbers are taken from the DataFrame index.
+        
+        Args:
+            df: DataFrame with the required columns
+            result: Optional result to accumulate into
+            
+        Returns:
+            IngestionResult with valid records and errors
+        """
+        if result is None:
+            result = IngestionResult()
+        
+        n = len(df)
+        if n == 0:
+            return result
+        
+        # Duplicates (missing IDs never compare equal, as in check_duplicates)
+        record_ids = df['record_id']
+        present = record_ids.notna().to_numpy()
+        repeated = record_ids.duplicated(keep='first').to_numpy() & present
+        duplicates = pd.unique(record_ids[repeated]).tolist()
         for dup_id in duplicates:
             result.add_duplicate(dup_id)
+        dup_mask = record_ids.duplicated(keep=False).to_numpy() & present
+        
+        blood_groups = self._normalize_blood_group_column(df['blood_group'])
+        components = df['component'].astype(str).str.strip()
+        units, units_ok = self._parse_units_column(df['units'])
+        collection_dates, collection_ok = self._parse_date_column(df['collection_date'])
+        expiry_dates, expiry_ok = self._parse_date_column(df['unit_expiry_date'])
+        record_id_values = record_ids.astype(str).str.strip()
+        hospital_ids = df['hospital_id'].astype(str).str.strip()
+        
+        fast = (
+            present
+            & df['hospital_id'].notna().to_numpy()
+            & ~dup_mask
+            & blood_groups.notna().to_numpy()
+            & components.isin(self._COMPONENT_VALUES).to_numpy()
+            & units_ok
+            & collection_ok
+            & expiry_ok
+            & self._length_ok(record_id_values)
+            & self._length_ok(hospital_ids)
+        )
+        fast &= expiry_dates >= collection_dates
+        
+        fast_positions = np.flatnonzero(fast)
+        fast_records = self._build_records(
+            fast_positions,
+            record_id_values.to_numpy(),
+            hospital_ids.to_numpy(),
+            blood_groups.to_numpy(),
+            components.to_numpy(),
+            units,
+            expiry_dates,
+            collection_dates
+        )
+        
+        # Everything else is validated row by row, in row order
+        slow_records = []
+        for pos in np.flatnonzero(~fast):
+            row_num = df.index[pos] + 2  # +2 because: 0-indexed + header row
+            record, error = self._validate_row(row_num, df.iloc[pos], duplicates)
+            if error is not None:
+                result.add_error(*error)
+            else:
+                slow_records.append((pos, record))
+        
+        if slow_records:
+            merged = heapq.merge(
+                zip(fast_positions.tolist(), fast_records),
+                slow_records,
+                key=lambda item: item[0]
+            )
+            records = [record for _, record in merged]
+        else:
+            records = fast_records
+        
+        result.valid_records.extend(records)
+        result.success_count += len(records)
+        
+        return result
+    
+    def _normalize_blood_group_column(self, column: pd.Series) -> pd.Series:
+        """Normalize a blood group column; unrecognized values become NaN."""
+        raw = column.astype(str).str.strip()
+        normalized = raw.str.upper().map(self.BLOOD_GROUP_MAPPINGS)
+        return normalized.fillna(raw.map(self.BLOOD_GROUP_MAPPINGS))
+    
+    def _parse_units_column(self, column: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Convert a units column to integers.
+        
+        Returns:
+            Tuple of (units, ok_mask); ok rows hold a positive integer
+        """
+        n = len(column)
+        if pd.api.types.is_integer_dtype(column.dtype):
+            units = column.to_numpy(dtype=np.int64)
+        elif pd.api.types.is_float_dtype(column.dtype):
+            values = column.to_numpy(dtype=np.float64)
+            # Values outside the int64 range would wrap around when cast, so
+            # they are left for the row-level validator like non-finite ones
+            in_range = np.isfinite(values) & (np.abs(values) < 2.0 ** 63)
+            # int() truncates floats towards zero
+            units = np.zeros(n, dtype=np.int64)
+            units[in_range] = np.trunc(values[in_range]).astype(np.int64)
+            return units, in_range & (units > 0)
+        elif column.dtype == object or pd.api.types.is_string_dtype(column.dtype):
+            # Plain integer strings are what int() accepts without surprises.
+            # The mask is a fresh array: to_numpy() may return a read-only view
+            is_int = np.array(column.map(lambda v: isinstance(v, str)), dtype=bool)
+            is_int[is_int] = column[is_int].str.fullmatch(r'\s*[+-]?\d{1,18}\s*').to_numpy(dtype=bool)
+            units = np.zeros(n, dtype=np.int64)
+            units[is_int] = column[is_int].astype(np.int64).to_numpy()
+            return units, is_int & (units > 0)
+        else:
+            return np.zeros(n, dtype=np.int64), np.zeros(n, dtype=bool)
+        
+        return units, units > 0
+    
+    def _parse_date_column(self, column: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Parse an ISO 8601 date column.
+        
+        Values in any other format are left for the row-level validator.
+        
+        Returns:
+            Tuple of (dates as datetime64[D], ok_mask)
+        """
+        n = len(column)
+        failed = (np.full(n, np.datetime64('NaT'), dtype='datetime64[D]'), np.zeros(n, dtype=bool))
+        if column.dtype != object and not pd.api.types.is_string_dtype(column.dtype):
+            return failed
+        
+        try:
+            parsed = pd.to_datetime(column, format='ISO8601', errors='coerce')
+        except (ValueError, TypeError):
+            return failed
+        
+        if not pd.api.types.is_datetime64_dtype(parsed.dtype):
+            # Timezone-aware values keep their local date only via the row path
+            return failed
+        
+        dates = parsed.to_numpy().astype('datetime64[D]')
+        return dates, ~np.isnat(dates)
+    
+    @staticmethod
+    def _length_ok(column: pd.Series) -> np.ndarray:
+        """Check identifier lengths against the InventoryCreate field limits."""
+        lengths = column.str.len().to_numpy()
+        return (lengths >= 1) & (lengths <= 50)
+    
+    def _build_records(
+        self,
+        positions: np.ndarray,
+        record_ids: np.ndarray,
+        hospital_ids: np.ndarray,
+        blood_groups: np.ndarray,
+        components: np.ndarray,
+        units: np.ndarray,
+        expiry_dates: np.ndarray,
+        collection_dates: np.ndarray
+    ) -> List[InventoryCreate]:
+        """
+        Build InventoryCreate records for rows that passed every column check.
+        
+        The checks already cover all schema constraints, so records are
+        constructed without re-running Pydantic validation.
+        """
+        blood_group_enums = {bg.value: bg for bg in BloodGroup}
+        component_enums = {c.value: c for c in Component}
+        construct = InventoryCreate.model_construct
         
-        # Process each row
-        for idx, row in df.iterrows():
-            row_num = idx + 2  # +2 because: 0-indexed + header row
+        return [
+            construct(
+                record_id=record_id,
+                hospital_id=hospital_id,
+                blood_group=blood_group_enums[blood_group],
+                component=component_enums[component],
+                units=unit_count,
+                unit_expiry_date=expiry_date,
+                collection_date=collection_date
+            )
+            for record_id, hospital_id, blood_group, component, unit_count, expiry_date, collection_date in zip(
+                record_ids[positions].tolist(),
+                hospital_ids[positions].tolist(),
+                blood_groups[positions].tolist(),
+                components[positions].tolist(),
+                units[positions].tolist(),
+                expiry_dates[positions].tolist(),
+                collection_dates[positions].tolist()
+            )
+        ]
+    
+    def _validate_row(
+        self,
+        row_num: int,
+        row: pd.Series,
+        duplicates: List
+    ) -> Tuple[Optional[InventoryCreate], Optional[tuple]]:
+        """
+        Validate a single CSV row.
+        
+        Args:
+            row_num: Row number reported in errors
+            row: Row values
+            duplicates: Record IDs that appear more than once in the file
             
+        Returns:
+            Tuple of (record, error); error holds ``add_error`` arguments
+        """
+        try:
+            # Blank identifiers would otherwise be stored as "nan"
+            for field in self.ID_COLUMNS:
+                if pd.isna(row[field]):
+                    return None, (row_num, field, f"{field} is required")
+            
+            # Skip if this is a duplicate
+            if row['record_id'] in duplicates:
+                return None, (row_num, "record_id", f"Duplicate record ID: {row['record_id']}")
+            
+            # Validate and normalize blood group
             try:
-                # Skip if this is a duplicate
-                if row['record_id'] in duplicates:
-                    result.add_error(row_num, "record_id", f"Duplicate record ID: {row['record_id']}")
-                    continue
-                
-                # Validate and normalize blood group
-                try:
-                    normalized_blood_group = self.normalize_blood_group(str(row['blood_group']))
-                except ValueError as e:
-                    result.add_error(row_num, "blood_group", str(e), str(row['blood_group']))
-                    continue
-                
-                # Validate component
-                component_str = str(row['component']).strip()
-                if component_str not in [c.value for c in Component]:
-                    result.add_error(
-                        row_num, 
-                        "component", 
-                        f"Invalid component. Must be one of: {', '.join([c.value for c in Component])}",
-                        component_str
-                    )
-                    continue
-                
-                # Validate units
-                try:
-                    units = int(row['units'])
-                    if units <= 0:
-                        result.add_error(row_num, "units", "Units must be greater than 0", str(units))
-                        continue
-                except (ValueError, TypeError):
-                    result.add_error(row_num, "units", "Units must be a positive integer", str(row['units']))
-                    continue
-                
-                # Parse dates
-                try:
-                    collection_date = pd.to_datetime(row['collection_date']).date()
-                except Exception as e:
-                    result.add_error(row_num, "collection_date", f"Invalid date format: {str(e)}", str(row['collection_date']))
-                    continue
-                
-                try:
-                    unit_expiry_date = pd.to_datetime(row['unit_expiry_date']).date()
-                except Exception as e:
-                    result.add_error(row_num, "unit_expiry_date", f"Invalid date format: {str(e)}", str(row['unit_expiry_date']))
-                    continue
-                
-                # Validate expiry date is after collection date
-                if unit_expiry_date < collection_date:
-                    result.add_error(
-                        row_num,
-                        "unit_expiry_date",
-                        "Expiry date must be after collection date"
-                    )
-                    continue
-                
-                # Create valid record
-                record = InventoryCreate(
-                    record_id=str(row['record_id']).strip(),
-                    hospital_id=str(row['hospital_id']).strip(),
-                    blood_group=BloodGroup(normalized_blood_group),
-                    component=Component(component_str),
-                    units=units,
-                    unit_expiry_date=unit_expiry_date,
-                    collection_date=collection_date
+                normalized_blood_group = self.normalize_blood_group(str(row['blood_group']))
+            except ValueError as e:
+                return None, (row_num, "blood_group", str(e), str(row['blood_group']))
+            
+            # Validate component
+            component_str = str(row['component']).strip()
+            if component_str not in self._COMPONENT_VALUES:
+                return None, (
+                    row_num,
+                    "component",
+                    f"Invalid component. Must be one of: {', '.join(self._COMPONENT_VALUES)}",
+                    component_str
                 )
-                
-                result.add_valid_record(record)
-                
+            
+            # Validate units
+            try:
+                units = int(row['units'])
+                if units <= 0:
+                    return None, (row_num, "units", "Units must be greater than 0", str(units))
+            except (ValueError, TypeError):
+                return None, (row_num, "units", "Units must be a positive integer", str(row['units']))
+            
+            # Parse dates
+            try:
+                collection_date = pd.to_datetime(row['collection_date']).date()
+            except Exception as e:
+                return None, (row_num, "collection_date", f"Invalid date format: {str(e)}", str(row['collection_date']))
+            
+            try:
+                unit_expiry_date = pd.to_datetime(row['unit_expiry_date']).date()
             except Exception as e:
-                result.add_error(row_num, "general", f"Unexpected error: {str(e)}")
+                return None, (row_num, "unit_expiry_date", f"Invalid date format: {str(e)}", str(row['unit_expiry_date']))
+            
+            # Validate expiry date is after collection date
+            if unit_expiry_date < collection_date:
+                return None, (
+                    row_num,
+                    "unit_expiry_date",
+                    "Expiry date must be after collection date"
+                )
+            
+            # Create valid record
+            record = InventoryCreate(
+                record_id=str(row['record_id']).strip(),
+                hospital_id=str(row['hospital_id']).strip(),
+                blood_group=BloodGroup(normalized_blood_group),
+                component=Component(component_str),
+                units=units,
+                unit_expiry_date=unit_expiry_date,
+                collection_date=collection_date
+            )
+            return record, None
+            
+        except Exception as e:
+            return None, (row_num, "general", f"Unexpected error: {str(e)}")
+
+
+class StreamingIngestion:
+    """
+    Incremental CSV parser that validates an upload chunk by chunk.
+    
+    Bytes are fed as they are read; every batch of complete rows is parsed
+    with ``IngestionService.parse_dataframe`` and its valid records handed
+    back to the caller, so only the current batch is held in memory. The
+    running ``result`` keeps counts, errors and duplicates but not records.
+    
+    Unlike ``parse_csv``, the first occurrence of a record ID is kept and
+    only later occurrences are reported as duplicates, since earlier rows
+    may already be saved. Seen IDs are tracked as sorted 64-bit hashes.
+    
+    Quote parity is carried from feed to feed, so each byte is scanned for
+    row boundaries once. A row left open for more than ``max_buffer_bytes``
+    (e.g. by an unterminated quoted field) fails the upload.
+    """
+    
+    def __init__(self, service: IngestionService, max_buffer_bytes: Optional[int] = None):
+        """
+        Initialize the stream.
         
-        return result
+        Args:
+            service: Ingestion service used to validate each batch
+            max_buffer_bytes: Longest incomplete row kept in memory (defaults
+                to MAX_BUFFERED_CHUNKS upload chunks)
+        """
+        self.service = service
+        self.result = IngestionResult()
+        self.chunks_processed = 0
+        self.failed = False
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ""
+        # Characters of the buffer already scanned and whether they end
+        # inside a quoted field
+        self._scanned = 0
+        self._in_quotes = False
+        self.max_buffer_bytes = max_buffer_bytes or MAX_BUFFERED_CHUNKS * settings.upload_chunk_size_bytes
+        self._header: Optional[str] = None
+        self._rows_seen = 0
+        self._seen_ids = np.empty(0, dtype=np.uint64)
+        self._reported_duplicates = set()
+    
+    def feed(self, data: bytes) -> List[InventoryCreate]:
+        """
+        Feed raw upload bytes.
+        
+        Args:
+            data: Next chunk of the uploaded file
+            
+        Returns:
+            Valid records from the rows completed by this chunk
+        """
+        if self.failed:
+            return []
+        
+        try:
+            self._buffer += self._decoder.decode(data)
+        except UnicodeDecodeError as e:
+            return self._fail(f"Failed to read file: {str(e)}")
+        
+        cut = self._safe_cut()
+        if cut == -1:
+            if len(self._buffer) > self.max_buffer_bytes:
+                return self._fail("Unterminated quoted field" if self._in_quotes else "Row exceeds the maximum length")
+            return []
+        
+        block = self._buffer[:cut + 1]
+        self._buffer = self._buffer[cut + 1:]
+        self._scanned -= cut + 1
+        return self._process_block(block)
+    
+    def close(self) -> List[InventoryCreate]:
+        """
+        Flush the remaining buffered rows.
+        
+        Returns:
+            Valid records from the final rows
+        """
+        if self.failed:
+            return []
+        
+        try:
+            self._buffer += self._decoder.decode(b"", final=True)
+        except UnicodeDecodeError as e:
+            return self._fail(f"Failed to read file: {str(e)}")
+        
+        block, self._buffer = self._buffer, ""
+        records = self._process_block(block) if block.strip() or self._header is None else []
+        
+        if not self.failed and self._rows_seen == 0:
+            return self._fail("CSV file is empty")
+        
+        return records
+    
+    def _fail(self, message: str) -> List[InventoryCreate]:
+        """Record a file-level error and stop processing."""
+        self.failed = True
+        self.result.add_error(0, "file", message)
+        return []
+    
+    def _safe_cut(self) -> int:
+        """
+        Find the last newline that is not inside a quoted field.
+        
+        Only text added since the previous call is scanned. An escaped
+        quote ("") toggles the parity twice, so it needs no special case.
+        
+        Returns:
+            Buffer position of the newline, or -1 if there is none
+        """
+        start = self._scanned
+        self._scanned = len(self._buffer)
+        
+        if self._buffer.find('"', start) == -1:
+            # No quotes added: parity is unchanged
+            return -1 if self._in_quotes else self._buffer.rfind("\n", start)
+        
+        cut = -1
+        in_quotes = self._in_quotes
+        for match in _QUOTE_OR_NEWLINE.finditer(self._buffer, start):
+            if match.group() == '"':
+                in_quotes = not in_quotes
+            elif not in_quotes:
+                cut = match.start()
+        self._in_quotes = in_quotes
+        return cut
+    
+    def _process_block(self, block: str) -> List[InventoryCreate]:
+        """Parse a block of complete lines and validate its rows."""
+        if self._header is None:
+            header, _, block = block.partition("\n")
+            self._header = header + "\n"
+            try:
+                columns = pd.read_csv(StringIO(self._header), nrows=0).columns
+            except Exception as e:
+                return self._fail(f"Failed to parse CSV: {str(e)}")
+            
+            missing_columns = set(self.service.REQUIRED_COLUMNS) - set(columns)
+            if missing_columns:
+                return self._fail(f"Missing required columns: {', '.join(missing_columns)}")
+        
+        if not block.strip():
+            return []
+        
+        try:
+            df = self.service.read_frame(self._header + block)
+        except Exception as e:
+            return self._fail(f"Failed to parse CSV: {str(e)}")
+        
+        if len(df) == 0:
+            return []
+        
+        df.index = pd.RangeIndex(self._rows_seen, self._rows_seen + len(df))
+        self._rows_seen += len(df)
+        self.chunks_processed += 1
+        
+        return self._validate_chunk(df)
+    
+    def _validate_chunk(self, df: pd.DataFrame) -> List[InventoryCreate]:
+        """Validate one chunk, rejecting record IDs seen in earlier rows."""
+        chunk_result = IngestionResult()
+        
+        record_ids = df['record_id']
+        present = record_ids.notna().to_numpy()
+        hashes = pd.util.hash_pandas_object(record_ids.astype(str), index=False).to_numpy()
+        
+        repeated = present & (
+            np.isin(hashes, self._seen_ids, assume_unique=False)
+            | pd.Series(hashes).duplicated(keep='first').to_numpy()
+        )
+        
+        for pos in np.flatnonzero(repeated):
+            record_id = record_ids.iloc[pos]
+            row_num = df.index[pos] + 2  # +2 because: 0-indexed + header row
+            if record_id not in self._reported_duplicates:
+                self._reported_duplicates.add(record_id)
+                chunk_result.add_duplicate(record_id)
+            chunk_result.add_error(row_num, "record_id", f"Duplicate record ID: {record_id}")
+        
+        self._seen_ids = np.union1d(self._seen_ids, hashes[present])
+        
+        if repeated.any():
+            self.service.parse_dataframe(df[~repeated], chunk_result)
+            chunk_result.errors.sort(key=lambda error: error["row"])
+        else:
+            self.service.parse_dataframe(df, chunk_result)
+        
+        self.result.merge(chunk_result, keep_records=False)
+        return chunk_result.valid_records
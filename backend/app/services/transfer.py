@@ -1,4 +1,5 @@
 """Transfer recommendation service."""
+from __future__ import annotations
 from typing import List, Dict, Optional, Tuple
 from datetime import date, timedelta
 from math import radians, cos, sin, asin, sqrt
@@ -7,7 +8,14 @@ from app.repositories.hospital import HospitalRepository
 from app.repositories.inventory import InventoryRepository
 from app.repositories.forecast import ForecastRepository
 from app.repositories.transfer import TransferRepository
+from app.utils.geo import HospitalDistanceIndex, get_hospital_index
 from app.config import settings
+from app.utils.lazy_import import lazy_module
+
+np = lazy_module("numpy")
+
+# Recommendation modes accepted by generate_recommendations
+RECOMMENDATION_MODES = ("greedy", "optimal")
 
 
 class TransferService:
@@ -26,6 +34,7 @@ class TransferService:
         self.weight_distance = settings.transfer_weight_distance
         self.weight_surplus = settings.transfer_weight_surplus
         self.speed_kmh = settings.transfer_speed_kmh
+        self.optimal_candidates = settings.transfer_optimal_candidates
     
     def haversine_distance(
         self,
@@ -66,6 +75,8 @@ class TransferService:
         """
         Find hospitals within radius.
         
+        Uses the vectorized distance index instead of scanning hospitals.
+        
         Args:
             hospital_id: Source hospital ID
             radius_km: Search radius (uses config default if not provided)
@@ -76,37 +87,19 @@ class TransferService:
         if radius_km is None:
             radius_km = self.radius_km
         
-        source_hospital = self.hospital_repo.get_by_id(hospital_id)
-        if not source_hospital or not source_hospital.latitude or not source_hospital.longitude:
-            return []
+        return self.distance_index().within(hospital_id, radius_km)
+    
+    def distance_index(self) -> HospitalDistanceIndex:
+        """
+        Get the shared hospital distance index.
         
-        all_hospitals = self.hospital_repo.get_all()
-        nearby = []
+        The index is built from one hospital query and reused until a
+        hospital is created, updated or deleted.
         
-        for hospital in all_hospitals:
-            if hospital.hospital_id == hospital_id:
-                continue
-            
-            if not hospital.latitude or not hospital.longitude:
-                continue
-            
-            distance = self.haversine_distance(
-                source_hospital.latitude,
-                source_hospital.longitude,
-                hospital.latitude,
-                hospital.longitude
-            )
-            
-            if distance <= radius_km:
-                nearby.append({
-                    "hospital_id": hospital.hospital_id,
-                    "name": hospital.name,
-                    "distance_km": round(distance, 2),
-                    "latitude": float(hospital.latitude),
-                    "longitude": float(hospital.longitude)
-                })
-        
-        return sorted(nearby, key=lambda x: x["distance_km"])
+        Returns:
+            Hospital distance index
+        """
+        return get_hospital_index(self.hospital_repo.get_all)
     
     def calculate_deficit_and_surplus(
         self,
@@ -123,53 +116,58 @@ class TransferService:
         Returns:
             Tuple of (deficits, surpluses)
         """
-        # Get inventory
-        inventory = self.inventory_repo.get_all(
-            filters={"hospital_id": hospital_id}
-        )
-        
-        # Get forecasts
-        forecasts = self.forecast_repo.get_latest_forecasts(
-            hospital_id=hospital_id,
-            days=forecast_days
+        deficits, surpluses = self.calculate_balance_matrices(hospital_id, forecast_days)
+        
+        return (
+            [
+                {"blood_group": blood_group, "component": component, "deficit": deficit}
+                for (_, blood_group, component), deficit in deficits.items()
+            ],
+            [
+                {"blood_group": blood_group, "component": component, "surplus": surplus}
+                for (_, blood_group, component), surplus in surpluses.items()
+            ]
         )
+    
+    def calculate_balance_matrices(
+        self,
+        hospital_id: Optional[str] = None,
+        forecast_days: int = 7
+    ) -> Tuple[Dict[Tuple[str, str, str], float], Dict[Tuple[str, str, str], float]]:
+        """
+        Calculate deficits and surpluses for every hospital at once.
         
-        # Aggregate by blood_group and component
-        inventory_totals = {}
-        for inv in inventory:
-            key = f"{inv.blood_group}_{inv.component}"
-            inventory_totals[key] = inventory_totals.get(key, 0) + inv.units
+        Inventory and forecast totals are loaded with one aggregate query
+        each, regardless of the number of hospitals.
         
-        forecast_totals = {}
-        for fc in forecasts:
-            key = f"{fc.blood_group}_{fc.component}"
-            forecast_totals[key] = forecast_totals.get(key, 0) + float(fc.predicted_units)
+        Args:
+            hospital_id: Optional hospital ID filter
+            forecast_days: Days to forecast
+            
+        Returns:
+            Tuple of (deficits, surpluses) keyed by
+            (hospital_id, blood_group, component)
+        """
+        inventory_totals = {
+            (row.hospital_id, row.blood_group, row.component): row.total_units
+            for row in self.inventory_repo.get_unit_totals(hospital_id)
+        }
         
-        # Calculate deficits and surpluses
-        deficits = []
-        surpluses = []
+        forecast_totals = {
+            (row.hospital_id, row.blood_group, row.component): float(row.total_predicted)
+            for row in self.forecast_repo.get_predicted_totals(hospital_id, days=forecast_days)
+        }
         
-        all_keys = set(inventory_totals.keys()) | set(forecast_totals.keys())
+        deficits = {}
+        surpluses = {}
         
-        for key in all_keys:
-            blood_group, component = key.split("_")
-            inv_total = inventory_totals.get(key, 0)
-            fc_total = forecast_totals.get(key, 0)
-            
-            diff = inv_total - fc_total
+        for key in inventory_totals.keys() | forecast_totals.keys():
+            diff = inventory_totals.get(key, 0) - forecast_totals.get(key, 0)
             
             if diff < 0:  # Deficit
-                deficits.append({
-                    "blood_group": blood_group,
-                    "component": component,
-                    "deficit": abs(diff)
-                })
+                deficits[key] = abs(diff)
             elif diff > self.surplus_threshold:  # Surplus
-                surpluses.append({
-                    "blood_group": blood_group,
-                    "component": component,
-                    "surplus": diff
-                })
+                surpluses[key] = diff
         
         return deficits, surpluses
     
@@ -224,101 +222,323 @@ class TransferService:
         minutes = hours * 60
         return round(minutes)
     
+    def calculate_urgency_scores(
+        self,
+        days_to_expiry: np.ndarray,
+        distance_km: np.ndarray,
+        surplus: np.ndarray,
+        max_days: int = 30,
+        max_distance: float = 100,
+        max_surplus: float = 100
+    ) -> np.ndarray:
+        """
+        Vectorized version of ``calculate_urgency_score``.
+        
+        Args:
+            days_to_expiry: Days until expiry
+            distance_km: Distances in km
+            surplus: Surplus units
+            max_days: Maximum days for normalization
+            max_distance: Maximum distance for normalization
+            max_surplus: Maximum surplus for normalization
+            
+        Returns:
+            Urgency scores
+        """
+        norm_expiry = np.minimum(days_to_expiry / max_days, 1.0)
+        norm_distance = np.minimum(distance_km / max_distance, 1.0)
+        norm_surplus = np.minimum(surplus / max_surplus, 1.0)
+        
+        return (
+            self.weight_expiry * (1 - norm_expiry) +
+            self.weight_distance * (1 - norm_distance) +
+            self.weight_surplus * norm_surplus
+        )
+    
     def generate_recommendations(
         self,
-        hospital_id: Optional[str] = None
+        hospital_id: Optional[str] = None,
+        mode: str = "greedy"
     ) -> List[Dict]:
         """
         Generate transfer recommendations.
         
+        Inventory totals, forecast totals and earliest-expiry lots are each
+        loaded with a single query and hospital distances come from the
+        distance index; deficits are then matched to nearby surpluses in
+        memory, so the query count does not grow with the number of
+        hospitals or deficits.
+        
+        In ``greedy`` mode every deficit/surplus pair is recommended on its
+        own. In ``optimal`` mode all surpluses and deficits are allocated
+        together (see ``allocate_optimal``), so no surplus is promised twice.
+        
         Args:
-            hospital_id: Optional hospital ID filter
+            hospital_id: Optional hospital ID filter (destination hospital)
+            mode: "greedy" or "optimal"
             
         Returns:
             List of transfer recommendations sorted by urgency
+            
+        Raises:
+            ValueError: If the mode is not recognized
         """
-        recommendations = []
+        if mode not in RECOMMENDATION_MODES:
+            raise ValueError(f"Unknown recommendation mode: {mode}. Must be one of: {', '.join(RECOMMENDATION_MODES)}")
+        
+        index = self.distance_index()
         
-        # Get hospitals to process
+        # Get hospitals to process; hospitals without coordinates have no
+        # neighbours and are not indexed
         if hospital_id:
-            hospitals = [self.hospital_repo.get_by_id(hospital_id)]
+            hospitals = [hospital_id] if hospital_id in index else []
         else:
-            hospitals = self.hospital_repo.get_all()
+            hospitals = index.hospital_ids
         
-        for hospital in hospitals:
-            if not hospital:
-                continue
-            
-            # Get deficits for this hospital
-            deficits, _ = self.calculate_deficit_and_surplus(hospital.hospital_id)
+        if not hospitals:
+            return []
+        
+        deficits, surpluses = self.calculate_balance_matrices()
+        
+        earliest_lots = {
+            (lot.hospital_id, lot.blood_group, lot.component): lot
+            for lot in self.inventory_repo.get_earliest_expiry_lots()
+        }
+        
+        if mode == "optimal":
+            recommendations = self.allocate_optimal(index, deficits, surpluses, earliest_lots)
+            if hospital_id:
+                recommendations = [
+                    r for r in recommendations if r["destination_hospital_id"] == hospital_id
+                ]
+        else:
+            recommendations = self.match_greedy(index, hospitals, deficits, surpluses, earliest_lots)
+        
+        # Sort by urgency score (descending)
+        recommendations.sort(key=lambda x: x["urgency_score"], reverse=True)
+        
+        return recommendations
+    
+    def match_greedy(
+        self,
+        index: HospitalDistanceIndex,
+        hospitals: List[str],
+        deficits: Dict[Tuple[str, str, str], float],
+        surpluses: Dict[Tuple[str, str, str], float],
+        earliest_lots: Dict[Tuple[str, str, str], object]
+    ) -> List[Dict]:
+        """
+        Recommend every nearby surplus for every deficit independently.
+        
+        Args:
+            index: Hospital distance index
+            hospitals: Destination hospital IDs to process
+            deficits: Deficits keyed by (hospital_id, blood_group, component)
+            surpluses: Surpluses keyed by (hospital_id, blood_group, component)
+            earliest_lots: Earliest-expiry lot per key
             
-            if not deficits:
+        Returns:
+            Unsorted list of transfer recommendations
+        """
+        recommendations = []
+        
+        deficits_by_hospital = {}
+        for (deficit_hospital_id, blood_group, component), deficit in deficits.items():
+            deficits_by_hospital.setdefault(deficit_hospital_id, []).append(
+                (blood_group, component, deficit)
+            )
+        
+        today = date.today()
+        
+        for destination_id in hospitals:
+            hospital_deficits = deficits_by_hospital.get(destination_id)
+            if not hospital_deficits:
                 continue
             
             # Find nearby hospitals
-            nearby = self.find_nearby_hospitals(hospital.hospital_id)
+            nearby = index.within(destination_id, self.radius_km)
             
-            for deficit in deficits:
+            for blood_group, component, deficit in hospital_deficits:
                 # Find hospitals with surplus of this blood type
                 for nearby_hospital in nearby:
-                    _, surpluses = self.calculate_deficit_and_surplus(
-                        nearby_hospital["hospital_id"]
+                    source_key = (nearby_hospital["hospital_id"], blood_group, component)
+                    surplus = surpluses.get(source_key)
+                    if surplus is None:
+                        continue
+                    
+                    # Inventory with earliest expiry
+                    earliest = earliest_lots.get(source_key)
+                    if earliest is None:
+                        continue
+                    
+                    days_to_expiry = (earliest.unit_expiry_date - today).days
+                    
+                    # Calculate urgency score
+                    urgency = self.calculate_urgency_score(
+                        days_to_expiry=days_to_expiry,
+                        distance_km=nearby_hospital["distance_km"],
+                        surplus=surplus
                     )
                     
-                    for surplus in surpluses:
-                        if (surplus["blood_group"] == deficit["blood_group"] and
-                            surplus["component"] == deficit["component"]):
-                            
-                            # Get inventory with earliest expiry
-                            source_inv = self.inventory_repo.get_all(
-                                filters={
-                                    "hospital_id": nearby_hospital["hospital_id"],
-                                    "blood_group": deficit["blood_group"],
-                                    "component": deficit["component"]
-                                }
-                            )
-                            
-                            if not source_inv:
-                                continue
-                            
-                            # Sort by expiry date
-                            source_inv.sort(key=lambda x: x.unit_expiry_date)
-                            earliest = source_inv[0]
-                            
-                            days_to_expiry = (earliest.unit_expiry_date - date.today()).days
-                            
-                            # Calculate urgency score
-                            urgency = self.calculate_urgency_score(
-                                days_to_expiry=days_to_expiry,
-                                distance_km=nearby_hospital["distance_km"],
-                                surplus=surplus["surplus"]
-                            )
-                            
-                            # Calculate ETA
-                            eta = self.calculate_eta(nearby_hospital["distance_km"])
-                            
-                            # Determine units to transfer
-                            units = min(deficit["deficit"], surplus["surplus"], earliest.units)
-                            
-                            recommendations.append({
-                                "source_hospital_id": nearby_hospital["hospital_id"],
-                                "source_hospital_name": nearby_hospital["name"],
-                                "destination_hospital_id": hospital.hospital_id,
-                                "destination_hospital_name": hospital.name,
-                                "blood_group": deficit["blood_group"],
-                                "component": deficit["component"],
-                                "units": int(units),
-                                "urgency_score": round(urgency, 3),
-                                "distance_km": nearby_hospital["distance_km"],
-                                "eta_minutes": eta,
-                                "days_to_expiry": days_to_expiry
-                            })
+                    # Calculate ETA
+                    eta = self.calculate_eta(nearby_hospital["distance_km"])
+                    
+                    # Determine units to transfer
+                    units = min(deficit, surplus, earliest.units)
+                    
+                    recommendations.append({
+                        "source_hospital_id": nearby_hospital["hospital_id"],
+                        "source_hospital_name": nearby_hospital["name"],
+                        "destination_hospital_id": destination_id,
+                        "destination_hospital_name": index.name_of(destination_id),
+                        "blood_group": blood_group,
+                        "component": component,
+                        "units": int(units),
+                        "urgency_score": round(urgency, 3),
+                        "distance_km": nearby_hospital["distance_km"],
+                        "eta_minutes": eta,
+                        "days_to_expiry": days_to_expiry
+                    })
         
-        # Sort by urgency score (descending)
-        recommendations.sort(key=lambda x: x["urgency_score"], reverse=True)
+        return recommendations
+    
+    def allocate_optimal(
+        self,
+        index: HospitalDistanceIndex,
+        deficits: Dict[Tuple[str, str, str], float],
+        surpluses: Dict[Tuple[str, str, str], float],
+        earliest_lots: Dict[Tuple[str, str, str], object]
+    ) -> List[Dict]:
+        """
+        Allocate surpluses to deficits as a transportation problem.
+        
+        Each (blood_group, component) is solved as a linear program over
+        the source/destination pairs within the transfer radius. Supplies
+        are whole surplus units, demands are deficits rounded up. Every
+        shipped unit earns ``1 + urgency_score`` for its pair, so the plan
+        moves as many units as possible and prefers near, soon-to-expire
+        stock. To keep large networks tractable, a pair is only considered
+        if the source is among the destination's ``optimal_candidates``
+        nearest sources or vice versa. Transportation problems have
+        integral vertex solutions, so the crossover result is a whole-unit
+        plan.
+        
+        Args:
+            index: Hospital distance index
+            deficits: Deficits keyed by (hospital_id, blood_group, component)
+            surpluses: Surpluses keyed by (hospital_id, blood_group, component)
+            earliest_lots: Earliest-expiry lot per key
+            
+        Returns:
+            Unsorted list of transfer recommendations
+        """
+        from scipy.optimize import linprog
+        from scipy.sparse import coo_matrix, vstack
+        
+        today = date.today()
+        
+        products = {}
+        for (hospital, blood_group, component), deficit in deficits.items():
+            if hospital in index:
+                products.setdefault((blood_group, component), ([], []))[1].append((hospital, deficit))
+        for (hospital, blood_group, component), surplus in surpluses.items():
+            if hospital in index and (hospital, blood_group, component) in earliest_lots:
+                products.setdefault((blood_group, component), ([], []))[0].append((hospital, surplus))
+        
+        recommendations = []
+        
+        for (blood_group, component), (sources, sinks) in products.items():
+            if not sources or not sinks:
+                continue
+            
+            source_ids = [hospital for hospital, _ in sources]
+            sink_ids = [hospital for hospital, _ in sinks]
+            surplus = np.array([units for _, units in sources], dtype=np.float64)
+            supply = np.floor(surplus)
+            demand = np.ceil(np.array([units for _, units in sinks], dtype=np.float64))
+            days_to_expiry = np.array([
+                (earliest_lots[(hospital, blood_group, component)].unit_expiry_date - today).days
+                for hospital in source_ids
+            ], dtype=np.float64)
+            
+            distances = np.round(index.distance_matrix(source_ids, sink_ids), 2)
+            candidates = self._nearest_candidates(distances, self.optimal_candidates)
+            source_idx, sink_idx = np.nonzero(candidates & (distances <= self.radius_km))
+            edge_distances = distances[source_idx, sink_idx]
+            if len(source_idx) == 0:
+                continue
+            
+            urgency = self.calculate_urgency_scores(
+                days_to_expiry[source_idx],
+                edge_distances,
+                surplus[source_idx]
+            )
+            
+            edges = np.arange(len(source_idx))
+            ones = np.ones(len(edges))
+            constraints = vstack([
+                coo_matrix((ones, (source_idx, edges)), shape=(len(source_ids), len(edges))),
+                coo_matrix((ones, (sink_idx, edges)), shape=(len(sink_ids), len(edges)))
+            ]).tocsr()
+            
+            result = linprog(
+                -(1 + urgency),
+                A_ub=constraints,
+                b_ub=np.concatenate([supply, demand]),
+                bounds=(0, None),
+                method="highs-ipm"
+            )
+            if not result.success:
+                continue
+            
+            flows = np.round(result.x).astype(np.int64)
+            for edge in np.flatnonzero(flows > 0):
+                source = source_ids[source_idx[edge]]
+                destination = sink_ids[sink_idx[edge]]
+                distance_km = float(edge_distances[edge])
+                
+                recommendations.append({
+                    "source_hospital_id": source,
+                    "source_hospital_name": index.name_of(source),
+                    "destination_hospital_id": destination,
+                    "destination_hospital_name": index.name_of(destination),
+                    "blood_group": blood_group,
+                    "component": component,
+                    "units": int(flows[edge]),
+                    "urgency_score": round(float(urgency[edge]), 3),
+                    "distance_km": distance_km,
+                    "eta_minutes": self.calculate_eta(distance_km),
+                    "days_to_expiry": int(days_to_expiry[source_idx[edge]])
+                })
         
         return recommendations
     
+    @staticmethod
+    def _nearest_candidates(distances: np.ndarray, k: int) -> np.ndarray:
+        """
+        Mark the k nearest sources of each destination and the k nearest
+        destinations of each source.
+        
+        Args:
+            distances: Source x destination distance matrix
+            k: Candidates to keep per hospital
+            
+        Returns:
+            Boolean mask with the same shape as distances
+        """
+        n_sources, n_sinks = distances.shape
+        mask = np.zeros(distances.shape, dtype=bool)
+        
+        k_sources = min(k, n_sources)
+        nearest_sources = np.argpartition(distances, k_sources - 1, axis=0)[:k_sources]
+        mask[nearest_sources, np.arange(n_sinks)] = True
+        
+        k_sinks = min(k, n_sinks)
+        nearest_sinks = np.argpartition(distances, k_sinks - 1, axis=1)[:, :k_sinks]
+        mask[np.arange(n_sources)[:, None], nearest_sinks] = True
+        
+        return mask
+    
     def approve_transfer(
         self,
         source_hospital_id: str,
@@ -342,39 +562,17 @@ class TransferService:
         Returns:
             Transfer record
         """
-        # Get source inventory
-        source_inv = self.inventory_repo.get_all(
-            filters={
-                "hospital_id": source_hospital_id,
-                "blood_group": blood_group,
-                "component": component
-            }
+        # Take units from the source inventory, oldest first
+        taken = self.inventory_repo.consume_oldest_first(
+            source_hospital_id,
+            blood_group,
+            component,
+            units
         )
         
-        if not source_inv:
+        if not taken:
             raise ValueError("No source inventory found")
         
-        # Sort by expiry date (use oldest first)
-        source_inv.sort(key=lambda x: x.unit_expiry_date)
-        
-        # Update inventories
-        remaining_units = units
-        for inv in source_inv:
-            if remaining_units <= 0:
-                break
-            
-            if inv.units <= remaining_units:
-                # Delete this record
-                self.inventory_repo.delete(inv.record_id)
-                remaining_units -= inv.units
-            else:
-                # Update this record
-                self.inventory_repo.update(
-                    inv.record_id,
-                    {"units": inv.units - remaining_units}
-                )
-                remaining_units = 0
-        
         # Create transfer record
         transfer = self.transfer_repo.create({
             "source_hospital_id": source_hospital_id,
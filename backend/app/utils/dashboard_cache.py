@@ -0,0 +1,148 @@
+"""In-process cache of dashboard payloads with ETags."""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Callable, Hashable, Optional, Tuple
+from app.config import settings
+
+
+def make_etag(payload: Any) -> str:
+    """
+    Build a strong ETag from a JSON-serializable payload.
+    
+    Args:
+        payload: Response payload
+        
+    Returns:
+        Quoted ETag value
+    """
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode()
+    return f'"{hashlib.sha1(encoded).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag.
+    
+    Args:
+        if_none_match: Header value, possibly a comma-separated list or "*"
+        etag: Current ETag
+        
+    Returns:
+        True if the client's copy is current
+    """
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+class DashboardCache:
+    """
+    TTL cache of dashboard payloads, dropped whenever inventory changes.
+    
+    Entries are keyed by endpoint and scope (e.g. hospital ID). Every
+    inventory write in this process bumps the cache version and clears
+    the entries. Writes made by other worker processes are picked up when
+    the TTL expires. Entries also expire when the date changes, because
+    days to expiry depend on it. Expired entries are pruned on insert and
+    the least recently used entry is dropped beyond ``max_entries``.
+    """
+    
+    def __init__(self, ttl_seconds: Optional[float] = None, max_entries: Optional[int] = None):
+        """
+        Initialize an empty cache.
+        
+        Args:
+            ttl_seconds: Entry lifetime (uses config default if not provided);
+                0 disables caching
+            max_entries: Maximum number of entries kept (uses config default
+                if not provided)
+        """
+        self.ttl_seconds = settings.dashboard_cache_ttl_seconds if ttl_seconds is None else ttl_seconds
+        self.max_entries = settings.dashboard_cache_max_entries if max_entries is None else max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[int, date, float, Any, str]]" = OrderedDict()
+        self._version = 0
+        self._lock = threading.Lock()
+    
+    @property
+    def version(self) -> int:
+        """Number of invalidations so far."""
+        return self._version
+    
+    def __len__(self) -> int:
+        """Number of entries held, fresh or not."""
+        return len(self._entries)
+    
+    def _fresh(self, entry: Tuple[int, date, float, Any, str], now: float, today: date) -> bool:
+        """Check an entry is from the current version, today, and within the TTL."""
+        entry_version, entry_date, built_at, _, _ = entry
+        return entry_version == self._version and entry_date == today and now - built_at < self.ttl_seconds
+    
+    def get(self, key: Hashable, build: Callable[[], Any]) -> Tuple[Any, str]:
+        """
+        Get a cached payload, building it if missing or stale.
+        
+        A payload whose build overlapped an invalidation is returned but
+        not stored, so a write during the build is never masked.
+        
+        Args:
+            key: Endpoint and scope key
+            build: Callable computing the payload
+            
+        Returns:
+            Tuple of (payload, ETag)
+        """
+        now = time.monotonic()
+        today = date.today()
+        
+        with self._lock:
+            version = self._version
+            entry = self._entries.get(key)
+            if entry is not None and self._fresh(entry, now, today):
+                self._entries.move_to_end(key)
+                return entry[3], entry[4]
+        
+        payload = build()
+        etag = make_etag(payload)
+        
+        with self._lock:
+            if self._version == version and self.max_entries > 0:
+                self._entries[key] = (version, today, now, payload, etag)
+                self._entries.move_to_end(key)
+                self._prune(now, today)
+        
+        return payload, etag
+    
+    def _prune(self, now: float, today: date):
+        """
+        Drop expired entries, then the least recently used beyond the cap.
+        
+        Called with the lock held.
+        
+        Args:
+            now: Current monotonic time
+            today: Current date
+        """
+        for key in [key for key, entry in self._entries.items() if not self._fresh(entry, now, today)]:
+            del self._entries[key]
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def invalidate(self):
+        """Drop all entries."""
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+
+
+# Global cache instance, shared by the dashboard endpoints of this process
+dashboard_cache = DashboardCache()
+
+
+def invalidate_dashboard_cache():
+    """Drop cached dashboard payloads after an inventory change."""
+    dashboard_cache.invalidate()
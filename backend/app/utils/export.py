@@ -0,0 +1,65 @@
+"""Streaming export of row batches as NDJSON or CSV."""
+import csv
+import io
+import json
+from typing import Dict, Iterable, Iterator, List
+
+# Export formats accepted by the export endpoints
+EXPORT_FORMATS = ("ndjson", "csv")
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv"
+}
+
+
+def render_batches(batches: Iterable[List[Dict]], fields: List[str], fmt: str) -> Iterator[str]:
+    """
+    Render row batches as NDJSON lines or CSV, one chunk per batch.
+    
+    Only one batch is held at a time, so the response body can be streamed
+    with constant memory. Dates are written in ISO format.
+    
+    Args:
+        batches: Iterable of row dictionary lists
+        fields: Keys to write, in column order
+        fmt: "ndjson" or "csv"
+        
+    Returns:
+        Iterator of text chunks
+        
+    Raises:
+        ValueError: If the format is not recognized
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}. Must be one of: {', '.join(EXPORT_FORMATS)}")
+    
+    if fmt == "ndjson":
+        return _render_ndjson(batches, fields)
+    return _render_csv(batches, fields)
+
+
+def _render_ndjson(batches: Iterable[List[Dict]], fields: List[str]) -> Iterator[str]:
+    """Render each row as one JSON object per line."""
+    for batch in batches:
+        yield "".join(
+            json.dumps({field: row[field] for field in fields}, default=str) + "\n"
+            for row in batch
+        )
+
+
+def _render_csv(batches: Iterable[List[Dict]], fields: List[str]) -> Iterator[str]:
+    """Render a header line, then each batch as CSV rows."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields, extrasaction="ignore", lineterminator="\n")
+    writer.writeheader()
+    
+    for batch in batches:
+        writer.writerows(batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    
+    # Header only when there were no rows
+    if buffer.tell():
+        yield buffer.getvalue()
@@ -0,0 +1,210 @@
+"""Geospatial utilities for hospital distance lookups."""
+from __future__ import annotations
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+from app.config import settings
+from app.utils.lazy_import import lazy_module
+
+np = lazy_module("numpy")
+
+# Earth radius in kilometers
+EARTH_RADIUS_KM = 6371.0
+
+# Above this many hospitals, distance rows are computed on demand instead of
+# keeping the full H x H matrix in memory (2000^2 float64 = 32 MB)
+MAX_MATRIX_HOSPITALS = 2000
+
+
+def haversine_km(
+    lat1: np.ndarray,
+    lon1: np.ndarray,
+    lat2: np.ndarray,
+    lon2: np.ndarray
+) -> np.ndarray:
+    """
+    Vectorized haversine distance; inputs broadcast against each other.
+    
+    Args:
+        lat1, lon1: First point coordinates in degrees
+        lat2, lon2: Second point coordinates in degrees
+    
+    Returns:
+        Distances in kilometers
+    """
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+class HospitalDistanceIndex:
+    """
+    In-memory index of hospital coordinates for radius queries.
+    
+    Coordinates are loaded once into NumPy arrays. Small networks keep the
+    full pairwise distance matrix; larger ones compute one vectorized row
+    per query. Hospitals without coordinates are not indexed.
+    """
+    
+    def __init__(self, hospitals: List):
+        """
+        Build the index from hospital records.
+        
+        Args:
+            hospitals: Records with hospital_id, name, latitude and longitude
+        """
+        located = [h for h in hospitals if h.latitude and h.longitude]
+        
+        self.hospital_ids = [h.hospital_id for h in located]
+        self.names = [h.name for h in located]
+        self.latitudes = np.array([float(h.latitude) for h in located], dtype=np.float64)
+        self.longitudes = np.array([float(h.longitude) for h in located], dtype=np.float64)
+        self._positions = {hospital_id: i for i, hospital_id in enumerate(self.hospital_ids)}
+        self._matrix: Optional[np.ndarray] = None
+        
+        if len(located) <= MAX_MATRIX_HOSPITALS:
+            self._matrix = haversine_km(
+                self.latitudes[:, None],
+                self.longitudes[:, None],
+                self.latitudes[None, :],
+                self.longitudes[None, :]
+            )
+    
+    def __len__(self) -> int:
+        return len(self.hospital_ids)
+    
+    def __contains__(self, hospital_id: str) -> bool:
+        return hospital_id in self._positions
+    
+    def name_of(self, hospital_id: str) -> Optional[str]:
+        """Get the name of an indexed hospital."""
+        position = self._positions.get(hospital_id)
+        return None if position is None else self.names[position]
+    
+    def distances_from(self, hospital_id: str) -> Optional[np.ndarray]:
+        """
+        Get distances from one hospital to every indexed hospital.
+        
+        Args:
+            hospital_id: Source hospital ID
+        
+        Returns:
+            Distances in kilometers in index order, or None if not indexed
+        """
+        position = self._positions.get(hospital_id)
+        if position is None:
+            return None
+        
+        if self._matrix is not None:
+            return self._matrix[position]
+        
+        return haversine_km(
+            self.latitudes[position],
+            self.longitudes[position],
+            self.latitudes,
+            self.longitudes
+        )
+    
+    def distance_matrix(self, from_ids: List[str], to_ids: List[str]) -> np.ndarray:
+        """
+        Get pairwise distances between two sets of indexed hospitals.
+        
+        Args:
+            from_ids: Row hospital IDs
+            to_ids: Column hospital IDs
+        
+        Returns:
+            Distances in kilometers, shape (len(from_ids), len(to_ids))
+        """
+        rows = np.array([self._positions[h] for h in from_ids], dtype=np.int64)
+        cols = np.array([self._positions[h] for h in to_ids], dtype=np.int64)
+        
+        if self._matrix is not None:
+            return self._matrix[np.ix_(rows, cols)]
+        
+        return haversine_km(
+            self.latitudes[rows][:, None],
+            self.longitudes[rows][:, None],
+            self.latitudes[cols][None, :],
+            self.longitudes[cols][None, :]
+        )
+    
+    def within(self, hospital_id: str, radius_km: float) -> List[Dict]:
+        """
+        Find hospitals within radius of a hospital.
+        
+        Args:
+            hospital_id: Source hospital ID
+            radius_km: Search radius in kilometers
+        
+        Returns:
+            List of nearby hospitals with distances, nearest first
+        """
+        distances = self.distances_from(hospital_id)
+        if distances is None:
+            return []
+        
+        candidates = np.flatnonzero(distances <= radius_km)
+        candidates = candidates[candidates != self._positions[hospital_id]]
+        rounded = np.round(distances[candidates], 2)
+        order = np.argsort(rounded, kind="stable")
+        
+        return [
+            {
+                "hospital_id": self.hospital_ids[i],
+                "name": self.names[i],
+                "distance_km": float(rounded[j]),
+                "latitude": float(self.latitudes[i]),
+                "longitude": float(self.longitudes[i])
+            }
+            for i, j in zip(candidates[order].tolist(), order.tolist())
+        ]
+
+
+# Global index instance and its build time, rebuilt after hospitals change
+_hospital_index: Optional[HospitalDistanceIndex] = None
+_hospital_index_built_at = 0.0
+_hospital_index_lock = threading.Lock()
+
+
+def get_hospital_index(load_hospitals: Callable[[], List]) -> HospitalDistanceIndex:
+    """
+    Get or build the shared hospital distance index.
+    
+    Hospital writes in this process drop the index immediately. Writes made
+    by other worker processes are picked up when the TTL expires.
+    
+    Args:
+        load_hospitals: Callable returning all hospital records, used only
+            when the index has to be (re)built
+    
+    Returns:
+        Hospital distance index
+    """
+    global _hospital_index, _hospital_index_built_at
+    
+    def fresh() -> bool:
+        return (
+            _hospital_index is not None
+            and time.monotonic() - _hospital_index_built_at < settings.hospital_index_ttl_seconds
+        )
+    
+    index = _hospital_index
+    if not fresh():
+        with _hospital_index_lock:
+            if not fresh():
+                _hospital_index = HospitalDistanceIndex(load_hospitals())
+                _hospital_index_built_at = time.monotonic()
+            index = _hospital_index
+    return index
+
+
+def invalidate_hospital_index():
+    """Drop the shared index so the next lookup reloads hospitals."""
+    global _hospital_index
+    with _hospital_index_lock:
+        _hospital_index = None
@@ -0,0 +1,37 @@
+"""Deferred imports of heavy numerical libraries."""
+import importlib
+import sys
+from types import ModuleType
+
+
+class LazyModule(ModuleType):
+    """
+    Stand-in for a module that is only imported on first attribute access.
+    
+    API workers import every router at startup, but most requests never
+    touch numpy or pandas; binding them through a LazyModule keeps their
+    import (and memory) out of cold start. Modules using one should add
+    ``from __future__ import annotations`` so type hints do not trigger it.
+    """
+    
+    def __getattr__(self, attr: str):
+        module = importlib.import_module(self.__name__)
+        # Copy the real module's namespace so later lookups skip this hook
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+    
+    def __repr__(self) -> str:
+        return f"<lazy module '{self.__name__}'>"
+
+
+def lazy_module(name: str) -> ModuleType:
+    """
+    Get a module that is imported when first used.
+    
+    Args:
+        name: Absolute module name, e.g. "numpy"
+    
+    Returns:
+        The module itself if it is already imported, otherwise a LazyModule
+    """
+    return sys.modules.get(name) or LazyModule(name)
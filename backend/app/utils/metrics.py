@@ -0,0 +1,244 @@
+"""Per-route SQL statement counts and latency metrics."""
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.config import settings
+
+# Route label for requests that matched no route, so unknown paths cannot
+# blow up the number of series
+UNMATCHED_ROUTE = "<unmatched>"
+
+# Counters exported per (method, route)
+COUNTERS = {
+    "requests": ("sbb_http_requests_total", "Requests handled"),
+    "handler_seconds": ("sbb_http_handler_seconds_total", "Seconds spent handling requests"),
+    "statements": ("sbb_db_statements_total", "SQL statements executed"),
+    "db_seconds": ("sbb_db_seconds_total", "Seconds spent executing SQL statements"),
+    "rows": ("sbb_db_rows_total", "Rows returned or affected, as reported by the DB-API cursor")
+}
+
+
+class QueryStats:
+    """SQL statement counters of one request."""
+    
+    def __init__(self):
+        """Initialize empty counters."""
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.rows = 0
+    
+    def record(self, seconds: float, rowcount: int):
+        """
+        Record one executed statement.
+        
+        Args:
+            seconds: Execution time
+            rowcount: Cursor rowcount (negative when unknown)
+        """
+        self.statements += 1
+        self.db_seconds += seconds
+        if rowcount > 0:
+            self.rows += rowcount
+
+
+# Statistics of the request being handled; copied into the worker thread of
+# sync endpoints, so statements issued there are counted too
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_stats() -> Optional[QueryStats]:
+    """Statistics of the request being handled, if any."""
+    return _current_stats.get()
+
+
+class track_queries:
+    """
+    Context manager counting the statements issued inside it.
+    
+    Example:
+        with track_queries() as stats:
+            service.generate_recommendations()
+        print(stats.statements, stats.rows)
+    """
+    
+    def __enter__(self) -> QueryStats:
+        self.stats = QueryStats()
+        self._token = _current_stats.set(self.stats)
+        return self.stats
+    
+    def __exit__(self, *exc_info):
+        _current_stats.reset(self._token)
+
+
+# The start time lives on the statement's execution context, so a statement
+# that raises leaves nothing behind on the connection
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(time.perf_counter() - context._query_start, cursor.rowcount)
+
+
+def _handle_error(exception_context):
+    # after_cursor_execute never fires for a failed statement; count it here
+    context = exception_context.execution_context
+    start = getattr(context, "_query_start", None)
+    stats = _current_stats.get()
+    if start is not None and stats is not None:
+        stats.record(time.perf_counter() - start, 0)
+
+
+def instrument_engine(engine: Engine):
+    """
+    Count statements, time and rows of an engine into the current request.
+    
+    Statements that raise are counted too, with their time until the error.
+    
+    Args:
+        engine: SQLAlchemy engine to instrument
+    """
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+
+
+class RouteMetrics:
+    """Per-route counters exported in Prometheus text format."""
+    
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._counters: Dict[Tuple[str, str], Dict[str, float]] = {}
+        self._max_statements: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+    
+    def observe(self, method: str, route: str, handler_seconds: float, stats: QueryStats):
+        """
+        Add one handled request.
+        
+        Args:
+            method: HTTP method
+            route: Route path template
+            handler_seconds: Time until the response started
+            stats: SQL statistics of the request
+        """
+        key = (method, route)
+        with self._lock:
+            counters = self._counters.setdefault(key, dict.fromkeys(COUNTERS, 0))
+            counters["requests"] += 1
+            counters["handler_seconds"] += handler_seconds
+            counters["statements"] += stats.statements
+            counters["db_seconds"] += stats.db_seconds
+            counters["rows"] += stats.rows
+            self._max_statements[key] = max(self._max_statements.get(key, 0), stats.statements)
+    
+    def snapshot(self) -> Dict[Tuple[str, str], Dict[str, float]]:
+        """Copy of the counters per (method, route)."""
+        with self._lock:
+            return {
+                key: dict(counters, max_statements=self._max_statements[key])
+                for key, counters in self._counters.items()
+            }
+    
+    def render(self) -> str:
+        """
+        Render all counters in the Prometheus text exposition format.
+        
+        Returns:
+            Exposition text
+        """
+        snapshot = self.snapshot()
+        lines = []
+        metrics = dict(COUNTERS, max_statements=(
+            "sbb_db_statements_max",
+            "Most SQL statements executed by a single request"
+        ))
+        for field, (name, help_text) in metrics.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {'gauge' if field == 'max_statements' else 'counter'}")
+            for (method, route), counters in sorted(snapshot.items()):
+                labels = f'method="{method}",route="{_escape_label(route)}"'
+                lines.append(f"{name}{{{labels}}} {_format_value(counters[field])}")
+        return "\n".join(lines) + "\n"
+    
+    def reset(self):
+        """Drop all counters."""
+        with self._lock:
+            self._counters.clear()
+            self._max_statements.clear()
+
+
+def _escape_label(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value, keeping integers free of a decimal point."""
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def server_timing(handler_seconds: float, stats: QueryStats) -> str:
+    """
+    Build a Server-Timing header value.
+    
+    Args:
+        handler_seconds: Time until the response started
+        stats: SQL statistics of the request
+        
+    Returns:
+        Header value with db and app entries in milliseconds
+    """
+    return (
+        f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.statements} queries, {stats.rows} rows", '
+        f"app;dur={handler_seconds * 1000:.1f}"
+    )
+
+
+# Global registry shared by the middleware and the /metrics endpoint
+route_metrics = RouteMetrics()
+
+
+async def metrics_middleware(request, call_next):
+    """
+    Record statement count, DB time, rows and handler time per route.
+    
+    The route label is the matched path template (e.g.
+    ``/api/inventory/{record_id}``). Handler time ends when the response
+    starts, so the body of streaming responses is not included.
+    
+    Args:
+        request: Incoming request
+        call_next: Next ASGI handler
+        
+    Returns:
+        Response, with a Server-Timing header if enabled
+    """
+    if not settings.metrics_enabled:
+        return await call_next(request)
+    
+    start = time.perf_counter()
+    with track_queries() as stats:
+        response = await call_next(request)
+    handler_seconds = time.perf_counter() - start
+    
+    route = request.scope.get("route")
+    route_metrics.observe(
+        request.method,
+        getattr(route, "path", UNMATCHED_ROUTE),
+        handler_seconds,
+        stats
+    )
+    
+    if settings.server_timing_enabled:
+        response.headers["Server-Timing"] = server_timing(handler_seconds, stats)
+    
+    return response
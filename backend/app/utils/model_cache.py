@@ -0,0 +1,226 @@
+"""Disk cache of fitted forecast models with LRU eviction."""
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from app.config import settings
+
+# Bump to orphan every cached model when the serialized format changes
+MODEL_CACHE_VERSION = 1
+
+MODEL_SUFFIX = ".json"
+
+
+def config_hash(config: Dict[str, Any]) -> str:
+    """
+    Hash the settings a fitted model depends on.
+    
+    Args:
+        config: JSON-serializable model configuration
+    
+    Returns:
+        Hex digest identifying the configuration
+    """
+    encoded = json.dumps(
+        {"version": MODEL_CACHE_VERSION, **config}, sort_keys=True, default=str
+    ).encode()
+    return hashlib.sha1(encoded).hexdigest()
+
+
+class ModelCache:
+    """
+    Serialized fitted models on local disk, shared by all worker processes.
+    
+    Models of one series and configuration live in a directory of their
+    own, one file per training history, so the newest model of a series
+    can seed the next fit. Files are written atomically; reads bump the
+    file's mtime, and every ``evict_every``-th write of a process evicts
+    the least recently used files once the cache holds more than
+    ``max_entries`` files or ``max_bytes`` bytes. Eviction scans the whole
+    directory, so it is batched rather than run per write; between scans
+    the cache may overshoot its limits by up to ``evict_every`` files per
+    worker process.
+    """
+    
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        evict_every: Optional[int] = None
+    ):
+        """
+        Initialize cache.
+        
+        Args:
+            directory: Cache directory (uses config default if not provided);
+                created on first write
+            max_entries: Maximum number of cached models (uses config default if not provided)
+            max_bytes: Maximum total size of cached models (uses config default if not provided)
+            evict_every: Writes between evictions (uses config default if not provided)
+        """
+        self.directory = Path(directory or settings.forecast_model_cache_dir)
+        self.max_entries = settings.forecast_model_cache_max_entries if max_entries is None else max_entries
+        self.max_bytes = settings.forecast_model_cache_max_bytes if max_bytes is None else max_bytes
+        self.evict_every = max(1, settings.forecast_model_cache_evict_every if evict_every is None else evict_every)
+        self._writes = 0
+    
+    @staticmethod
+    def series_key(hospital_id: str, blood_group: str, component: str, config: Dict[str, Any]) -> str:
+        """
+        Build the key shared by every model of one series and configuration.
+        
+        Args:
+            hospital_id: Hospital ID
+            blood_group: Blood group
+            component: Component type
+            config: Model configuration
+        
+        Returns:
+            Series key
+        """
+        series = json.dumps([hospital_id, blood_group, component, config_hash(config)])
+        return hashlib.sha1(series.encode()).hexdigest()
+    
+    @staticmethod
+    def history_key(end_date: Any, digest: str) -> str:
+        """
+        Build the key of one training history within a series.
+        
+        Args:
+            end_date: Last day of the training history
+            digest: Fingerprint of the history values, so late usage
+                uploads for a day already covered refit the model
+        
+        Returns:
+            History key
+        """
+        return f"{end_date}-{digest[:16]}"
+    
+    def _path(self, series_key: str, history_key: str) -> Path:
+        return self.directory / series_key / f"{history_key}{MODEL_SUFFIX}"
+    
+    def get(self, series_key: str, history_key: str) -> Optional[str]:
+        """
+        Get a cached model and mark it as recently used.
+        
+        Args:
+            series_key: Key from ``series_key``
+            history_key: Key from ``history_key``
+        
+        Returns:
+            Serialized model, or None if not cached
+        """
+        path = self._path(series_key, history_key)
+        try:
+            payload = path.read_text(encoding="utf-8")
+            os.utime(path)
+        except OSError:
+            return None
+        return payload
+    
+    def latest(self, series_key: str) -> Optional[str]:
+        """
+        Get the most recently written model of a series, for warm starts.
+        
+        Args:
+            series_key: Key from ``series_key``
+        
+        Returns:
+            Serialized model, or None if the series has no cached model
+        """
+        # History keys start with the ISO end date, so they sort by date
+        try:
+            paths = sorted((self.directory / series_key).glob(f"*{MODEL_SUFFIX}"), reverse=True)
+        except OSError:
+            return None
+        
+        for path in paths:
+            try:
+                return path.read_text(encoding="utf-8")
+            except OSError:
+                continue
+        return None
+    
+    def put(self, series_key: str, history_key: str, payload: str):
+        """
+        Store a serialized model, evicting old entries every ``evict_every`` writes.
+        
+        Args:
+            series_key: Key from ``series_key``
+            history_key: Key from ``history_key``
+            payload: Serialized model
+        """
+        path = self._path(series_key, history_key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        
+        # Write to a temporary file and rename, so concurrent readers in
+        # other processes never see a partial model
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        
+        self._writes += 1
+        if self._writes % self.evict_every == 0:
+            self.evict()
+    
+    def entries(self) -> List[Tuple[float, int, Path]]:
+        """
+        List cached models.
+        
+        Returns:
+            (mtime, size, path) of every cached model, least recently used first
+        """
+        found = []
+        for path in self.directory.glob(f"*/*{MODEL_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            found.append((stat.st_mtime, stat.st_size, path))
+        found.sort()
+        return found
+    
+    def evict(self) -> int:
+        """
+        Remove least recently used models until the cache is within its limits.
+        
+        Other workers may evict concurrently; files they removed first are
+        skipped.
+        
+        Returns:
+            Number of models removed
+        """
+        entries = self.entries()
+        count = len(entries)
+        total_bytes = sum(size for _, size, _ in entries)
+        removed = 0
+        
+        for _, size, path in entries:
+            if count <= self.max_entries and total_bytes <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+                removed += 1
+            except FileNotFoundError:
+                pass
+            count -= 1
+            total_bytes -= size
+        
+        return removed
+    
+    def clear(self):
+        """Remove every cached model."""
+        for _, _, path in self.entries():
+            path.unlink(missing_ok=True)
+
+
+# Global cache instance; the directory is shared by every process on the host
+model_cache = ModelCache()
@@ -0,0 +1,118 @@
+"""Rolling-origin backtest of forecast backends over every hospital's usage."""
+import sys
+import argparse
+import csv
+from pathlib import Path
+from typing import Optional
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from datetime import date, timedelta
+import numpy as np
+from app.database import SessionLocal
+from app.repositories.hospital import HospitalRepository
+from app.schemas.enums import BloodGroup, Component
+from app.services.forecast import FORECAST_BACKENDS, ForecastService
+from app.services.forecast_backtest import BACKTEST_METRICS, Backtest
+
+COLUMNS = ("backend", "series", "folds", "horizon", "points", *BACKTEST_METRICS, "failed", "fit_seconds", "wall_seconds")
+
+
+def load_usage(hospital_id: Optional[str] = None):
+    """
+    Load the forecast history window of every series with usage.
+    
+    Returns:
+        Tuple of (usage matrix, date of its first column)
+    """
+    db = SessionLocal()
+    try:
+        hospitals = HospitalRepository(db).get_all()
+        series = [
+            (hospital.hospital_id, blood_group.value, component.value)
+            for hospital in hospitals
+            if hospital_id is None or hospital.hospital_id == hospital_id
+            for blood_group in BloodGroup
+            for component in Component
+        ]
+        history = ForecastService(db).load_history(series, hospital_id=hospital_id)
+    finally:
+        db.close()
+    
+    # Series that never had usage would only dilute the metrics
+    return history.units[history.units.sum(axis=1) > 0], history.start_date
+
+
+def generate_usage(count: int, days: int, seed: int = 42):
+    """Generate weekly-seasonal Poisson usage, a third of it sparse."""
+    rng = np.random.default_rng(seed)
+    weekly = 1 + rng.uniform(0, 0.5, size=(count, 7))[:, np.arange(days) % 7]
+    rates = rng.uniform(2, 15, size=(count, 1)) * weekly
+    sparse = rng.random(count) < 1 / 3
+    rates[sparse] *= 0.1
+    return rng.poisson(rates).astype(np.float64), date.today() - timedelta(days=days)
+
+
+def main():
+    """Main backtest function."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--backend", nargs="+", default=["statistical"], choices=FORECAST_BACKENDS)
+    parser.add_argument("--horizon", type=int, default=7)
+    parser.add_argument("--folds", type=int, default=8)
+    parser.add_argument("--step", type=int, default=7, help="Days between forecast origins")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default MAX_WORKERS)")
+    parser.add_argument("--series-per-task", type=int, default=None)
+    parser.add_argument("--hospital-id", default=None, help="Only backtest one hospital")
+    parser.add_argument(
+        "--synthetic",
+        type=int,
+        default=0,
+        help="Backtest this many generated series instead of the database"
+    )
+    parser.add_argument("--history-days", type=int, default=180, help="History of generated series")
+    parser.add_argument("--output", type=Path, default=None, help="Write the results table as CSV")
+    args = parser.parse_args()
+    
+    if args.synthetic:
+        units, start_date = generate_usage(args.synthetic, args.history_days)
+    else:
+        units, start_date = load_usage(args.hospital_id)
+    if len(units) == 0:
+        print("No series with usage to backtest")
+        return
+    
+    backtest = Backtest(
+        units,
+        start_date,
+        horizon=args.horizon,
+        folds=args.folds,
+        step=args.step,
+        max_workers=args.workers,
+        series_per_task=args.series_per_task
+    )
+    print(f"Backtesting {len(units)} series over {len(backtest.cutoffs)} folds of {args.horizon} days")
+    
+    rows = [backtest.run(backend) for backend in args.backend]
+    
+    print(
+        f"{'backend':>12} {'points':>8} {'MAE':>7} {'MAPE':>7} {'sMAPE':>7} "
+        f"{'coverage':>9} {'below':>6} {'above':>6} {'failed':>7} {'fit s':>8} {'wall s':>8}"
+    )
+    for row in rows:
+        print(
+            f"{row['backend']:>12} {row['points']:>8} {row['mae']:>7.3f} {row['mape']:>7.1f} {row['smape']:>7.1f} "
+            f"{row['coverage']:>9.3f} {row['below_lower']:>6.3f} {row['above_upper']:>6.3f} "
+            f"{row['failed']:>7} {row['fit_seconds']:>8.2f} {row['wall_seconds']:>8.2f}"
+        )
+    
+    if args.output:
+        with open(args.output, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
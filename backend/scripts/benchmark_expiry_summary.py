@@ -0,0 +1,141 @@
+"""Benchmark the ORM and single-query expiry summaries against PostgreSQL."""
+import sys
+import argparse
+import random
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from datetime import date, timedelta
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from app.config import settings
+from app.models.inventory import Inventory
+from app.repositories.inventory import InventoryRepository
+from app.schemas.inventory import InventoryCreate
+from app.schemas.enums import BloodGroup, Component
+
+BENCH_HOSPITAL_ID = "BENCH"
+
+
+def generate_records(rows: int, seed: int = 42):
+    """Generate synthetic inventory records expiring from 5 days ago to 40 days ahead."""
+    rng = random.Random(seed)
+    blood_groups = list(BloodGroup)
+    components = list(Component)
+    today = date.today()
+    
+    for i in range(rows):
+        expiry_date = today + timedelta(days=rng.randint(-5, 40))
+        yield InventoryCreate(
+            record_id=f"BENCH-{i:08d}",
+            hospital_id=BENCH_HOSPITAL_ID,
+            blood_group=rng.choice(blood_groups),
+            component=rng.choice(components),
+            units=rng.randint(1, 50),
+            unit_expiry_date=expiry_date,
+            collection_date=expiry_date - timedelta(days=35)
+        )
+
+
+def orm_summary(db, threshold_days: int):
+    """Previous get_expiry_summary: load every record, then bucket in Python."""
+    today = date.today()
+    records = db.query(Inventory).filter(Inventory.hospital_id == BENCH_HOSPITAL_ID).all()
+    high_risk = db.query(Inventory).filter(
+        Inventory.hospital_id == BENCH_HOSPITAL_ID,
+        Inventory.unit_expiry_date >= today,
+        Inventory.unit_expiry_date <= today + timedelta(days=threshold_days)
+    ).all()
+    
+    summary = {
+        "total_records": len(records),
+        "total_units": sum(record.units for record in records),
+        "high_risk_count": len(high_risk),
+        "high_risk_units": sum(record.units for record in high_risk),
+        "units_expiring_today": 0,
+        "units_expiring_tomorrow": 0,
+        "units_expiring_3_days": 0,
+        "units_expiring_7_days": 0
+    }
+    for record in records:
+        days_to_expiry = (record.unit_expiry_date - today).days
+        if days_to_expiry == 0:
+            summary["units_expiring_today"] += record.units
+        if days_to_expiry <= 1:
+            summary["units_expiring_tomorrow"] += record.units
+        if days_to_expiry <= 3:
+            summary["units_expiring_3_days"] += record.units
+        if days_to_expiry <= 7:
+            summary["units_expiring_7_days"] += record.units
+    return summary
+
+
+def aggregate_summary(db, threshold_days: int):
+    """Current get_expiry_summary: one SUM(CASE ...) statement."""
+    row = InventoryRepository(db).get_expiry_summary(threshold_days, BENCH_HOSPITAL_ID)
+    return {key: int(value) for key, value in row._mapping.items()}
+
+
+def reset(db):
+    """Remove benchmark rows and make sure the benchmark hospital exists."""
+    db.execute(text("DELETE FROM inventory WHERE hospital_id = :h"), {"h": BENCH_HOSPITAL_ID})
+    db.execute(
+        text(
+            "INSERT INTO hospitals (hospital_id, name) VALUES (:h, 'Benchmark Hospital') "
+            "ON CONFLICT (hospital_id) DO NOTHING"
+        ),
+        {"h": BENCH_HOSPITAL_ID}
+    )
+    db.commit()
+
+
+def timed(func):
+    """Run func() and return elapsed seconds and its result."""
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    """Main benchmark function."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database-url", default=settings.database_url)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--threshold-days", type=int, default=settings.expiry_risk_threshold_days)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    
+    engine = create_engine(args.database_url)
+    Session = sessionmaker(bind=engine)
+    db = Session()
+    
+    try:
+        reset(db)
+        elapsed, _ = timed(lambda: InventoryRepository(db).copy_many(generate_records(args.rows)))
+        db.execute(text("ANALYZE inventory"))
+        db.commit()
+        print(f"Loaded {args.rows} rows in {elapsed:.1f}s")
+        
+        print(f"{'path':>10} {'best s':>8} {'mean s':>8}")
+        results = {}
+        for path, summarize in (("orm", orm_summary), ("aggregate", aggregate_summary)):
+            timings = []
+            for _ in range(args.repeat):
+                # Drop identity-map state so each ORM run materializes fresh objects
+                db.expunge_all()
+                elapsed, results[path] = timed(lambda: summarize(db, args.threshold_days))
+                timings.append(elapsed)
+            print(f"{path:>10} {min(timings):>8.3f} {sum(timings) / len(timings):>8.3f}")
+        
+        print("Summaries match" if results["orm"] == results["aggregate"] else f"MISMATCH: {results}")
+        reset(db)
+    finally:
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Benchmark the statistical forecaster against Prophet on synthetic series."""
+import sys
+import argparse
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from datetime import date, timedelta
+import numpy as np
+from app.services.forecast import ForecastService
+
+
+def generate_series(count: int, days: int, sparse_share: float, seed: int = 42):
+    """
+    Generate daily usage counts for many series.
+    
+    Dense series are Poisson draws around a weekly pattern; sparse series
+    have a few units on a small share of days.
+    """
+    rng = np.random.default_rng(seed)
+    weekday = np.arange(days) % 7
+    
+    base = rng.uniform(2, 15, size=(count, 1))
+    weekly = 1 + rng.uniform(0, 0.5, size=(count, 7))[:, weekday]
+    dense = rng.poisson(base * weekly)
+    
+    demand = rng.random((count, days)) < rng.uniform(0.05, 0.3, size=(count, 1))
+    sparse = demand * rng.integers(1, 5, size=(count, days))
+    
+    is_sparse = rng.random(count) < sparse_share
+    units = np.where(is_sparse[:, None], sparse, dense).astype(np.float64)
+    series = [(f"H{i:05d}", "A+", "RBC") for i in range(count)]
+    return series, units, is_sparse
+
+
+def run(backend: str, series, units, start_date, days):
+    """Fit one backend and return (seconds, results)."""
+    service = ForecastService(None, backend=backend)
+    # Time real fits rather than models cached by an earlier run
+    service.model_cache = None
+    start = time.perf_counter()
+    results = service.forecast_many(series, units, start_date, days)
+    return time.perf_counter() - start, results
+
+
+def accuracy(results, mask):
+    """Mean holdout MAE and MAPE over the selected series."""
+    picked = [result["metrics"] for result, keep in zip(results, mask) if keep]
+    if not picked:
+        return float("nan"), float("nan")
+    return (
+        float(np.mean([m["mae"] for m in picked])),
+        float(np.mean([m["mape"] for m in picked]))
+    )
+
+
+def main():
+    """Main benchmark function."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--series", type=int, default=480)
+    parser.add_argument("--history-days", type=int, default=180)
+    parser.add_argument("--forecast-days", type=int, default=7)
+    parser.add_argument("--sparse-share", type=float, default=0.5)
+    parser.add_argument(
+        "--prophet-series",
+        type=int,
+        default=40,
+        help="Series also fitted with Prophet (0 to skip)"
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    
+    series, units, is_sparse = generate_series(args.series, args.history_days, args.sparse_share, args.seed)
+    start_date = date.today() - timedelta(days=args.history_days)
+    
+    runs = {"statistical": (series, units, is_sparse)}
+    if args.prophet_series > 0:
+        try:
+            import prophet  # noqa: F401
+        except ImportError:
+            print("prophet is not installed; skipping the Prophet comparison")
+        else:
+            n = min(args.prophet_series, args.series)
+            runs["prophet"] = (series[:n], units[:n], is_sparse[:n])
+            # Compare on the same subset
+            runs["statistical (subset)"] = (series[:n], units[:n], is_sparse[:n])
+    
+    print(
+        f"{'backend':>20} {'series':>7} {'seconds':>8} {'fits/s':>9} "
+        f"{'dense MAE':>10} {'dense MAPE':>11} {'sparse MAE':>11}"
+    )
+    for name, (keys, matrix, sparse) in runs.items():
+        backend = name.split(" ")[0]
+        elapsed, results = run(backend, keys, matrix, start_date, args.forecast_days)
+        dense_mae, dense_mape = accuracy(results, ~sparse)
+        sparse_mae, _ = accuracy(results, sparse)
+        print(
+            f"{name:>20} {len(keys):>7} {elapsed:>8.2f} {len(keys) / elapsed:>9.1f} "
+            f"{dense_mae:>10.2f} {dense_mape:>11.1f} {sparse_mae:>11.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Compare per-series and hierarchical forecasts on synthetic hospitals."""
+import sys
+import argparse
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from datetime import date, timedelta
+import numpy as np
+from app.schemas.enums import BloodGroup, Component
+from app.services.forecast import ForecastService
+from app.services.forecast_hierarchy import RECONCILIATION_METHODS
+
+# Approximate blood group distribution of Indian donors
+BLOOD_GROUP_SHARES = {
+    "O+": 0.35, "B+": 0.31, "A+": 0.21, "AB+": 0.07,
+    "O-": 0.02, "B-": 0.02, "A-": 0.015, "AB-": 0.005
+}
+
+COMPONENT_SHARES = {"RBC": 0.6, "Platelets": 0.25, "Plasma": 0.15}
+
+
+def generate_hospitals(count: int, days: int, seed: int = 42):
+    """
+    Generate daily usage for every blood group and component of many hospitals.
+    
+    Each hospital has a weekly demand pattern around its own level; the
+    level splits into components and blood groups by jittered shares and
+    the series are Poisson draws, so rare blood groups are sparse.
+    """
+    rng = np.random.default_rng(seed)
+    weekday = np.arange(days) % 7
+    blood_groups = [blood_group.value for blood_group in BloodGroup]
+    components = [component.value for component in Component]
+    
+    series, rates = [], []
+    for i in range(count):
+        level = rng.uniform(5, 60) * (1 + rng.uniform(0, 0.4, size=7)[weekday])
+        component_shares = rng.dirichlet([COMPONENT_SHARES[c] * 50 for c in components])
+        blood_group_shares = rng.dirichlet([BLOOD_GROUP_SHARES[b] * 200 for b in blood_groups])
+        for blood_group, blood_group_share in zip(blood_groups, blood_group_shares):
+            for component, component_share in zip(components, component_shares):
+                series.append((f"H{i:04d}", blood_group, component))
+                rates.append(level * component_share * blood_group_share)
+    
+    return series, rng.poisson(np.array(rates)).astype(np.float64)
+
+
+def errors(forecast: np.ndarray, actual: np.ndarray, hospital_rows: np.ndarray):
+    """Mean absolute error per series and of the hospital totals."""
+    series_mae = np.abs(forecast - actual).mean()
+    totals = np.zeros((hospital_rows.max() + 1, actual.shape[1]))
+    np.add.at(totals, hospital_rows, forecast - actual)
+    return float(series_mae), float(np.abs(totals).mean())
+
+
+def main():
+    """Main benchmark function."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hospitals", type=int, default=200)
+    parser.add_argument("--history-days", type=int, default=180)
+    parser.add_argument("--forecast-days", type=int, default=7)
+    parser.add_argument("--backend", default="statistical", choices=["statistical", "prophet"])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    
+    series, units = generate_hospitals(args.hospitals, args.history_days + args.forecast_days, args.seed)
+    history, actual = units[:, :args.history_days], units[:, args.history_days:]
+    start_date = date.today() - timedelta(days=args.history_days)
+    hospital_rows = np.unique([key[0] for key in series], return_inverse=True)[1]
+    service = ForecastService(None, backend=args.backend)
+    # Time real fits: approaches share the aggregated Prophet series
+    service.model_cache = None
+    
+    def predicted(results):
+        return np.array([[point["predicted"] for point in result["forecast"]] for result in results])
+    
+    print(f"{'approach':>12} {'fits/hosp':>10} {'seconds':>8} {'series MAE':>11} {'hospital MAE':>13}")
+    
+    start = time.perf_counter()
+    results = service.forecast_many(series, history, start_date, args.forecast_days)
+    elapsed = time.perf_counter() - start
+    series_mae, hospital_mae = errors(predicted(results), actual, hospital_rows)
+    fits = len(series) / args.hospitals
+    print(f"{'per-series':>12} {fits:>10.0f} {elapsed:>8.2f} {series_mae:>11.3f} {hospital_mae:>13.3f}")
+    
+    for method in RECONCILIATION_METHODS:
+        start = time.perf_counter()
+        results, fits = service.forecast_hierarchy(series, history, start_date, args.forecast_days, method=method)
+        elapsed = time.perf_counter() - start
+        series_mae, hospital_mae = errors(predicted(results), actual, hospital_rows)
+        print(f"{method:>12} {fits / args.hospitals:>10.0f} {elapsed:>8.2f} {series_mae:>11.3f} {hospital_mae:>13.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Measure API cold-start import time and fail if it exceeds a budget."""
+import sys
+import argparse
+import re
+import statistics
+import subprocess
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+# Libraries only loaded on first use; importing any at startup is a regression
+DEFERRED_MODULES = ("numpy", "pandas", "prophet", "scipy")
+
+# "import time: self [us] | cumulative | imported package"
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def import_once(module: str):
+    """
+    Import a module in a fresh interpreter with ``-X importtime``.
+    
+    Returns:
+        Tuple of (cumulative milliseconds of the module, names of every
+        imported module, (milliseconds, name) of the module's direct imports)
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{completed.stderr[-2000:]}")
+    
+    # Nested imports are listed before the module importing them, indented
+    # two more spaces per level
+    total, imported, children, pending = 0.0, set(), [], []
+    for line in completed.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if not match:
+            continue
+        milliseconds, depth, name = int(match.group(2)) / 1000, (len(match.group(3)) - 1) // 2, match.group(4)
+        imported.add(name)
+        if depth == 1:
+            pending.append((milliseconds, name))
+        elif depth == 0:
+            if name == module:
+                total, children = milliseconds, pending
+            pending = []
+    return total, imported, children
+
+
+def main():
+    """Main benchmark function."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--module", default="app.main", help="Module whose import is timed")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters; the median is compared")
+    parser.add_argument("--budget-ms", type=float, default=1500.0, help="Maximum median import time")
+    parser.add_argument("--top", type=int, default=10, help="Heaviest direct imports to list")
+    args = parser.parse_args()
+    
+    # Compile bytecode first, so every timed run is a warm-cache cold start
+    import_once(args.module)
+    runs = [import_once(args.module) for _ in range(args.runs)]
+    
+    totals = [total for total, _, _ in runs]
+    median = statistics.median(totals)
+    print(f"import {args.module}: median {median:.0f} ms over {args.runs} runs (min {min(totals):.0f} ms)")
+    
+    _, imported, children = runs[-1]
+    for milliseconds, name in sorted(children, reverse=True)[:args.top]:
+        print(f"  {milliseconds:>8.1f} ms  {name}")
+    
+    failures = []
+    loaded = [name for name in DEFERRED_MODULES if name in imported]
+    if loaded:
+        failures.append(f"deferred modules imported at startup: {', '.join(loaded)}")
+    if median > args.budget_ms:
+        failures.append(f"median import time {median:.0f} ms exceeds the {args.budget_ms:.0f} ms budget")
+    
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
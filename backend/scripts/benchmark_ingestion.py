@@ -0,0 +1,141 @@
+"""Benchmark columnar CSV ingestion against the row-by-row path."""
+import sys
+import argparse
+import random
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from datetime import date, timedelta
+from app.services.ingestion import IngestionResult, IngestionService
+from app.schemas.enums import Component
+
+
+BLOOD_GROUP_SPELLINGS = ["A+", "a-", "B +", "B Negative", "AB+", "ab positive", "O+", "O NEGATIVE"]
+
+
+def generate_csv(rows: int, error_rate: float, seed: int = 42) -> str:
+    """
+    Generate a synthetic inventory CSV.
+    
+    Args:
+        rows: Number of data rows
+        error_rate: Fraction of rows with an invalid value
+        seed: Random seed
+        
+    Returns:
+        CSV content as string
+    """
+    rng = random.Random(seed)
+    components = [c.value for c in Component]
+    today = date.today()
+    
+    lines = ["record_id,hospital_id,blood_group,component,units,unit_expiry_date,collection_date"]
+    for i in range(rows):
+        collection_date = today - timedelta(days=rng.randint(1, 30))
+        expiry_date = collection_date + timedelta(days=rng.randint(5, 60))
+        blood_group = rng.choice(BLOOD_GROUP_SPELLINGS)
+        units = str(rng.randint(1, 50))
+        
+        if rng.random() < error_rate:
+            kind = rng.randrange(3)
+            if kind == 0:
+                blood_group = "XYZ"
+            elif kind == 1:
+                units = "0"
+            else:
+                expiry_date = "not-a-date"
+        
+        lines.append(
+            f"R{i:08d},H{rng.randint(1, 300):03d},{blood_group},{rng.choice(components)},"
+            f"{units},{expiry_date},{collection_date}"
+        )
+    
+    return "\n".join(lines) + "\n"
+
+
+def parse_csv_rowwise(service: IngestionService, file_content: str) -> IngestionResult:
+    """
+    Parse and validate CSV file content one row at a time.
+    
+    Reference implementation for this benchmark and the parity tests;
+    ``IngestionService.parse_csv`` produces identical results much faster.
+    
+    Args:
+        service: Ingestion service whose row validator is used
+        file_content: CSV file content as string
+        
+    Returns:
+        IngestionResult with valid records and errors
+    """
+    result = IngestionResult()
+    
+    df, error_msg = service._read_csv(file_content)
+    if df is None:
+        result.add_error(0, "file", error_msg)
+        return result
+    
+    # Check for duplicates
+    duplicates = service.check_duplicates(df['record_id'].tolist())
+    for dup_id in duplicates:
+        result.add_duplicate(dup_id)
+    
+    # Process each row
+    for idx, row in df.iterrows():
+        row_num = idx + 2  # +2 because: 0-indexed + header row
+        record, error = service._validate_row(row_num, row, duplicates)
+        if error is not None:
+            result.add_error(*error)
+        else:
+            result.add_valid_record(record)
+    
+    return result
+
+
+def time_call(func, content: str):
+    """Run func(content) and return (seconds, result)."""
+    start = time.perf_counter()
+    result = func(content)
+    return time.perf_counter() - start, result
+
+
+def main():
+    """Main benchmark function."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--error-rate", type=float, default=0.01)
+    parser.add_argument(
+        "--rowwise-max-rows",
+        type=int,
+        default=None,
+        help="Skip the row-by-row path above this many rows"
+    )
+    args = parser.parse_args()
+    
+    service = IngestionService()
+    
+    print(f"{'rows':>10} {'rowwise (s)':>12} {'columnar (s)':>13} {'speedup':>8} {'valid':>10} {'errors':>8}")
+    for size in args.sizes:
+        content = generate_csv(size, args.error_rate)
+        columnar_time, columnar = time_call(service.parse_csv, content)
+        
+        if args.rowwise_max_rows is not None and size > args.rowwise_max_rows:
+            rowwise_cell, speedup_cell = "skipped", "-"
+        else:
+            rowwise_time, rowwise = time_call(lambda text: parse_csv_rowwise(service, text), content)
+            if rowwise.errors != columnar.errors or rowwise.success_count != columnar.success_count:
+                print(f"  Result mismatch at {size} rows")
+                sys.exit(1)
+            rowwise_cell = f"{rowwise_time:.2f}"
+            speedup_cell = f"{rowwise_time / columnar_time:.1f}x"
+        
+        print(
+            f"{size:>10} {rowwise_cell:>12} {columnar_time:>13.2f} {speedup_cell:>8} "
+            f"{columnar.success_count:>10} {columnar.error_count:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
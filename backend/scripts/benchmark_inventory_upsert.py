@@ -0,0 +1,127 @@
+"""Benchmark inventory bulk load modes against a local PostgreSQL database."""
+import sys
+import argparse
+import random
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from datetime import date, timedelta
+from sqlalchemy import create_engine, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import sessionmaker
+from app.config import settings
+from app.models.inventory import Inventory
+from app.repositories.inventory import InventoryRepository
+from app.schemas.inventory import InventoryCreate
+from app.schemas.enums import BloodGroup, Component
+
+BENCH_HOSPITAL_ID = "BENCH"
+
+
+def generate_records(rows: int, seed: int = 42):
+    """Generate synthetic inventory records for the benchmark hospital."""
+    rng = random.Random(seed)
+    blood_groups = list(BloodGroup)
+    components = list(Component)
+    today = date.today()
+    
+    records = []
+    for i in range(rows):
+        collection_date = today - timedelta(days=rng.randint(1, 30))
+        records.append(InventoryCreate(
+            record_id=f"BENCH-{i:08d}",
+            hospital_id=BENCH_HOSPITAL_ID,
+            blood_group=rng.choice(blood_groups),
+            component=rng.choice(components),
+            units=rng.randint(1, 50),
+            unit_expiry_date=collection_date + timedelta(days=rng.randint(5, 60)),
+            collection_date=collection_date
+        ))
+    return records
+
+
+def upsert_row_by_row(db, records):
+    """Previous create_many behaviour: one upsert statement per record."""
+    for inventory in records:
+        row = InventoryRepository._to_row(inventory)
+        stmt = insert(Inventory).values(**row).on_conflict_do_update(
+            index_elements=['record_id'],
+            set_={k: v for k, v in row.items() if k != 'record_id'}
+        )
+        db.execute(stmt)
+    db.commit()
+
+
+def reset(db):
+    """Remove benchmark rows and make sure the benchmark hospital exists."""
+    db.execute(text("DELETE FROM inventory WHERE hospital_id = :h"), {"h": BENCH_HOSPITAL_ID})
+    db.execute(
+        text(
+            "INSERT INTO hospitals (hospital_id, name) VALUES (:h, 'Benchmark Hospital') "
+            "ON CONFLICT (hospital_id) DO NOTHING"
+        ),
+        {"h": BENCH_HOSPITAL_ID}
+    )
+    db.commit()
+
+
+def timed(func):
+    """Run func() and return elapsed seconds and its result."""
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    """Main benchmark function."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database-url", default=settings.database_url)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--batch-size", type=int, default=settings.inventory_upsert_batch_size)
+    parser.add_argument(
+        "--row-by-row-max-rows",
+        type=int,
+        default=10_000,
+        help="Skip the one-statement-per-row baseline above this many rows"
+    )
+    args = parser.parse_args()
+    
+    engine = create_engine(args.database_url)
+    Session = sessionmaker(bind=engine)
+    db = Session()
+    
+    print(f"{'rows':>8} {'path':>12} {'seconds':>9} {'rows/s':>10} {'inserted':>9} {'updated':>8}")
+    try:
+        for size in args.sizes:
+            records = generate_records(size)
+            repository = InventoryRepository(db)
+            
+            if size <= args.row_by_row_max_rows:
+                reset(db)
+                elapsed, _ = timed(lambda: upsert_row_by_row(db, records))
+                print(f"{size:>8} {'row-by-row':>12} {elapsed:>9.2f} {size / elapsed:>10.0f} {'-':>9} {'-':>8}")
+            
+            loaders = {
+                "batch": lambda: repository.create_many(records, batch_size=args.batch_size),
+                "copy": lambda: repository.copy_many(records)
+            }
+            for mode, load in loaders.items():
+                reset(db)
+                # First pass inserts, second pass hits ON CONFLICT for every row
+                for label in ("insert", "update"):
+                    elapsed, counts = timed(load)
+                    print(
+                        f"{size:>8} {mode + '-' + label:>12} {elapsed:>9.2f} {size / elapsed:>10.0f} "
+                        f"{counts['inserted']:>9} {counts['updated']:>8}"
+                    )
+        reset(db)
+    finally:
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Benchmark greedy vs optimal transfer allocation on a synthetic network."""
+import sys
+import argparse
+import random
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from datetime import date, timedelta
+from app.services.transfer import TransferService
+from app.utils.geo import HospitalDistanceIndex
+from app.schemas.enums import BloodGroup, Component
+
+
+def generate_network(hospitals: int, seed: int = 42):
+    """Generate hospitals around Mumbai/Pune with random balances per product."""
+    rng = random.Random(seed)
+    today = date.today()
+    
+    records = [
+        SimpleNamespace(
+            hospital_id=f"H{i:05d}",
+            name=f"Hospital {i}",
+            latitude=rng.uniform(18.5, 19.8),
+            longitude=rng.uniform(72.6, 73.9)
+        )
+        for i in range(hospitals)
+    ]
+    
+    deficits, surpluses, earliest_lots = {}, {}, {}
+    for record in records:
+        for blood_group in BloodGroup:
+            for component in Component:
+                key = (record.hospital_id, blood_group.value, component.value)
+                balance = rng.gauss(0, 20)
+                if balance < -1:
+                    deficits[key] = -balance
+                elif balance > 1:
+                    surpluses[key] = balance
+                    earliest_lots[key] = SimpleNamespace(
+                        units=rng.randint(1, 40),
+                        unit_expiry_date=today + timedelta(days=rng.randint(1, 35))
+                    )
+    
+    return records, deficits, surpluses, earliest_lots
+
+
+def summarize(recommendations, deficits, surpluses):
+    """Units promised, units promised beyond source surplus and demand covered."""
+    promised, received = {}, {}
+    for r in recommendations:
+        source = (r["source_hospital_id"], r["blood_group"], r["component"])
+        destination = (r["destination_hospital_id"], r["blood_group"], r["component"])
+        promised[source] = promised.get(source, 0) + r["units"]
+        received[destination] = received.get(destination, 0) + r["units"]
+    
+    over_promised = sum(max(0, units - surpluses[key]) for key, units in promised.items())
+    covered = sum(min(units, deficits[key]) for key, units in received.items())
+    return sum(promised.values()), over_promised, covered
+
+
+def main():
+    """Main benchmark function."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hospitals", type=int, nargs="+", default=[100, 500])
+    parser.add_argument("--radius-km", type=float, default=50.0)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    
+    service = TransferService(None)
+    service.radius_km = args.radius_km
+    
+    print(
+        f"{'hospitals':>9} {'mode':>8} {'seconds':>8} {'recs':>7} "
+        f"{'promised':>9} {'over':>9} {'covered':>9} {'demand':>9}"
+    )
+    for size in args.hospitals:
+        records, deficits, surpluses, earliest_lots = generate_network(size, args.seed)
+        index = HospitalDistanceIndex(records)
+        demand = sum(deficits.values())
+        
+        runs = {
+            "greedy": lambda: service.match_greedy(
+                index, index.hospital_ids, deficits, surpluses, earliest_lots
+            ),
+            "optimal": lambda: service.allocate_optimal(index, deficits, surpluses, earliest_lots)
+        }
+        for mode, run in runs.items():
+            start = time.perf_counter()
+            recommendations = run()
+            elapsed = time.perf_counter() - start
+            promised, over, covered = summarize(recommendations, deficits, surpluses)
+            print(
+                f"{size:>9} {mode:>8} {elapsed:>8.2f} {len(recommendations):>7} "
+                f"{promised:>9.0f} {over:>9.0f} {covered:>9.0f} {demand:>9.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -5,3 +5,9 @@ from pathlib import Path
 # Add backend directory to Python path
 backend_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(backend_dir))
+
+# Checkouts without app.models get minimal mapped tables instead, so
+# repository and service tests run rather than skip
+from fallback_models import install as install_fallback_models  # noqa: E402
+
+install_fallback_models()
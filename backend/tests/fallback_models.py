@@ -0,0 +1,182 @@
+"""Minimal mapped tables for tests in checkouts without ``app.models``.
+
+The repositories and services import their ORM classes from ``app.models``.
+When that package is not importable, ``install`` registers these classes
+under its module names instead. They mirror the tables of migration 001,
+so repository and service tests run against real tables rather than being
+skipped.
+"""
+import importlib
+import sys
+import types
+from sqlalchemy import (
+    Boolean,
+    CheckConstraint,
+    Column,
+    Date,
+    ForeignKey,
+    Integer,
+    Numeric,
+    String,
+    Text,
+    TIMESTAMP,
+    func
+)
+from sqlalchemy.orm import declarative_base
+
+Base = declarative_base()
+
+
+class Hospital(Base):
+    __tablename__ = "hospitals"
+    
+    hospital_id = Column(String(50), primary_key=True)
+    name = Column(String(255), nullable=False)
+    address = Column(Text)
+    latitude = Column(Numeric(10, 8))
+    longitude = Column(Numeric(11, 8))
+    contact_name = Column(String(255))
+    contact_phone = Column(String(20))
+    contact_email = Column(String(255))
+    created_at = Column(TIMESTAMP, server_default=func.current_timestamp(), nullable=False)
+
+
+class Inventory(Base):
+    __tablename__ = "inventory"
+    __table_args__ = (CheckConstraint("units > 0", name="chk_units"),)
+    
+    record_id = Column(String(50), primary_key=True)
+    hospital_id = Column(String(50), ForeignKey("hospitals.hospital_id"), nullable=False)
+    blood_group = Column(String(5), nullable=False)
+    component = Column(String(20), nullable=False)
+    units = Column(Integer, nullable=False)
+    unit_expiry_date = Column(Date, nullable=False)
+    collection_date = Column(Date, nullable=False)
+    created_at = Column(TIMESTAMP, server_default=func.current_timestamp(), nullable=False)
+    updated_at = Column(TIMESTAMP, server_default=func.current_timestamp(), nullable=False)
+
+
+class Usage(Base):
+    __tablename__ = "usage"
+    
+    usage_id = Column(Integer, primary_key=True, autoincrement=True)
+    hospital_id = Column(String(50), ForeignKey("hospitals.hospital_id"), nullable=False)
+    blood_group = Column(String(5), nullable=False)
+    component = Column(String(20), nullable=False)
+    units_used = Column(Integer, nullable=False)
+    usage_date = Column(Date, nullable=False)
+    purpose = Column(String(50))
+    created_at = Column(TIMESTAMP, server_default=func.current_timestamp(), nullable=False)
+
+
+class Donor(Base):
+    __tablename__ = "donors"
+    
+    donor_id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(255), nullable=False)
+    phone = Column(String(20))
+    email = Column(String(255))
+    blood_group = Column(String(5), nullable=False)
+    last_donation_date = Column(Date)
+    eligible = Column(Boolean, server_default="1", nullable=False)
+    location_lat = Column(Numeric(10, 8))
+    location_lon = Column(Numeric(11, 8))
+    created_at = Column(TIMESTAMP, server_default=func.current_timestamp(), nullable=False)
+    updated_at = Column(TIMESTAMP, server_default=func.current_timestamp(), nullable=False)
+
+
+class Forecast(Base):
+    __tablename__ = "forecasts"
+    
+    forecast_id = Column(Integer, primary_key=True, autoincrement=True)
+    hospital_id = Column(String(50), ForeignKey("hospitals.hospital_id"), nullable=False)
+    blood_group = Column(String(5), nullable=False)
+    component = Column(String(20), nullable=False)
+    forecast_date = Column(Date, nullable=False)
+    predicted_units = Column(Numeric(10, 2), nullable=False)
+    lower_bound = Column(Numeric(10, 2))
+    upper_bound = Column(Numeric(10, 2))
+    generated_at = Column(TIMESTAMP, server_default=func.current_timestamp(), nullable=False)
+
+
+class User(Base):
+    __tablename__ = "users"
+    
+    user_id = Column(String(50), primary_key=True)
+    username = Column(String(100), unique=True, nullable=False)
+    password_hash = Column(String(255), nullable=False)
+    role = Column(String(20), nullable=False)
+    hospital_id = Column(String(50), ForeignKey("hospitals.hospital_id"))
+    created_at = Column(TIMESTAMP, server_default=func.current_timestamp(), nullable=False)
+
+
+class Transfer(Base):
+    __tablename__ = "transfers"
+    
+    transfer_id = Column(Integer, primary_key=True, autoincrement=True)
+    source_hospital_id = Column(String(50), ForeignKey("hospitals.hospital_id"), nullable=False)
+    destination_hospital_id = Column(String(50), ForeignKey("hospitals.hospital_id"), nullable=False)
+    blood_group = Column(String(5), nullable=False)
+    component = Column(String(20), nullable=False)
+    units = Column(Integer, nullable=False)
+    urgency_score = Column(Numeric(5, 3))
+    distance_km = Column(Numeric(6, 2))
+    eta_minutes = Column(Integer)
+    status = Column(String(20), server_default="pending", nullable=False)
+    approved_by = Column(String(50))
+    approved_at = Column(TIMESTAMP)
+    created_at = Column(TIMESTAMP, server_default=func.current_timestamp(), nullable=False)
+
+
+class Notification(Base):
+    __tablename__ = "notifications"
+    
+    notification_id = Column(Integer, primary_key=True, autoincrement=True)
+    donor_id = Column(Integer, ForeignKey("donors.donor_id"))
+    template_id = Column(String(50))
+    message = Column(Text, nullable=False)
+    status = Column(String(20), server_default="pending", nullable=False)
+    sent_at = Column(TIMESTAMP)
+    created_at = Column(TIMESTAMP, server_default=func.current_timestamp(), nullable=False)
+
+
+MODELS = {
+    "hospital": Hospital,
+    "inventory": Inventory,
+    "usage": Usage,
+    "donor": Donor,
+    "forecast": Forecast,
+    "user": User,
+    "transfer": Transfer,
+    "notification": Notification
+}
+
+
+def install():
+    """
+    Register these models as ``app.models`` if the real package is missing.
+    
+    Both the ``app.`` and ``backend.app.`` names are registered with the same
+    module objects, so services and tests share one set of mapped classes.
+    """
+    try:
+        importlib.import_module("app.models")
+        return
+    except ModuleNotFoundError as e:
+        # Only fall back when the package itself is absent, not when one of
+        # its own imports fails
+        if e.name != "app.models":
+            raise
+    
+    package = types.ModuleType("app.models")
+    package.__path__ = []
+    package.Base = Base
+    for name, model in MODELS.items():
+        module = types.ModuleType(f"app.models.{name}")
+        setattr(module, model.__name__, model)
+        setattr(package, model.__name__, model)
+        setattr(package, name, module)
+        for prefix in ("app.models", "backend.app.models"):
+            sys.modules[f"{prefix}.{name}"] = module
+    sys.modules["app.models"] = package
+    sys.modules["backend.app.models"] = package
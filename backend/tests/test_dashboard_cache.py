@@ -0,0 +1,131 @@
+"""Tests for the dashboard snapshot cache."""
+from backend.app.utils import dashboard_cache as cache_module
+from backend.app.utils.dashboard_cache import DashboardCache, etag_matches, make_etag
+
+
+class Builder:
+    """Payload builder counting its calls."""
+    
+    def __init__(self, payload):
+        self.payload = payload
+        self.calls = 0
+    
+    def __call__(self):
+        self.calls += 1
+        return self.payload
+
+
+class TestDashboardCache:
+    """Tests for TTL, invalidation and ETags."""
+    
+    def test_hit_until_invalidated(self):
+        """Test payloads are built once and rebuilt after invalidation."""
+        cache = DashboardCache(ttl_seconds=60)
+        build = Builder({"total_units": 10})
+        
+        first = cache.get(("summary", None), build)
+        second = cache.get(("summary", None), build)
+        cache.invalidate()
+        third = cache.get(("summary", None), build)
+        
+        assert build.calls == 2
+        assert first == second == third
+        assert cache.version == 1
+    
+    def test_keys_are_scoped(self):
+        """Test each endpoint and hospital scope has its own entry."""
+        cache = DashboardCache(ttl_seconds=60)
+        build = Builder({"total_units": 10})
+        
+        cache.get(("summary", None), build)
+        cache.get(("summary", "H001"), build)
+        cache.get(("summary", "H001"), build)
+        
+        assert build.calls == 2
+    
+    def test_zero_ttl_disables_cache(self):
+        """Test a zero TTL rebuilds on every read."""
+        cache = DashboardCache(ttl_seconds=0)
+        build = Builder([])
+        
+        cache.get("key", build)
+        cache.get("key", build)
+        
+        assert build.calls == 2
+    
+    def test_ttl_expiry(self, monkeypatch):
+        """Test entries older than the TTL are rebuilt."""
+        clock = [100.0]
+        monkeypatch.setattr(cache_module.time, "monotonic", lambda: clock[0])
+        cache = DashboardCache(ttl_seconds=5)
+        build = Builder([])
+        
+        cache.get("key", build)
+        clock[0] += 4
+        cache.get("key", build)
+        clock[0] += 2
+        cache.get("key", build)
+        
+        assert build.calls == 2
+    
+    def test_build_overlapping_invalidation_is_not_stored(self):
+        """Test a payload built across an inventory write is not cached."""
+        cache = DashboardCache(ttl_seconds=60)
+        calls = []
+        
+        def build():
+            calls.append(1)
+            if len(calls) == 1:
+                cache.invalidate()
+            return {"calls": len(calls)}
+        
+        cache.get("key", build)
+        payload, _ = cache.get("key", build)
+        
+        assert payload == {"calls": 2}
+    
+    def test_expired_entries_are_pruned_on_insert(self, monkeypatch):
+        """Test stale entries for other keys are dropped when a new one is stored."""
+        clock = [100.0]
+        monkeypatch.setattr(cache_module.time, "monotonic", lambda: clock[0])
+        cache = DashboardCache(ttl_seconds=5, max_entries=100)
+        build = Builder([])
+        
+        for hospital_id in range(10):
+            cache.get(("summary", hospital_id), build)
+        clock[0] += 6
+        cache.get(("summary", "H001"), build)
+        
+        assert len(cache) == 1
+    
+    def test_entries_are_capped_least_recently_used_first(self):
+        """Test the cache never holds more than max_entries and keeps hot keys."""
+        cache = DashboardCache(ttl_seconds=60, max_entries=3)
+        build = Builder([])
+        
+        for key in ("a", "b", "c"):
+            cache.get(key, build)
+        cache.get("a", build)
+        cache.get("d", build)
+        cache.get("a", build)
+        cache.get("b", build)
+        
+        assert len(cache) == 3
+        # a hit twice, b rebuilt after being evicted as least recently used
+        assert build.calls == 5
+    
+    def test_etag_tracks_content(self):
+        """Test equal payloads share an ETag and different ones do not."""
+        assert make_etag({"a": 1, "b": 2}) == make_etag({"b": 2, "a": 1})
+        assert make_etag({"a": 1}) != make_etag({"a": 2})
+    
+    def test_etag_matching(self):
+        """Test If-None-Match lists, weak tags and wildcards."""
+        etag = make_etag({"a": 1})
+        
+        assert etag_matches(etag, etag)
+        assert etag_matches(f'"other", {etag}', etag)
+        assert etag_matches(f"W/{etag}", etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches('"other"', etag)
+        assert not etag_matches(None, etag)
@@ -0,0 +1,131 @@
+"""Tests for expiry risk scoring and its JSON serialization."""
+import json
+import math
+from datetime import date, timedelta
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from backend.app import models
+from backend.app.api import dashboard, export
+from backend.app.services.expiry import ExpiryService
+
+TODAY = date.today()
+
+
+def reject_constant(name):
+    """Fail on the non-standard NaN/Infinity literals Python's json accepts."""
+    raise ValueError(f"Invalid JSON constant: {name}")
+
+
+@pytest.fixture
+def session_factory():
+    """Session factory of an in-memory database with one lot per expiry offset."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    models.Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    
+    db = factory()
+    db.add(models.Hospital(hospital_id="H1", name="Hospital 1"))
+    for offset in (-3, -1, 0, 4):
+        db.add(models.Inventory(
+            record_id=f"R{offset}",
+            hospital_id="H1",
+            blood_group="O+",
+            component="RBC",
+            units=10,
+            unit_expiry_date=TODAY + timedelta(days=offset),
+            collection_date=TODAY - timedelta(days=30)
+        ))
+    db.commit()
+    db.close()
+    
+    yield factory
+    engine.dispose()
+
+
+@pytest.fixture
+def client(session_factory, monkeypatch):
+    """Test client for the dashboard and export routers on the test database."""
+    app = FastAPI()
+    app.include_router(dashboard.router, prefix="/api/dashboard")
+    app.include_router(export.router, prefix="/api/export")
+    
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+    
+    # The routers resolve get_db through the app package, not backend.app
+    app.dependency_overrides[dashboard.get_db] = override_get_db
+    # Exports open their own session while streaming
+    monkeypatch.setattr(export, "SessionLocal", session_factory)
+    # Clear the cache instance the router uses
+    dashboard.dashboard_cache.invalidate()
+    yield TestClient(app)
+    dashboard.dashboard_cache.invalidate()
+
+
+class TestCalculateRiskScores:
+    """Tests for vectorized risk scoring."""
+    
+    def test_expired_units_score_like_units_expiring_today(self):
+        """Test the denominator is clamped so expired units stay finite."""
+        expiry_dates = [TODAY + timedelta(days=offset) for offset in (-3, -1, 0, 4)]
+        scores = ExpiryService(None).calculate_risk_scores(expiry_dates, [10, 10, 10, 10], today=TODAY)
+        
+        assert scores["days_to_expiry"].tolist() == [-3, -1, 0, 4]
+        assert scores["risk_score"].tolist() == [10.0, 10.0, 10.0, 2.0]
+
+
+class TestDashboardSummary:
+    """Tests for the hospital filter of the dashboard summary."""
+    
+    def test_known_hospital(self, client):
+        """Test a known hospital's summary is served and cached."""
+        response = client.get("/api/dashboard/summary", params={"hospital_id": " H1 "})
+        
+        assert response.status_code == 200
+        assert len(dashboard.dashboard_cache) == 1
+    
+    def test_unknown_hospital_is_rejected_uncached(self, client):
+        """Test arbitrary hospital IDs get a 404 and no cache entry."""
+        for i in range(5):
+            response = client.get("/api/dashboard/summary", params={"hospital_id": f"NOPE{i}"})
+            assert response.status_code == 404
+        
+        assert len(dashboard.dashboard_cache) == 0
+
+
+class TestRiskSerialization:
+    """Tests for serializing lots past expiry through the API."""
+    
+    def test_dashboard_inventory_with_risk(self, client):
+        """Test a lot one day past expiry serializes with a finite score."""
+        response = client.get("/api/dashboard/inventory-with-risk")
+        
+        assert response.status_code == 200
+        rows = {row["record_id"]: row for row in json.loads(response.text, parse_constant=reject_constant)["data"]}
+        assert rows["R-1"]["days_to_expiry"] == -1
+        assert rows["R-1"]["expiry_risk_score"] == 10.0
+        assert all(math.isfinite(row["expiry_risk_score"]) for row in rows.values())
+    
+    def test_ndjson_export(self, client):
+        """Test the NDJSON export writes only valid JSON numbers."""
+        response = client.get("/api/export/inventory-with-risk", params={"format": "ndjson"})
+        
+        assert response.status_code == 200
+        rows = {
+            row["record_id"]: row
+            for row in (json.loads(line, parse_constant=reject_constant) for line in response.text.splitlines())
+        }
+        assert rows["R-1"]["expiry_risk_score"] == 10.0
+        assert all(math.isfinite(row["expiry_risk_score"]) for row in rows.values())
@@ -0,0 +1,138 @@
+"""Tests for streaming NDJSON/CSV exports."""
+import json
+from datetime import date
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+from backend.app import models
+from backend.app.api import export
+from backend.app.utils.export import render_batches
+
+FIELDS = ["record_id", "units", "unit_expiry_date"]
+
+BATCHES = [
+    [
+        {"record_id": "R1", "units": 2, "unit_expiry_date": date(2026, 1, 2), "extra": 1},
+        {"record_id": "R2", "units": 5, "unit_expiry_date": date(2026, 1, 3), "extra": 1}
+    ],
+    [
+        {"record_id": "R3", "units": 1, "unit_expiry_date": date(2026, 1, 4), "extra": 1}
+    ]
+]
+
+
+class TestRenderBatches:
+    """Tests for rendering row batches chunk by chunk."""
+    
+    def test_ndjson_one_chunk_per_batch(self):
+        """Test NDJSON yields one chunk per batch with one object per line."""
+        chunks = list(render_batches(iter(BATCHES), FIELDS, "ndjson"))
+        
+        assert len(chunks) == 2
+        rows = [json.loads(line) for line in "".join(chunks).splitlines()]
+        assert rows[0] == {"record_id": "R1", "units": 2, "unit_expiry_date": "2026-01-02"}
+        assert [row["record_id"] for row in rows] == ["R1", "R2", "R3"]
+    
+    def test_csv_header_then_rows(self):
+        """Test CSV starts with the header and writes only the requested fields."""
+        chunks = list(render_batches(iter(BATCHES), FIELDS, "csv"))
+        
+        assert len(chunks) == 2
+        assert "".join(chunks).splitlines() == [
+            "record_id,units,unit_expiry_date",
+            "R1,2,2026-01-02",
+            "R2,5,2026-01-03",
+            "R3,1,2026-01-04"
+        ]
+    
+    def test_empty_export(self):
+        """Test an empty CSV export still has a header and NDJSON is empty."""
+        assert "".join(render_batches(iter([]), FIELDS, "csv")) == "record_id,units,unit_expiry_date\n"
+        assert "".join(render_batches(iter([]), FIELDS, "ndjson")) == ""
+    
+    def test_batches_are_consumed_lazily(self):
+        """Test a batch is not read before the previous chunk is taken."""
+        consumed = []
+        
+        def batches():
+            for batch in BATCHES:
+                consumed.append(len(batch))
+                yield batch
+        
+        chunks = render_batches(batches(), FIELDS, "ndjson")
+        next(chunks)
+        
+        assert consumed == [2]
+    
+    def test_unknown_format(self):
+        """Test an unknown format is rejected."""
+        with pytest.raises(ValueError, match="Unknown export format"):
+            render_batches(iter(BATCHES), FIELDS, "xml")
+
+
+class TestExportEndpoints:
+    """Tests for the database session used by streaming exports."""
+    
+    @pytest.fixture
+    def sessions(self, monkeypatch):
+        """Sessions opened by the export router, on an in-memory database."""
+        engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool
+        )
+        models.Base.metadata.create_all(engine)
+        db = Session(engine)
+        db.add(models.Hospital(hospital_id="H1", name="Hospital 1"))
+        for day in (1, 2, 3):
+            db.add(models.Usage(
+                hospital_id="H1",
+                blood_group="O+",
+                component="RBC",
+                units_used=day,
+                usage_date=date(2026, 1, day)
+            ))
+        db.commit()
+        db.close()
+        
+        opened = []
+        
+        class TrackedSession(Session):
+            def close(self):
+                self.was_closed = True
+                super().close()
+        
+        factory = sessionmaker(bind=engine, class_=TrackedSession)
+        
+        def open_session():
+            session = factory()
+            opened.append(session)
+            return session
+        
+        monkeypatch.setattr(export, "SessionLocal", open_session)
+        yield opened
+        engine.dispose()
+    
+    def test_stream_owns_its_session(self, sessions):
+        """Test the export reads on its own session and closes it when done."""
+        app = FastAPI()
+        app.include_router(export.router, prefix="/api/export")
+        
+        response = TestClient(app).get("/api/export/usage", params={"format": "csv"})
+        
+        assert response.status_code == 200
+        assert len(response.text.splitlines()) == 4
+        assert len(sessions) == 1
+        assert getattr(sessions[0], "was_closed", False)
+    
+    def test_session_closed_when_stream_abandoned(self, sessions):
+        """Test a stream dropped after its first batch still closes its session."""
+        batches = export.stream_batches(lambda db: iter([[{"n": 1}], [{"n": 2}]]))
+        
+        assert next(batches) == [{"n": 1}]
+        batches.close()
+        
+        assert getattr(sessions[0], "was_closed", False)
@@ -0,0 +1,64 @@
+"""Tests for rolling-origin forecast backtests."""
+from datetime import date
+import numpy as np
+import pytest
+from backend.app.services.forecast_backtest import Backtest, rolling_cutoffs, score
+
+
+class TestRollingCutoffs:
+    """Tests for choosing forecast origins."""
+    
+    def test_last_fold_ends_with_history(self):
+        """Test origins step back from the end and drop too-short windows."""
+        assert rolling_cutoffs(120, horizon=7, folds=4, step=7).tolist() == [92, 99, 106, 113]
+        assert rolling_cutoffs(80, horizon=7, folds=8, step=7, min_train_days=56).tolist() == [59, 66, 73]
+    
+    def test_short_history_raises(self):
+        """Test a history without room for one fold is rejected."""
+        with pytest.raises(ValueError, match="too short"):
+            rolling_cutoffs(60, horizon=7, folds=4, step=7)
+
+
+class TestScore:
+    """Tests for vectorized accuracy and coverage metrics."""
+    
+    def test_metrics(self):
+        """Test MAE, MAPE, sMAPE and bound coverage over scored points."""
+        actual = np.array([[4.0, 0.0, 2.0, 5.0]])
+        predicted = np.array([[2.0, 0.0, 2.0, np.nan]])
+        
+        metrics = score(actual, predicted, predicted - 1, predicted + 1)
+        
+        assert metrics["points"] == 3
+        assert metrics["mae"] == pytest.approx(2 / 3)
+        # Zero actuals are skipped by MAPE and exact in sMAPE
+        assert metrics["mape"] == pytest.approx(25.0)
+        assert metrics["smape"] == pytest.approx(200 * (2 / 6) / 3)
+        assert metrics["coverage"] == pytest.approx(2 / 3)
+        assert metrics["above_upper"] == pytest.approx(1 / 3)
+        assert metrics["below_lower"] == 0.0
+    
+    def test_nothing_scored(self):
+        """Test an all-missing forecast scores NaN rather than raising."""
+        metrics = score(np.ones(3), np.full(3, np.nan), np.full(3, np.nan), np.full(3, np.nan))
+        
+        assert metrics["points"] == 0
+        assert np.isnan(metrics["mae"])
+
+
+class TestBacktest:
+    """Tests for running a backend over every fold."""
+    
+    def test_statistical_backtest(self):
+        """Test every series and fold is forecast, and blocks do not change results."""
+        rng = np.random.default_rng(0)
+        units = rng.poisson(np.tile([2.0, 8.0, 8.0, 8.0, 8.0, 8.0, 2.0], 20), size=(5, 140)).astype(np.float64)
+        
+        whole = Backtest(units, date(2026, 1, 1), folds=3, max_workers=1).run("statistical")
+        blocks = Backtest(units, date(2026, 1, 1), folds=3, max_workers=1, series_per_task=2).run("statistical")
+        
+        assert (whole["series"], whole["folds"], whole["points"]) == (5, 3, 5 * 3 * 7)
+        assert whole["failed"] == 0
+        assert whole["mae"] < 3.0
+        assert whole["coverage"] > 0.8
+        assert blocks["mae"] == pytest.approx(whole["mae"])
@@ -0,0 +1,87 @@
+"""Tests for hierarchical forecast reconciliation."""
+import numpy as np
+import pytest
+from backend.app.services.forecast_hierarchy import Hierarchy, TOTAL
+
+SERIES = [
+    ("H001", "A+", "RBC"),
+    ("H001", "O+", "RBC"),
+    ("H001", "A+", "Plasma"),
+    ("H001", "O+", "Plasma"),
+    ("H002", "A+", "RBC"),
+    ("H002", "O+", "RBC"),
+    ("H002", "A+", "Plasma"),
+    ("H002", "O+", "Plasma")
+]
+
+UNITS = np.array([
+    [1.0, 1.0],
+    [3.0, 3.0],
+    [2.0, 2.0],
+    [2.0, 2.0],
+    [0.0, 0.0],
+    [0.0, 0.0],
+    [5.0, 5.0],
+    [0.0, 5.0]
+])
+
+
+def forecasts(values, days=3):
+    """Constant forecast rows with bounds one unit away."""
+    predicted = np.repeat(np.asarray(values, dtype=np.float64)[:, None], days, axis=1)
+    return predicted, predicted - 1, predicted + 1
+
+
+class TestHierarchy:
+    """Tests for aggregation, shares and reconciliation methods."""
+    
+    def test_aggregates_and_shares(self):
+        """Test totals per level and blood group shares within components."""
+        hierarchy = Hierarchy(SERIES, UNITS)
+        
+        keys, units = hierarchy.aggregates("mint")
+        
+        assert keys == [
+            ("H001", TOTAL, TOTAL), ("H002", TOTAL, TOTAL),
+            ("H001", TOTAL, "Plasma"), ("H001", TOTAL, "RBC"),
+            ("H002", TOTAL, "Plasma"), ("H002", TOTAL, "RBC")
+        ]
+        assert units[:, 0].tolist() == [8.0, 5.0, 4.0, 4.0, 5.0, 0.0]
+        assert hierarchy.blood_group_share.tolist() == pytest.approx([0.25, 0.75, 0.5, 0.5, 0.5, 0.5, 2 / 3, 1 / 3])
+        assert len(hierarchy.aggregates("bottom_up")[0]) == 4
+        assert len(hierarchy.aggregates("top_down")[0]) == 2
+    
+    def test_unknown_method_raises(self):
+        """Test an unknown reconciliation method is rejected."""
+        with pytest.raises(ValueError, match="Unknown reconciliation method"):
+            Hierarchy(SERIES, UNITS).aggregates("middle_out")
+    
+    def test_bottom_up_splits_components(self):
+        """Test component forecasts are split by blood group share."""
+        hierarchy = Hierarchy(SERIES, UNITS)
+        
+        result = hierarchy.reconcile("bottom_up", *forecasts([4.0, 4.0, 6.0, 0.0]), mae=np.ones(4))
+        
+        assert result["predicted"][:, 0].tolist() == [1.0, 3.0, 2.0, 2.0, 0.0, 0.0, 4.0, 2.0]
+        assert result["upper"][1, 0] == pytest.approx(5.0 * 0.75)
+    
+    def test_top_down_splits_hospital_total(self):
+        """Test the hospital total is split by component, then blood group share."""
+        hierarchy = Hierarchy(SERIES, UNITS)
+        
+        result = hierarchy.reconcile("top_down", *forecasts([16.0, 10.0]), mae=np.ones(2))
+        
+        assert result["predicted"][:, 0].tolist() == pytest.approx([2.0, 6.0, 4.0, 4.0, 0.0, 0.0, 20 / 3, 10 / 3])
+    
+    def test_mint_makes_levels_coherent(self):
+        """Test MinT moves components toward the better-fitted hospital total."""
+        hierarchy = Hierarchy(SERIES[:4], UNITS[:4])
+        predicted, lower, upper = forecasts([10.0, 3.0, 3.0])
+        
+        equal = hierarchy.reconcile("mint", predicted, lower, upper, mae=np.ones(3))
+        trusted_total = hierarchy.reconcile("mint", predicted, lower, upper, mae=np.array([1e-4, 1.0, 1.0]))
+        
+        # Equal weights: the 4-unit gap is shared by all three nodes
+        assert equal["predicted"][:, 0].sum() == pytest.approx(26 / 3)
+        assert trusted_total["predicted"][:, 0].sum() == pytest.approx(10.0, abs=1e-3)
+        assert (equal["upper"] - equal["predicted"])[:, 0] == pytest.approx(hierarchy.blood_group_share)
@@ -0,0 +1,51 @@
+"""Tests for the dense forecast history matrix."""
+from datetime import date, timedelta
+from backend.app.services.forecast_history import HistoryMatrix
+
+
+START = date(2024, 1, 1)
+END = START + timedelta(days=9)
+SERIES = [("H001", "A+", "RBC"), ("H001", "O-", "Plasma"), ("H002", "A+", "RBC")]
+
+
+class TestHistoryMatrix:
+    """Tests for pivoting aggregated usage rows."""
+    
+    def test_rows_pivot_with_zero_fill(self):
+        """Test rows land in their series/day cell and gaps are zero."""
+        rows = [
+            ("H001", "A+", "RBC", START, 3),
+            ("H001", "A+", "RBC", START + timedelta(days=4), 5),
+            ("H002", "A+", "RBC", END, 2),
+        ]
+        
+        matrix = HistoryMatrix.from_rows(rows, SERIES, START, END)
+        
+        assert matrix.units.shape == (3, 10)
+        assert matrix.row(("H001", "A+", "RBC")).tolist() == [3, 0, 0, 0, 5, 0, 0, 0, 0, 0]
+        assert matrix.row(("H001", "O-", "Plasma")).sum() == 0
+        assert matrix.row(("H002", "A+", "RBC"))[-1] == 2
+    
+    def test_unknown_series_and_out_of_window_rows_ignored(self):
+        """Test rows outside the requested series or window are dropped."""
+        rows = [
+            ("H003", "A+", "RBC", START, 7),
+            ("H001", "A+", "RBC", START - timedelta(days=1), 7),
+            ("H001", "A+", "RBC", END + timedelta(days=1), 7),
+        ]
+        
+        matrix = HistoryMatrix.from_rows(rows, SERIES, START, END)
+        
+        assert matrix.units.sum() == 0
+        assert ("H003", "A+", "RBC") not in matrix
+        assert matrix.row(("H003", "A+", "RBC")) is None
+    
+    def test_row_is_a_view(self):
+        """Test series rows share memory with the matrix."""
+        matrix = HistoryMatrix.from_rows([], SERIES, START, END)
+        
+        row = matrix.row(("H001", "O-", "Plasma"))
+        row[0] = 1
+        
+        assert matrix.units[1, 0] == 1
+        assert len(matrix) == 3
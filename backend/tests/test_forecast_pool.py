@@ -0,0 +1,117 @@
+"""Tests for the forecast process pool."""
+import numpy as np
+from datetime import date
+from backend.app.services.forecast_pool import ForecastPool, ForecastJobSummary
+
+
+def fake_fit(task):
+    """Picklable stand-in for run_forecast_task."""
+    outcome = {
+        "hospital_id": task["hospital_id"],
+        "blood_group": task["blood_group"],
+        "component": task["component"],
+        "status": "ok",
+        "result": None,
+        "error": None,
+        "seconds": 0.01
+    }
+    
+    if task["hospital_id"] == "BAD":
+        outcome["status"] = "failed"
+        outcome["error"] = "fit diverged"
+    elif task["units"].sum() == 0:
+        outcome["status"] = "skipped"
+        outcome["error"] = "Insufficient historical data for forecasting"
+    else:
+        outcome["result"] = {
+            "hospital_id": task["hospital_id"],
+            "blood_group": task["blood_group"],
+            "component": task["component"],
+            "forecast": [{"date": "2024-01-01", "predicted": float(task["units"].mean())}]
+        }
+    return outcome
+
+
+def make_tasks(hospital_ids):
+    """Build one task per hospital with a constant usage array."""
+    return [
+        {
+            "hospital_id": hospital_id,
+            "blood_group": "A+",
+            "component": "RBC",
+            "units": np.zeros(30) if hospital_id == "EMPTY" else np.full(30, 2.0),
+            "start_date": date(2024, 1, 1),
+            "days": 7
+        }
+        for hospital_id in hospital_ids
+    ]
+
+
+class TestForecastPool:
+    """Tests for fanning series out and writing results in batches."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.batches = []
+    
+    def write(self, results):
+        """Collect written batches and report one row per result."""
+        self.batches.append(list(results))
+        return len(results)
+    
+    def test_inline_run_batches_writes(self):
+        """Test results are written in batches of the configured size."""
+        pool = ForecastPool(max_workers=1, fit=fake_fit, write_batch_series=2)
+        tasks = make_tasks(["H001", "H002", "H003", "H004", "H005"])
+        
+        summary = pool.run(tasks, write=self.write, total=len(tasks))
+        
+        assert [len(batch) for batch in self.batches] == [2, 2, 1]
+        assert summary.completed == 5
+        assert summary.forecasts_written == 5
+    
+    def test_process_pool_reports_failures_and_skips(self):
+        """Test worker processes return outcomes and failures are summarized."""
+        pool = ForecastPool(max_workers=2, fit=fake_fit)
+        tasks = make_tasks(["H001", "BAD", "EMPTY", "H002"])
+        
+        summary = pool.run(tasks, write=self.write, total=len(tasks)).to_dict()
+        
+        assert summary["total_series"] == 4
+        assert summary["completed"] == 2
+        assert summary["skipped"] == 1
+        assert summary["failed"] == 1
+        assert summary["failures"] == [{"series": "BAD/A+/RBC", "error": "fit diverged"}]
+        assert set(summary["series_seconds"]) == {"H001/A+/RBC", "BAD/A+/RBC", "EMPTY/A+/RBC", "H002/A+/RBC"}
+        written = sorted(result["hospital_id"] for batch in self.batches for result in batch)
+        assert written == ["H001", "H002"]
+
+
+class TestForecastJobSummary:
+    """Tests for job summary statistics."""
+    
+    def test_timing_statistics(self):
+        """Test per-series timing statistics."""
+        summary = ForecastJobSummary(total=2)
+        summary.record({"hospital_id": "H001", "blood_group": "A+", "component": "RBC", "status": "ok", "seconds": 1.0})
+        summary.record({"hospital_id": "H002", "blood_group": "A+", "component": "RBC", "status": "ok", "seconds": 3.0})
+        
+        result = summary.to_dict()
+        
+        assert summary.processed == 2
+        assert result["fit_seconds_total"] == 4.0
+        assert result["fit_seconds_mean"] == 2.0
+        assert result["fit_seconds_max"] == 3.0
+    
+    def test_reused_series_count_towards_total(self):
+        """Test reused series are reported with the fit time they saved."""
+        summary = ForecastJobSummary(total=1)
+        summary.record({"hospital_id": "H001", "blood_group": "A+", "component": "RBC", "status": "ok", "seconds": 1.0})
+        summary.record_reused(3, 4.5)
+        
+        result = summary.to_dict()
+        
+        assert result["total_series"] == 4
+        assert result["reused"] == 3
+        assert result["fit_seconds_saved"] == 4.5
+        assert summary.fitted_seconds == {("H001", "A+", "RBC"): 1.0}
@@ -0,0 +1,118 @@
+"""Tests for incremental forecast refresh planning."""
+from datetime import date, datetime, timedelta
+from backend.app.services.forecast_refresh import RefreshPlan, changes_since, roll_forward
+
+TODAY = date(2026, 5, 20)
+KEY = ("H001", "A+", "RBC")
+OTHER = ("H002", "A+", "RBC")
+
+
+def week_points(first_day):
+    """Stored forecast of a series for the 7 days from first_day."""
+    return {first_day + timedelta(days=i): (float(i), float(i) - 1, float(i) + 1) for i in range(7)}
+
+
+def state(history_end=TODAY - timedelta(days=1), created_at=datetime(2026, 5, 19, 12), backend="statistical"):
+    """Stored series state."""
+    return {
+        "backend": backend,
+        "usage_created_at": created_at,
+        "usage_date": history_end,
+        "history_end": history_end,
+        "fit_seconds": 2.0
+    }
+
+
+def latest_rows(key, points):
+    """forecast_latest rows of one series."""
+    return [(*key, day, *values) for day, values in points.items()]
+
+
+def plan(states, changes=(), points=None, **kwargs):
+    """Plan a refresh of KEY and OTHER against yesterday's forecasts."""
+    if points is None:
+        points = latest_rows(KEY, week_points(TODAY)) + latest_rows(OTHER, week_points(TODAY))
+    options = {"backend": "statistical", "history_end": TODAY, "days": 7, "max_age_days": 7}
+    options.update(kwargs)
+    return RefreshPlan([KEY, OTHER], states, changes, points, **options)
+
+
+class TestRollForward:
+    """Tests for carrying stored forecasts to a later window."""
+    
+    def test_same_weekday_is_reused(self):
+        """Test dates past the stored window take the point a week earlier."""
+        points = week_points(date(2026, 5, 20))
+        
+        rolled = roll_forward(points, date(2026, 5, 22), 7)
+        
+        assert [point["date"] for point in rolled][:2] == ["2026-05-22", "2026-05-23"]
+        assert [point["predicted"] for point in rolled] == [2.0, 3.0, 4.0, 5.0, 6.0, 0.0, 1.0]
+    
+    def test_missing_weekday_returns_none(self):
+        """Test a stored forecast shorter than a week cannot be rolled forward."""
+        points = {date(2026, 5, 20): (1.0, 0.0, 2.0)}
+        
+        assert roll_forward(points, date(2026, 5, 21), 7) is None
+        assert roll_forward({}, date(2026, 5, 21), 7) is None
+
+
+class TestRefreshPlan:
+    """Tests for choosing which series to refit."""
+    
+    def test_unchanged_series_are_reused(self):
+        """Test series without new usage are rolled forward and count their saved fit time."""
+        result = plan({KEY: state(), OTHER: state()})
+        
+        assert result.dirty == []
+        assert len(result.reused) == 2
+        assert result.reused[0]["forecast"][0]["date"] == "2026-05-21"
+        assert result.fit_seconds_saved == 4.0
+    
+    def test_new_usage_marks_series_dirty(self):
+        """Test a usage row created after the series' mark triggers a refit."""
+        changes = [(*KEY, datetime(2026, 5, 20, 1), TODAY)]
+        
+        result = plan({KEY: state(), OTHER: state()}, changes)
+        
+        assert result.dirty == [KEY]
+        assert result.marks[KEY] == (datetime(2026, 5, 20, 1), TODAY)
+        rows = result.state_rows({KEY: 1.5}, run_id=7)
+        assert [(row["hospital_id"], row["usage_created_at"], row["history_end"], row["run_id"]) for row in rows] == [
+            ("H001", datetime(2026, 5, 20, 1), TODAY, 7)
+        ]
+    
+    def test_missing_stale_or_other_backend_state_is_dirty(self):
+        """Test series without usable state are refitted."""
+        assert plan({}).dirty == [KEY, OTHER]
+        assert plan({KEY: state(history_end=TODAY - timedelta(days=8)), OTHER: state()}).dirty == [KEY]
+        assert plan({KEY: state(backend="prophet"), OTHER: state()}).dirty == [KEY]
+        assert plan({KEY: state(), OTHER: state()}, reuse=False).dirty == [KEY, OTHER]
+    
+    def test_missing_stored_forecast_is_dirty(self):
+        """Test a series with state but no latest forecast is refitted."""
+        points = latest_rows(OTHER, week_points(TODAY))
+        
+        assert plan({KEY: state(), OTHER: state()}, points=points).dirty == [KEY]
+    
+    def test_changes_since_oldest_mark(self):
+        """Test usage is scanned from the oldest mark, or fully for unseen series."""
+        states = {KEY: state(created_at=datetime(2026, 5, 1)), OTHER: state(created_at=datetime(2026, 5, 3))}
+        
+        assert changes_since(states, [KEY, OTHER]) == datetime(2026, 5, 1)
+        assert changes_since({KEY: states[KEY]}, [KEY, OTHER]) is None
+    
+    def test_expand_to_hospitals(self):
+        """Test reused series of a hospital with a dirty series are refitted too."""
+        sibling = ("H001", "O+", "RBC")
+        points = [
+            row for key in (KEY, sibling, OTHER) for row in latest_rows(key, week_points(TODAY))
+        ]
+        options = {"backend": "statistical", "history_end": TODAY, "days": 7, "max_age_days": 7}
+        result = RefreshPlan([KEY, sibling, OTHER], {sibling: state(), OTHER: state()}, [], points, **options)
+        
+        result.expand_to_hospitals()
+        
+        assert result.dirty == [KEY, sibling]
+        assert [reused["hospital_id"] for reused in result.reused] == ["H002"]
+        assert result.fit_seconds_saved == 2.0
@@ -0,0 +1,113 @@
+"""Tests for swapping completed forecast runs into forecast_latest."""
+from datetime import date, timedelta
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+from backend.app.repositories.forecast import ForecastRepository
+
+START = date(2026, 1, 1)
+
+SCHEMA = [
+    """CREATE TABLE forecast_runs (
+        run_id INTEGER PRIMARY KEY,
+        status TEXT,
+        backend TEXT,
+        series_count INTEGER,
+        rows_written INTEGER,
+        started_at TIMESTAMP,
+        completed_at TIMESTAMP
+    )""",
+    """CREATE TABLE forecasts (
+        forecast_id INTEGER PRIMARY KEY,
+        run_id INTEGER,
+        hospital_id TEXT,
+        blood_group TEXT,
+        component TEXT,
+        forecast_date DATE,
+        predicted_units NUMERIC,
+        lower_bound NUMERIC,
+        upper_bound NUMERIC,
+        generated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )""",
+    """CREATE TABLE forecast_latest (
+        run_id INTEGER,
+        hospital_id TEXT,
+        blood_group TEXT,
+        component TEXT,
+        forecast_date DATE,
+        predicted_units NUMERIC,
+        lower_bound NUMERIC,
+        upper_bound NUMERIC,
+        generated_at TIMESTAMP,
+        PRIMARY KEY (hospital_id, blood_group, component, forecast_date)
+    )"""
+]
+
+
+@pytest.fixture
+def db():
+    """Session on an in-memory database with the forecast run tables."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    with engine.begin() as connection:
+        for statement in SCHEMA:
+            connection.execute(text(statement))
+    session = Session(engine)
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def write_run(db, run_id, series, days, units):
+    """Write a run's forecast rows for every series."""
+    db.execute(text("INSERT INTO forecast_runs (run_id, status) VALUES (:run_id, 'running')"), {"run_id": run_id})
+    for hospital_id, blood_group, component in series:
+        for day in range(days):
+            db.execute(
+                text(
+                    "INSERT INTO forecasts (run_id, hospital_id, blood_group, component, forecast_date, predicted_units) "
+                    "VALUES (:run_id, :hospital_id, :blood_group, :component, :forecast_date, :units)"
+                ),
+                {
+                    "run_id": run_id,
+                    "hospital_id": hospital_id,
+                    "blood_group": blood_group,
+                    "component": component,
+                    "forecast_date": START + timedelta(days=day),
+                    "units": units
+                }
+            )
+    db.commit()
+
+
+def latest(db):
+    """Get forecast_latest as {(hospital_id, date): (run_id, units)}."""
+    rows = db.execute(text("SELECT hospital_id, forecast_date, run_id, predicted_units FROM forecast_latest"))
+    return {(row[0], str(row[1])): (row[2], row[3]) for row in rows}
+
+
+class TestCompleteRun:
+    """Tests for replacing forecast_latest with a completed run."""
+    
+    def test_unwritten_series_keep_their_forecasts(self, db):
+        """Test series a run failed or skipped keep their last good forecast."""
+        repo = ForecastRepository(db)
+        write_run(db, 1, [("H1", "O+", "RBC"), ("H2", "O+", "RBC")], days=3, units=5)
+        repo.complete_run(1, 6)
+        
+        # Run 2 only writes H1, and one day fewer
+        write_run(db, 2, [("H1", "O+", "RBC")], days=2, units=9)
+        repo.complete_run(2, 2)
+        
+        rows = latest(db)
+        assert sorted(key for key in rows if key[0] == "H1") == [("H1", "2026-01-01"), ("H1", "2026-01-02")]
+        assert {rows[key] for key in rows if key[0] == "H1"} == {(2, 9)}
+        assert {rows[key] for key in rows if key[0] == "H2"} == {(1, 5)}
+        assert len(rows) == 5
+        
+        status = db.execute(text("SELECT status FROM forecast_runs WHERE run_id = 2")).scalar()
+        assert status == "complete"
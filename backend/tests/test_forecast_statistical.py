@@ -0,0 +1,51 @@
+"""Tests for the vectorized statistical forecaster."""
+import numpy as np
+import pytest
+from backend.app.services.forecast_statistical import StatisticalForecaster
+
+
+class TestStatisticalForecaster:
+    """Tests for fitting many series at once."""
+    
+    def test_shapes_and_methods(self):
+        """Test every series gets a forecast row and dense/sparse series get their method."""
+        days = np.arange(120)
+        dense = np.full(120, 10.0)
+        sparse = np.where(days % 5 == 0, 3.0, 0.0)
+        empty = np.zeros(120)
+        
+        fitted = StatisticalForecaster().fit_predict(np.vstack([dense, sparse, empty]), days=7)
+        
+        assert fitted["predicted"].shape == (3, 7)
+        assert fitted["lower"].shape == fitted["upper"].shape == (3, 7)
+        assert fitted["mae"].shape == fitted["mape"].shape == (3,)
+        assert fitted["method"].tolist() == ["seasonal", "croston", "croston"]
+        assert np.all(fitted["predicted"][2] == 0)
+    
+    def test_constant_series_is_forecast_exactly(self):
+        """Test a flat series forecasts its level with zero error."""
+        fitted = StatisticalForecaster().fit_predict(np.full((1, 90), 4.0), days=7)
+        
+        assert np.allclose(fitted["predicted"], 4.0)
+        assert np.allclose(fitted["lower"], fitted["upper"])
+        assert fitted["mae"][0] == pytest.approx(0.0)
+    
+    def test_weekly_pattern_is_recovered(self):
+        """Test the seasonal model picks up a weekday pattern."""
+        pattern = np.array([2.0, 8.0, 8.0, 8.0, 8.0, 8.0, 2.0])
+        units = np.tile(pattern, 20)[np.newaxis, :]
+        
+        fitted = StatisticalForecaster().fit_predict(units, days=7)
+        
+        # History is 140 days (a whole number of weeks), so day 0 of the
+        # forecast falls on the same weekday as day 0 of the history
+        assert np.allclose(fitted["predicted"][0], pattern, atol=0.5)
+    
+    def test_intermittent_rate_matches_average_demand(self):
+        """Test Croston's forecast is close to the average daily demand."""
+        units = np.where(np.arange(200) % 4 == 0, 4.0, 0.0)[np.newaxis, :]
+        
+        fitted = StatisticalForecaster().fit_predict(units, days=3)
+        
+        assert fitted["predicted"][0] == pytest.approx(np.full(3, 1.0), rel=0.1)
+
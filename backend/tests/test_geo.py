@@ -0,0 +1,122 @@
+"""Tests for hospital distance index."""
+import pytest
+from math import radians, cos, sin, asin, sqrt
+from backend.app.utils import geo
+from backend.app.utils.geo import HospitalDistanceIndex, haversine_km
+
+
+class FakeHospital:
+    """Minimal hospital record for index tests."""
+    
+    def __init__(self, hospital_id, latitude, longitude):
+        self.hospital_id = hospital_id
+        self.name = f"Hospital {hospital_id}"
+        self.latitude = latitude
+        self.longitude = longitude
+
+
+def scalar_haversine(lat1, lon1, lat2, lon2):
+    """Reference scalar haversine distance in kilometers."""
+    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
+    a = sin((lat2 - lat1) / 2) ** 2 + cos(lat1) * cos(lat2) * sin((lon2 - lon1) / 2) ** 2
+    return 2 * asin(sqrt(a)) * 6371
+
+
+HOSPITALS = [
+    FakeHospital("H001", 19.0760, 72.8777),
+    FakeHospital("H002", 19.2183, 72.9781),
+    FakeHospital("H003", 19.0330, 73.0297),
+    FakeHospital("H004", 18.5204, 73.8567),
+    FakeHospital("H005", None, None),
+]
+
+
+class TestHaversine:
+    """Tests for vectorized haversine distance."""
+    
+    def test_matches_scalar_formula(self):
+        """Test vectorized distances match the scalar formula."""
+        for a in HOSPITALS[:4]:
+            for b in HOSPITALS[:4]:
+                expected = scalar_haversine(a.latitude, a.longitude, b.latitude, b.longitude)
+                actual = haversine_km(a.latitude, a.longitude, b.latitude, b.longitude)
+                assert actual == pytest.approx(expected, abs=1e-9)
+
+
+class TestHospitalDistanceIndex:
+    """Tests for radius queries on the distance index."""
+    
+    @pytest.mark.parametrize("max_matrix", [0, 100])
+    def test_within_radius_sorted_by_distance(self, monkeypatch, max_matrix):
+        """Test radius query with and without the precomputed matrix."""
+        monkeypatch.setattr(geo, "MAX_MATRIX_HOSPITALS", max_matrix)
+        index = HospitalDistanceIndex(HOSPITALS)
+        
+        nearby = index.within("H001", 50)
+        
+        assert [h["hospital_id"] for h in nearby] == ["H003", "H002"]
+        assert nearby[0]["distance_km"] == round(scalar_haversine(19.0760, 72.8777, 19.0330, 73.0297), 2)
+        assert nearby[0]["name"] == "Hospital H003"
+    
+    @pytest.mark.parametrize("max_matrix", [0, 100])
+    def test_distance_matrix_matches_rows(self, monkeypatch, max_matrix):
+        """Test pairwise distances between hospital subsets."""
+        monkeypatch.setattr(geo, "MAX_MATRIX_HOSPITALS", max_matrix)
+        index = HospitalDistanceIndex(HOSPITALS)
+        
+        matrix = index.distance_matrix(["H002", "H001"], ["H003", "H004", "H001"])
+        
+        assert matrix.shape == (2, 3)
+        assert matrix[1, 2] == pytest.approx(0.0)
+        assert matrix[0, 0] == pytest.approx(scalar_haversine(
+            HOSPITALS[1].latitude, HOSPITALS[1].longitude,
+            HOSPITALS[2].latitude, HOSPITALS[2].longitude
+        ))
+    
+    def test_hospitals_without_coordinates_are_skipped(self):
+        """Test hospitals without coordinates are not indexed."""
+        index = HospitalDistanceIndex(HOSPITALS)
+        
+        assert len(index) == 4
+        assert "H005" not in index
+        assert index.within("H005", 1000) == []
+        assert index.within("UNKNOWN", 1000) == []
+    
+    def test_shared_index_rebuilt_after_invalidation(self):
+        """Test the shared index reloads hospitals only after invalidation."""
+        calls = []
+        
+        def load():
+            calls.append(1)
+            return HOSPITALS[:2] if len(calls) == 1 else HOSPITALS
+        
+        geo.invalidate_hospital_index()
+        first = geo.get_hospital_index(load)
+        assert geo.get_hospital_index(load) is first
+        assert len(first) == 2
+        
+        geo.invalidate_hospital_index()
+        assert len(geo.get_hospital_index(load)) == 4
+        assert len(calls) == 2
+        geo.invalidate_hospital_index()
+    
+    def test_shared_index_rebuilt_after_ttl(self, monkeypatch):
+        """Test the shared index is rebuilt once the TTL expires."""
+        now = [1000.0]
+        monkeypatch.setattr(geo.time, "monotonic", lambda: now[0])
+        monkeypatch.setattr(geo.settings, "hospital_index_ttl_seconds", 60.0)
+        calls = []
+        
+        def load():
+            calls.append(1)
+            return HOSPITALS
+        
+        geo.invalidate_hospital_index()
+        first = geo.get_hospital_index(load)
+        now[0] += 59
+        assert geo.get_hospital_index(load) is first
+        
+        now[0] += 2
+        assert geo.get_hospital_index(load) is not first
+        assert len(calls) == 2
+        geo.invalidate_hospital_index()
@@ -1,8 +1,11 @@
 """Tests for CSV ingestion service."""
 import pytest
+import numpy as np
+import pandas as pd
 from datetime import date, timedelta
 from backend.app.services.ingestion import IngestionService, IngestionResult
 from backend.app.schemas.enums import BloodGroup, Component
+from backend.scripts.benchmark_ingestion import parse_csv_rowwise
 
 
 class TestBloodGroupNormalization:
@@ -289,3 +292,223 @@ R003,H001,B+,Platelets,2,{future_date},{today}"""
         assert result.error_count == 1
         assert len(result.valid_records) == 2
         assert len(result.errors) == 1
+
+
+class TestColumnarParsing:
+    """Tests that columnar parsing matches the row-by-row reference."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.service = IngestionService()
+    
+    def assert_same_result(self, csv_content):
+        """Assert both parsing paths produce identical results."""
+        columnar = self.service.parse_csv(csv_content)
+        rowwise = parse_csv_rowwise(self.service, csv_content)
+        
+        assert columnar.errors == rowwise.errors
+        assert columnar.duplicates == rowwise.duplicates
+        assert columnar.success_count == rowwise.success_count
+        assert columnar.error_count == rowwise.error_count
+        assert [r.model_dump() for r in columnar.valid_records] == \
+            [r.model_dump() for r in rowwise.valid_records]
+        return columnar
+    
+    def test_mixed_rows_match_rowwise(self):
+        """Test every error type yields the same rows and messages."""
+        today = date.today()
+        future_date = today + timedelta(days=30)
+        past_date = today - timedelta(days=30)
+        
+        csv_content = f"""record_id,hospital_id,blood_group,component,units,unit_expiry_date,collection_date
+R001,H001,A+,RBC,5,{future_date},{today}
+R002,H001,XYZ,RBC,3,{future_date},{today}
+R003,H001,b negative,Platelets,2,{future_date},{today}
+R001,H001,A+,RBC,5,{future_date},{today}
+R004,H002,O +,Plasma,abc,{future_date},{today}
+R005,H002,O+,Plasma,0,{future_date},{today}
+R006,H002,,Plasma,4,{future_date},{today}
+R007,H002,O+,Foo,4,{future_date},{today}
+R008,H002,O+,Plasma,7,invalid-date,{today}
+R009,H002,O+,Plasma,7,{past_date},{today}
+R010,H002,AB Positive,RBC,7,{future_date} 10:30,{today}"""
+        
+        result = self.assert_same_result(csv_content)
+        
+        assert result.success_count == 2
+        assert [e["row"] for e in result.errors] == [2, 3, 5, 6, 7, 8, 9, 10, 11]
+    
+    def test_non_iso_dates_fall_back_to_row_parsing(self):
+        """Test dates outside ISO 8601 are still accepted in row order."""
+        csv_content = """record_id,hospital_id,blood_group,component,units,unit_expiry_date,collection_date
+R001,H001,A+,RBC,5,2024-12-31,2024-11-01
+R002,H001,B+,RBC,5,Dec 31 2024,Nov 1 2024
+R003,H001,O-,RBC,5,2024-12-31,2024-11-01"""
+        
+        result = self.assert_same_result(csv_content)
+        
+        assert [r.record_id for r in result.valid_records] == ["R001", "R002", "R003"]
+    
+    def test_float_units_are_truncated(self):
+        """Test fractional units behave like int() conversion."""
+        today = date.today()
+        future_date = today + timedelta(days=30)
+        
+        csv_content = f"""record_id,hospital_id,blood_group,component,units,unit_expiry_date,collection_date
+R001,H001,A+,RBC,5.7,{future_date},{today}
+R002,H001,A+,RBC,0.5,{future_date},{today}
+R003,H001,A+,RBC,,{future_date},{today}"""
+        
+        result = self.assert_same_result(csv_content)
+        
+        assert result.valid_records[0].units == 5
+        assert [e["field"] for e in result.errors] == ["units", "units"]
+    
+    def test_units_beyond_int64_fall_back_to_row_parsing(self):
+        """Test units too large for int64 match the row-by-row result."""
+        today = date.today()
+        future_date = today + timedelta(days=30)
+        
+        for huge in ("99999999999999999999", "1e20"):
+            csv_content = f"""record_id,hospital_id,blood_group,component,units,unit_expiry_date,collection_date
+R001,H001,A+,RBC,5,{future_date},{today}
+R002,H001,A+,RBC,{huge},{future_date},{today}"""
+            
+            result = self.assert_same_result(csv_content)
+            
+            assert result.valid_records[0].units == 5
+    
+    def test_units_of_object_column(self):
+        """Test an object units column is parsed without writing to a read-only view."""
+        column = pd.Series(["5", "99999999999999999999", None, " 7 ", 3], dtype=object)
+        
+        units, ok = self.service._parse_units_column(column)
+        
+        assert ok.tolist() == [True, False, False, True, False]
+        assert units[ok].tolist() == [5, 7]
+    
+    def test_string_columns_take_the_columnar_path(self):
+        """Test columns read as strings are parsed in bulk, whatever their dtype."""
+        for dtype in (object, "string"):
+            units, units_ok = self.service._parse_units_column(pd.Series(["5", "x"], dtype=dtype))
+            dates, dates_ok = self.service._parse_date_column(pd.Series(["2024-12-31", "x"], dtype=dtype))
+            
+            assert units_ok.tolist() == [True, False]
+            assert dates_ok.tolist() == [True, False]
+            assert dates[0] == np.datetime64("2024-12-31")
+
+
+class TestStreamingIngestion:
+    """Tests for chunk-by-chunk CSV ingestion."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.service = IngestionService()
+    
+    def feed_in_chunks(self, csv_content, chunk_size):
+        """Feed CSV content through a stream and collect valid records."""
+        stream = self.service.stream()
+        data = csv_content.encode("utf-8")
+        records = []
+        for start in range(0, len(data), chunk_size):
+            records.extend(stream.feed(data[start:start + chunk_size]))
+        records.extend(stream.close())
+        return stream, records
+    
+    def test_chunked_matches_whole_file(self):
+        """Test small chunks give the same rows and errors as parse_csv."""
+        today = date.today()
+        future_date = today + timedelta(days=30)
+        
+        csv_content = f"""record_id,hospital_id,blood_group,component,units,unit_expiry_date,collection_date
+R001,H001,A+,RBC,5,{future_date},{today}
+R002,H001,XYZ,RBC,3,{future_date},{today}
+"R003",H001,b negative,Platelets,2,{future_date},{today}
+R004,"Ward
+7",O+,Plasma,0,{future_date},{today}
+R005,H002,O+,Plasma,4,{future_date},{today}"""
+        
+        expected = self.service.parse_csv(csv_content)
+        
+        for chunk_size in (5, 64, 4096):
+            stream, records = self.feed_in_chunks(csv_content, chunk_size)
+            assert stream.result.errors == expected.errors
+            assert stream.result.success_count == expected.success_count
+            assert [r.record_id for r in records] == ["R001", "R003", "R005"]
+            assert stream.result.valid_records == []
+    
+    def test_duplicates_across_chunks(self):
+        """Test later occurrences of a record ID are rejected across chunks."""
+        today = date.today()
+        future_date = today + timedelta(days=30)
+        
+        csv_content = f"""record_id,hospital_id,blood_group,component,units,unit_expiry_date,collection_date
+R001,H001,A+,RBC,5,{future_date},{today}
+R002,H001,B+,RBC,3,{future_date},{today}
+R001,H001,A+,RBC,5,{future_date},{today}
+R001,H001,O+,RBC,1,{future_date},{today}"""
+        
+        stream, records = self.feed_in_chunks(csv_content, 16)
+        
+        assert [r.record_id for r in records] == ["R001", "R002"]
+        assert stream.result.duplicates == ["R001"]
+        assert [e["row"] for e in stream.result.errors] == [4, 5]
+        assert stream.result.error_count == 3
+    
+    def test_missing_columns_stops_stream(self):
+        """Test a bad header is reported once and nothing is parsed."""
+        stream, records = self.feed_in_chunks("record_id,hospital_id\nR001,H001\n", 8)
+        
+        assert records == []
+        assert stream.failed is True
+        assert len(stream.result.errors) == 1
+        assert "Missing required columns" in stream.result.errors[0]["message"]
+    
+    def test_identifiers_do_not_depend_on_chunk_boundaries(self):
+        """Test IDs keep leading zeros and duplicates are found at any chunk size."""
+        today = date.today()
+        future_date = today + timedelta(days=30)
+        
+        csv_content = f"""record_id,hospital_id,blood_group,component,units,unit_expiry_date,collection_date
+00123,007,A+,RBC,5,{future_date},{today}
+123,007,A+,RBC,5,{future_date},{today}
+,007,A+,RBC,5,{future_date},{today}
+00123,007,B+,RBC,2,{future_date},{today}
+NA,007,O+,RBC,1,{future_date},{today}
+456,007,O+,RBC,1,{future_date},{today}"""
+        
+        outcomes = []
+        for chunk_size in (7, 90, 4096):
+            stream, records = self.feed_in_chunks(csv_content, chunk_size)
+            outcomes.append((
+                [r.model_dump() for r in records],
+                stream.result.duplicates,
+                stream.result.errors
+            ))
+        
+        assert outcomes[0] == outcomes[1] == outcomes[2]
+        records, duplicates, errors = outcomes[0]
+        assert [r["record_id"] for r in records] == ["00123", "123", "NA", "456"]
+        assert {r["hospital_id"] for r in records} == {"007"}
+        assert duplicates == ["00123"]
+        assert [(e["row"], e["field"]) for e in errors] == [(4, "record_id"), (5, "record_id")]
+        assert errors[0]["message"] == "record_id is required"
+    
+    def test_unterminated_quote_fails_once_buffer_is_full(self):
+        """Test an open quoted field fails the upload instead of buffering forever."""
+        today = date.today()
+        row = f"R{{}},H001,A+,RBC,5,{today + timedelta(days=30)},{today}\n"
+        stream = IngestionService().stream()
+        stream.max_buffer_bytes = 4096
+        
+        header = "record_id,hospital_id,blood_group,component,units,unit_expiry_date,collection_date\n"
+        stream.feed(header.encode() + b'"bad,H001,A+,RBC,5\n')
+        for i in range(100):
+            stream.feed("".join(row.format(i * 50 + j) for j in range(50)).encode())
+            if stream.failed:
+                break
+        
+        assert stream.failed is True
+        assert len(stream._buffer) < 4096 + 50 * len(row) + 100
+        assert [e["message"] for e in stream.result.errors] == ["Unterminated quoted field"]
+        assert stream.close() == []
@@ -0,0 +1,89 @@
+"""Tests for the inventory listing endpoint."""
+from datetime import date, timedelta
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from backend.app import models
+from backend.app.api import inventory
+
+TODAY = date.today()
+
+
+@pytest.fixture
+def client():
+    """Test client for the inventory router on a database with five lots."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    models.Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    
+    db = factory()
+    db.add(models.Hospital(hospital_id="H1", name="Hospital 1"))
+    for i in range(5):
+        db.add(models.Inventory(
+            record_id=f"R{i}",
+            hospital_id="H1",
+            blood_group="O+",
+            component="RBC",
+            units=i + 1,
+            unit_expiry_date=TODAY + timedelta(days=5 - i),
+            collection_date=TODAY - timedelta(days=30)
+        ))
+    db.commit()
+    db.close()
+    
+    app = FastAPI()
+    app.include_router(inventory.router, prefix="/api/inventory")
+    
+    def override_get_db():
+        db = factory()
+        try:
+            yield db
+        finally:
+            db.close()
+    
+    # The router resolves get_db through the app package, not backend.app
+    app.dependency_overrides[inventory.get_db] = override_get_db
+    yield TestClient(app)
+    engine.dispose()
+
+
+class TestGetInventory:
+    """Tests for the list and page responses of GET /api/inventory."""
+    
+    def test_bare_list_by_default(self, client):
+        """Test a request without limit or cursor returns every record as a list."""
+        response = client.get("/api/inventory", params={"hospital_id": "H1"})
+        
+        assert response.status_code == 200
+        assert isinstance(response.json(), list)
+        assert sorted(row["record_id"] for row in response.json()) == ["R0", "R1", "R2", "R3", "R4"]
+    
+    def test_page_when_limit_passed(self, client):
+        """Test limit returns pages that follow next_cursor to the end."""
+        seen = []
+        params = {"limit": 2}
+        while True:
+            response = client.get("/api/inventory", params=params)
+            assert response.status_code == 200
+            page = response.json()
+            assert page["limit"] == 2
+            assert page["sort"] == "expiry_asc"
+            seen.extend(row["record_id"] for row in page["items"])
+            if page["next_cursor"] is None:
+                break
+            params = {"limit": 2, "cursor": page["next_cursor"]}
+        
+        assert seen == ["R4", "R3", "R2", "R1", "R0"]
+    
+    def test_malformed_cursor(self, client):
+        """Test a malformed cursor is rejected."""
+        response = client.get("/api/inventory", params={"cursor": "not-a-cursor"})
+        
+        assert response.status_code == 400
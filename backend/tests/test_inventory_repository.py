@@ -0,0 +1,53 @@
+"""Tests for rolling back failed bulk inventory loads."""
+from datetime import date
+import pytest
+from sqlalchemy.exc import OperationalError
+from backend.app.repositories.inventory import InventoryRepository
+from backend.app.schemas.inventory import InventoryCreate
+
+RECORDS = [
+    InventoryCreate(
+        record_id="R1",
+        hospital_id="H1",
+        blood_group="O+",
+        component="RBC",
+        units=3,
+        unit_expiry_date=date(2026, 2, 1),
+        collection_date=date(2026, 1, 1)
+    )
+]
+
+
+class FailingSession:
+    """Session stand-in whose every statement fails."""
+    
+    def __init__(self):
+        self.rolled_back = False
+        self.committed = False
+    
+    def execute(self, *args, **kwargs):
+        raise OperationalError("statement", {}, Exception("connection lost"))
+    
+    def connection(self):
+        return self
+    
+    def commit(self):
+        self.committed = True
+    
+    def rollback(self):
+        self.rolled_back = True
+
+
+class TestBulkLoadRollback:
+    """Tests that failed bulk loads leave the session usable."""
+    
+    @pytest.mark.parametrize("mode", ["upsert", "copy"])
+    def test_failed_load_rolls_back(self, mode):
+        """Test the error propagates after the transaction is rolled back."""
+        db = FailingSession()
+        
+        with pytest.raises(OperationalError):
+            InventoryRepository(db).load_many(RECORDS, mode=mode)
+        
+        assert db.rolled_back
+        assert not db.committed
@@ -0,0 +1,36 @@
+"""Tests for deferred imports of heavy libraries."""
+import subprocess
+import sys
+from pathlib import Path
+from backend.app.utils.lazy_import import LazyModule, lazy_module
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+
+class TestLazyModule:
+    """Tests for modules imported on first use."""
+    
+    def test_imported_module_is_returned_as_is(self):
+        """Test an already imported module is not wrapped."""
+        assert lazy_module("json") is sys.modules["json"]
+    
+    def test_attribute_access_imports(self):
+        """Test the real module's attributes are available through the stand-in."""
+        module = LazyModule("colorsys")
+        
+        assert module.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+        assert "rgb_to_hsv" in vars(module)
+    
+    def test_services_do_not_import_numpy_or_pandas(self):
+        """Test importing forecasting, ingestion and geo modules leaves heavy libraries unloaded."""
+        code = (
+            "import sys\n"
+            "import app.services.ingestion, app.services.forecast_hierarchy, app.services.forecast_statistical\n"
+            "import app.utils.geo\n"
+            "print(','.join(name for name in ('numpy', 'pandas') if name in sys.modules))\n"
+        )
+        completed = subprocess.run(
+            [sys.executable, "-c", code], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        )
+        
+        assert completed.stdout.strip() == ""
@@ -0,0 +1,121 @@
+"""Tests for per-route query-count and latency metrics."""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import StaticPool
+from backend.app.utils import metrics as metrics_module
+from backend.app.utils.metrics import (
+    RouteMetrics,
+    QueryStats,
+    instrument_engine,
+    metrics_middleware,
+    track_queries
+)
+
+
+@pytest.fixture
+def engine():
+    """In-memory SQLite engine with a small table, instrumented."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY)"))
+        connection.execute(text("INSERT INTO items (id) VALUES (1), (2), (3)"))
+    instrument_engine(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def client(engine, monkeypatch):
+    """Test client for an app issuing one query per item on /items/{n}."""
+    monkeypatch.setattr(metrics_module, "route_metrics", RouteMetrics())
+    monkeypatch.setattr(metrics_module.settings, "server_timing_enabled", True)
+    
+    app = FastAPI()
+    app.middleware("http")(metrics_middleware)
+    
+    @app.get("/items/{n}")
+    def get_items(n: int):
+        with engine.connect() as connection:
+            return [connection.execute(text("SELECT id FROM items WHERE id = :id"), {"id": i}).scalar() for i in range(n)]
+    
+    return TestClient(app)
+
+
+class TestTrackQueries:
+    """Tests for counting statements outside of requests."""
+    
+    def test_counts_statements_inside_block_only(self, engine):
+        """Test statements are counted only while the block is active."""
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            with track_queries() as stats:
+                connection.execute(text("SELECT id FROM items"))
+                connection.execute(text("SELECT id FROM items WHERE id = 1"))
+            connection.execute(text("SELECT 1"))
+        
+        assert stats.statements == 2
+        assert stats.db_seconds >= 0
+    
+    def test_counts_failed_statements(self, engine):
+        """Test a statement that raises is counted and leaves no state on the connection."""
+        with engine.connect() as connection:
+            with track_queries() as stats:
+                with pytest.raises(OperationalError):
+                    connection.execute(text("SELECT missing FROM items"))
+                connection.execute(text("SELECT id FROM items"))
+            
+            assert "query_start_time" not in connection.info
+        
+        assert stats.statements == 2
+
+
+class TestMetricsMiddleware:
+    """Tests for per-route recording and exposition."""
+    
+    def test_records_statements_per_route(self, client):
+        """Test requests are aggregated under the route template."""
+        client.get("/items/2")
+        client.get("/items/5")
+        
+        counters = metrics_module.route_metrics.snapshot()[("GET", "/items/{n}")]
+        assert counters["requests"] == 2
+        assert counters["statements"] == 7
+        assert counters["max_statements"] == 5
+    
+    def test_server_timing_header(self, client):
+        """Test the Server-Timing header reports the request's queries."""
+        response = client.get("/items/3")
+        
+        assert response.headers["Server-Timing"].startswith("db;dur=")
+        assert '"3 queries' in response.headers["Server-Timing"]
+        assert "app;dur=" in response.headers["Server-Timing"]
+    
+    def test_unmatched_route(self, client):
+        """Test unknown paths share one label."""
+        client.get("/nope/1")
+        client.get("/nope/2")
+        
+        assert metrics_module.route_metrics.snapshot()[("GET", "<unmatched>")]["requests"] == 2
+    
+    def test_prometheus_text(self):
+        """Test the exposition format of the counters."""
+        registry = RouteMetrics()
+        stats = QueryStats()
+        stats.record(0.25, 4)
+        stats.record(0.25, -1)
+        registry.observe("GET", "/api/x", 0.5, stats)
+        
+        lines = registry.render().splitlines()
+        
+        assert "# TYPE sbb_db_statements_total counter" in lines
+        assert 'sbb_db_statements_total{method="GET",route="/api/x"} 2' in lines
+        assert 'sbb_db_seconds_total{method="GET",route="/api/x"} 0.5' in lines
+        assert 'sbb_db_rows_total{method="GET",route="/api/x"} 4' in lines
+        assert 'sbb_db_statements_max{method="GET",route="/api/x"} 2' in lines
@@ -0,0 +1,120 @@
+"""Tests for the on-disk forecast model cache."""
+import os
+from backend.app.schemas.enums import BloodGroup, Component
+from backend.app.utils.model_cache import ModelCache, config_hash
+
+# Hospitals in the largest network the default cache limits are sized for
+NIGHTLY_HOSPITALS = 300
+
+# Upper bound on a serialized Prophet model with 180 days of history
+MODEL_BYTES = 40_000
+
+
+def series(cache, hospital_id="H1", config=None):
+    """Series key of an O+ PRBC series."""
+    return cache.series_key(hospital_id, "O+", "PRBC", config or {"backend": "prophet"})
+
+
+class TestModelCache:
+    """Tests for keys, LRU eviction and warm-start lookup."""
+    
+    def test_round_trip_and_miss(self, tmp_path):
+        """Test a stored model is returned for its key and nothing else."""
+        cache = ModelCache(str(tmp_path), max_entries=10, max_bytes=10_000)
+        key = series(cache)
+        
+        cache.put(key, cache.history_key("2026-05-01", "a" * 40), '{"model": 1}')
+        
+        assert cache.get(key, cache.history_key("2026-05-01", "a" * 40)) == '{"model": 1}'
+        assert cache.get(key, cache.history_key("2026-05-01", "b" * 40)) is None
+        assert cache.get(series(cache, "H2"), cache.history_key("2026-05-01", "a" * 40)) is None
+    
+    def test_config_changes_key(self):
+        """Test models fitted under other settings are not reused."""
+        assert config_hash({"confidence_interval": 0.95}) != config_hash({"confidence_interval": 0.8})
+        assert (
+            ModelCache.series_key("H1", "O+", "PRBC", {"history_days": 180})
+            != ModelCache.series_key("H1", "O+", "PRBC", {"history_days": 90})
+        )
+    
+    def test_evicts_least_recently_used(self, tmp_path):
+        """Test the oldest unread model is evicted once over max_entries."""
+        cache = ModelCache(str(tmp_path), max_entries=2, max_bytes=10_000, evict_every=1)
+        key = series(cache)
+        
+        cache.put(key, "2026-05-01-a", "first")
+        cache.put(key, "2026-05-02-b", "second")
+        for mtime, (_, _, path) in enumerate(cache.entries()):
+            os.utime(path, (mtime, mtime))
+        
+        # Reading the first model makes the second the least recently used
+        assert cache.get(key, "2026-05-01-a") == "first"
+        cache.put(key, "2026-05-03-c", "third")
+        
+        assert cache.get(key, "2026-05-02-b") is None
+        assert cache.get(key, "2026-05-01-a") == "first"
+        assert len(cache.entries()) == 2
+    
+    def test_evicts_over_max_bytes(self, tmp_path):
+        """Test total size is kept under max_bytes."""
+        cache = ModelCache(str(tmp_path), max_entries=100, max_bytes=250, evict_every=1)
+        
+        for i in range(5):
+            cache.put(series(cache, f"H{i}"), "2026-05-01-a", "x" * 100)
+        
+        assert sum(size for _, size, _ in cache.entries()) <= 250
+    
+    def test_evicts_every_n_writes(self, tmp_path):
+        """Test the directory is only scanned once per evict_every writes."""
+        cache = ModelCache(str(tmp_path), max_entries=1, max_bytes=10_000, evict_every=3)
+        
+        for i in range(2):
+            cache.put(series(cache, f"H{i}"), "2026-05-01-a", "model")
+        assert len(cache.entries()) == 2
+        
+        cache.put(series(cache, "H2"), "2026-05-01-a", "model")
+        assert len(cache.entries()) == 1
+    
+    def test_evict_skips_files_removed_by_other_workers(self, tmp_path, monkeypatch):
+        """Test a file unlinked concurrently still counts as gone."""
+        cache = ModelCache(str(tmp_path), max_entries=1, max_bytes=10_000, evict_every=100)
+        for i in range(3):
+            cache.put(series(cache, f"H{i}"), "2026-05-01-a", "model")
+        
+        # Another worker removes the oldest file after this one listed it
+        entries = cache.entries()
+        entries[0][2].unlink()
+        monkeypatch.setattr(cache, "entries", lambda: entries)
+        
+        assert cache.evict() == 1
+        monkeypatch.undo()
+        assert len(cache.entries()) == 1
+    
+    def test_latest_returns_newest_history(self, tmp_path):
+        """Test warm starts use the model with the latest history end date."""
+        cache = ModelCache(str(tmp_path), max_entries=10, max_bytes=10_000)
+        key = series(cache)
+        
+        assert cache.latest(key) is None
+        
+        cache.put(key, cache.history_key("2026-05-02", "b" * 40), "newer")
+        cache.put(key, cache.history_key("2026-05-01", "a" * 40), "older")
+        
+        assert cache.latest(key) == "newer"
+
+
+class TestNightlySizing:
+    """Tests that the default limits hold one nightly forecast run."""
+    
+    def test_nightly_run_survives_final_evict(self, tmp_path):
+        """Test every model of a 300-hospital run is still cached after the job's evict()."""
+        # Default limits; scans batched coarsely only to keep the test fast
+        cache = ModelCache(str(tmp_path), evict_every=1000)
+        series_count = NIGHTLY_HOSPITALS * len(BloodGroup) * len(Component)
+        
+        for i in range(series_count):
+            cache.put(series(cache, f"H{i}"), "2026-05-01-a", "model")
+        cache.evict()
+        
+        assert len(cache.entries()) == series_count
+        assert cache.max_bytes >= series_count * MODEL_BYTES
@@ -0,0 +1,305 @@
+"""N+1 regression tests: SQL statement budgets for service methods.
+
+Every service method runs against a seeded SQLite dataset at two scales.
+Its statement count must stay within a fixed budget and must be the same
+at both scales, so a change that adds per-row queries fails here. Rows
+fetched are counted by the SQLite cursor and bounded per hospital, so a
+change that pulls raw rows into Python instead of aggregating in SQL fails
+too; the DB-API rowcount SQLite reports covers writes only.
+"""
+import random
+import sqlite3
+from datetime import date, datetime, timedelta
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from backend.app import models
+from backend.app.schemas.enums import BloodGroup, Component
+from backend.app.services.donor import DonorService
+from backend.app.services.expiry import ExpiryService
+from backend.app.services.transfer import TransferService
+from backend.app.utils.geo import HospitalDistanceIndex
+from backend.app.utils.metrics import instrument_engine, track_queries
+
+# Hospitals per unit of scale; datasets are seeded at scale 1 and SCALE_UP
+HOSPITALS_PER_SCALE = 3
+SCALE_UP = 4
+
+# Blood group and component series per hospital, and most lots per series
+SERIES_PER_HOSPITAL = len(BloodGroup) * len(Component)
+LOTS_PER_SERIES = 3
+
+# Tables read through Core constructs rather than ORM models
+CORE_METADATA = sa.MetaData()
+sa.Table(
+    'forecast_latest',
+    CORE_METADATA,
+    sa.Column('hospital_id', sa.String(50), primary_key=True),
+    sa.Column('blood_group', sa.String(5), primary_key=True),
+    sa.Column('component', sa.String(20), primary_key=True),
+    sa.Column('forecast_date', sa.Date(), primary_key=True),
+    sa.Column('predicted_units', sa.Numeric(10, 2), nullable=False),
+    sa.Column('lower_bound', sa.Numeric(10, 2)),
+    sa.Column('upper_bound', sa.Numeric(10, 2)),
+    sa.Column('run_id', sa.Integer()),
+    sa.Column('generated_at', sa.TIMESTAMP(), nullable=False)
+)
+
+
+class CountingCursor(sqlite3.Cursor):
+    """SQLite cursor counting the rows fetched through it."""
+    
+    rows_fetched = 0
+    
+    def fetchone(self):
+        row = super().fetchone()
+        if row is not None:
+            CountingCursor.rows_fetched += 1
+        return row
+    
+    def fetchmany(self, size=None):
+        rows = super().fetchmany() if size is None else super().fetchmany(size)
+        CountingCursor.rows_fetched += len(rows)
+        return rows
+    
+    def fetchall(self):
+        rows = super().fetchall()
+        CountingCursor.rows_fetched += len(rows)
+        return rows
+
+
+class CountingConnection(sqlite3.Connection):
+    """SQLite connection handing out counting cursors."""
+    
+    def cursor(self, factory=CountingCursor):
+        return super().cursor(factory)
+
+
+def generate_dataset(scale: int, seed: int = 42) -> dict:
+    """
+    Generate seed_data.py-style rows for ``scale`` groups of hospitals.
+    
+    Hospitals sit around Mumbai; every hospital gets 2-3 inventory lots and a
+    week of forecasts per blood group and component, so surpluses and
+    deficits occur everywhere.
+    
+    Returns:
+        Dictionary of row lists keyed by table name
+    """
+    rng = random.Random(seed)
+    today = date.today()
+    now = datetime.now()
+    data = {"hospitals": [], "inventory": [], "forecast_latest": [], "donors": []}
+    
+    for h in range(scale * HOSPITALS_PER_SCALE):
+        hospital_id = f"H{h + 1:03d}"
+        data["hospitals"].append({
+            "hospital_id": hospital_id,
+            "name": f"Hospital {h + 1}",
+            "latitude": 19.0 + rng.uniform(-0.2, 0.2),
+            "longitude": 72.9 + rng.uniform(-0.2, 0.2)
+        })
+        
+        for blood_group in BloodGroup:
+            for component in Component:
+                for i in range(rng.randint(2, LOTS_PER_SERIES)):
+                    collection_date = today - timedelta(days=rng.randint(1, 30))
+                    data["inventory"].append({
+                        "record_id": f"{hospital_id}_{blood_group.value}_{component.value}_{i + 1}",
+                        "hospital_id": hospital_id,
+                        "blood_group": blood_group.value,
+                        "component": component.value,
+                        "units": rng.randint(5, 50),
+                        "unit_expiry_date": collection_date + timedelta(days=rng.randint(5, 60)),
+                        "collection_date": collection_date
+                    })
+                for day in range(8):
+                    data["forecast_latest"].append({
+                        "hospital_id": hospital_id,
+                        "blood_group": blood_group.value,
+                        "component": component.value,
+                        "forecast_date": today + timedelta(days=day),
+                        "predicted_units": rng.uniform(0, 20),
+                        "generated_at": now
+                    })
+    
+    for d in range(scale * 20):
+        data["donors"].append({
+            "name": f"Donor {d + 1}",
+            "blood_group": rng.choice(list(BloodGroup)).value,
+            "last_donation_date": today - timedelta(days=rng.randint(10, 200)),
+            "eligible": rng.random() < 0.7,
+            "location_lat": 19.0 + rng.uniform(-0.3, 0.3),
+            "location_lon": 72.9 + rng.uniform(-0.3, 0.3)
+        })
+    
+    return data
+
+
+@pytest.fixture
+def seeded(monkeypatch):
+    """Factory returning a session over a fresh database seeded at a scale."""
+    engines = []
+    
+    # Build the distance index per call instead of sharing the process-wide
+    # one, so the hospital query is counted and scales cannot mix
+    monkeypatch.setattr(
+        TransferService,
+        "distance_index",
+        lambda self: HospitalDistanceIndex(self.hospital_repo.get_all())
+    )
+    
+    def seed(scale: int) -> Session:
+        engine = sa.create_engine(
+            "sqlite://",
+            creator=lambda: sqlite3.connect(":memory:", check_same_thread=False, factory=CountingConnection),
+            poolclass=StaticPool
+        )
+        engines.append(engine)
+        models.Base.metadata.create_all(engine)
+        CORE_METADATA.create_all(engine)
+        
+        tables = dict(models.Base.metadata.tables, **CORE_METADATA.tables)
+        with engine.begin() as connection:
+            for name, rows in generate_dataset(scale).items():
+                connection.execute(tables[name].insert(), rows)
+        
+        instrument_engine(engine)
+        return Session(bind=engine)
+    
+    yield seed
+    
+    for engine in engines:
+        engine.dispose()
+
+
+def measure_at_scales(seeded, call) -> list:
+    """(statements, rows fetched) of ``call(session)`` at scale 1 and SCALE_UP."""
+    measured = []
+    for scale in (1, SCALE_UP):
+        db = seeded(scale)
+        CountingCursor.rows_fetched = 0
+        with track_queries() as stats:
+            call(db)
+        db.close()
+        measured.append((stats.statements, CountingCursor.rows_fetched))
+    return measured
+
+
+def recommendation_rows(hospitals: int) -> int:
+    """
+    Rows a recommendation run may fetch.
+    
+    Each hospital, plus its unit total, forecast total and earliest lot per
+    series, aggregated in SQL.
+    """
+    return hospitals * (1 + 3 * SERIES_PER_HOSPITAL)
+
+
+def inventory_rows(hospitals: int) -> int:
+    """Rows an expiry scan may fetch: every inventory lot at most once."""
+    return hospitals * SERIES_PER_HOSPITAL * LOTS_PER_SERIES
+
+
+# (test id, statement budget, rows budget by hospital count or None, call)
+BUDGETS = [
+    (
+        "transfer_recommendations_greedy",
+        4,
+        recommendation_rows,
+        lambda db: TransferService(db).generate_recommendations(mode="greedy")
+    ),
+    (
+        "transfer_recommendations_optimal",
+        4,
+        recommendation_rows,
+        lambda db: TransferService(db).generate_recommendations(mode="optimal")
+    ),
+    (
+        "transfer_recommendations_one_hospital",
+        4,
+        recommendation_rows,
+        lambda db: TransferService(db).generate_recommendations(hospital_id="H001")
+    ),
+    (
+        "transfer_approve",
+        5,
+        None,
+        lambda db: TransferService(db).approve_transfer("H001", "H002", "A+", "RBC", 60, "admin")
+    ),
+    (
+        "expiry_summary",
+        1,
+        lambda hospitals: 1,
+        lambda db: ExpiryService(db).get_expiry_summary()
+    ),
+    (
+        "expiry_high_risk_units",
+        1,
+        inventory_rows,
+        lambda db: ExpiryService(db).get_high_risk_units()
+    ),
+    (
+        "expiry_inventory_with_risk",
+        1,
+        inventory_rows,
+        lambda db: ExpiryService(db).get_inventory_with_risk_scores()
+    ),
+    (
+        "expiry_inventory_with_risk_stream",
+        1,
+        inventory_rows,
+        lambda db: [row for batch in ExpiryService(db).iter_inventory_with_risk_scores(batch_size=50) for row in batch]
+    ),
+    (
+        "donor_search_radius",
+        1,
+        None,
+        lambda db: DonorService(db).search_donors(
+            blood_group="O+",
+            eligible_only=True,
+            hospital_lat=19.0,
+            hospital_lon=72.9,
+            radius_km=30
+        )
+    )
+]
+
+
+class TestQueryBudgets:
+    """Tests that service methods issue a bounded number of statements and fetch a bounded number of rows."""
+    
+    @pytest.mark.parametrize("budget,rows_budget,call", [b[1:] for b in BUDGETS], ids=[b[0] for b in BUDGETS])
+    def test_statement_budget(self, seeded, budget, rows_budget, call):
+        """Test statements stay within budget and constant across scales, and rows fetched within the rows budget."""
+        (small, small_rows), (large, large_rows) = measure_at_scales(seeded, call)
+        
+        assert small <= budget, f"{small} statements, budget {budget}"
+        assert large == small, f"{small} statements at scale 1 but {large} at scale {SCALE_UP}"
+        
+        if rows_budget is not None:
+            for scale, rows in ((1, small_rows), (SCALE_UP, large_rows)):
+                limit = rows_budget(scale * HOSPITALS_PER_SCALE)
+                assert rows <= limit, f"{rows} rows fetched at scale {scale}, budget {limit}"
+    
+    def test_harness_detects_per_row_queries(self, seeded):
+        """Test a per-row access pattern is caught by the scale comparison."""
+        def per_hospital(db):
+            for hospital in TransferService(db).hospital_repo.get_all():
+                ExpiryService(db).get_expiry_summary(hospital.hospital_id)
+        
+        (small, _), (large, _) = measure_at_scales(seeded, per_hospital)
+        
+        assert large > small
+    
+    def test_harness_detects_unaggregated_reads(self, seeded):
+        """Test fetching raw forecast rows on top of the totals exceeds the rows budget."""
+        def raw_forecasts(db):
+            TransferService(db).generate_recommendations()
+            db.execute(sa.select(CORE_METADATA.tables['forecast_latest'])).all()
+        
+        (_, rows), _ = measure_at_scales(seeded, raw_forecasts)
+        
+        assert rows > recommendation_rows(HOSPITALS_PER_SCALE)
@@ -0,0 +1,198 @@
+"""Query-plan tests for the hot repository queries.
+
+These run against a migrated PostgreSQL database named by TEST_DATABASE_URL
+and are skipped otherwise. Sequential scans are disabled for the session,
+so a plan that still scans a table sequentially has no usable index. With
+sequential scans off Postgres takes any index it has, so every test names
+the index its query is meant to use.
+"""
+import json
+import os
+from datetime import date, timedelta
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+pytestmark = [
+    pytest.mark.integration,
+    pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL is not set")
+]
+
+INDEX_SCANS = {"Index Scan", "Index Only Scan", "Bitmap Index Scan"}
+
+
+@pytest.fixture
+def db():
+    """Session inside a transaction that is rolled back afterwards."""
+    engine = create_engine(TEST_DATABASE_URL)
+    connection = engine.connect()
+    transaction = connection.begin()
+    session = Session(bind=connection)
+    connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
+        engine.dispose()
+
+
+def plan_nodes(db, call):
+    """
+    Run a repository call and collect the plan nodes of every SELECT it issues.
+    
+    Args:
+        db: Database session
+        call: Callable issuing the queries
+        
+    Returns:
+        List of (node type, relation name, index name) tuples
+    """
+    statements = []
+    
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            statements.append((statement, parameters))
+    
+    connection = db.connection()
+    event.listen(connection, "before_cursor_execute", capture)
+    try:
+        call()
+    finally:
+        event.remove(connection, "before_cursor_execute", capture)
+    
+    assert statements, "no SELECT was issued"
+    
+    nodes = []
+    cursor = connection.connection.cursor()
+    try:
+        for statement, parameters in statements:
+            cursor.execute("EXPLAIN (FORMAT JSON) " + statement, parameters)
+            plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            stack = [plan[0]["Plan"]]
+            while stack:
+                node = stack.pop()
+                nodes.append((node["Node Type"], node.get("Relation Name"), node.get("Index Name")))
+                stack.extend(node.get("Plans", []))
+    finally:
+        cursor.close()
+    return nodes
+
+
+def assert_index_scan(nodes, table, *indexes):
+    """
+    Assert a table is read through an expected index, never sequentially.
+    
+    Args:
+        nodes: Plan nodes from ``plan_nodes``
+        table: Table the query reads
+        indexes: Index names of which the plan must scan at least one
+    """
+    assert not any(node_type == "Seq Scan" and relation == table for node_type, relation, _ in nodes), nodes
+    scanned = {index for node_type, _, index in nodes if node_type in INDEX_SCANS}
+    assert scanned & set(indexes), f"expected one of {indexes}, plan scanned {scanned or 'no index'}"
+
+
+class TestInventoryQueryPlans:
+    """Tests for inventory listing and allocation queries."""
+    
+    def test_filtered_page(self, db):
+        """Test a fully filtered inventory page uses the series index."""
+        from backend.app.repositories.inventory import InventoryRepository
+        from backend.app.schemas.inventory import InventoryFilters
+        
+        filters = InventoryFilters(hospital_id="H001", blood_group="A+", component="RBC")
+        nodes = plan_nodes(db, lambda: InventoryRepository(db).get_page(filters, limit=50))
+        
+        assert_index_scan(nodes, "inventory", "idx_inventory_hospital_group_component_expiry")
+    
+    def test_unfiltered_page(self, db):
+        """Test the national inventory page walks the keyset index."""
+        from backend.app.repositories.inventory import InventoryRepository
+        
+        nodes = plan_nodes(db, lambda: InventoryRepository(db).get_page(limit=50))
+        
+        assert_index_scan(nodes, "inventory", "idx_inventory_expiry_record")
+    
+    def test_series_by_expiry(self, db):
+        """Test the oldest-first allocation read uses the series index."""
+        from backend.app.repositories.inventory import InventoryRepository
+        
+        nodes = plan_nodes(db, lambda: InventoryRepository(db).get_series_by_expiry("H001", "A+", "RBC"))
+        
+        assert_index_scan(nodes, "inventory", "idx_inventory_hospital_group_component_expiry")
+    
+    def test_earliest_expiry_lots(self, db):
+        """Test earliest-expiry lots for a hospital use the series index."""
+        from backend.app.repositories.inventory import InventoryRepository
+        
+        nodes = plan_nodes(db, lambda: InventoryRepository(db).get_earliest_expiry_lots("H001"))
+        
+        assert_index_scan(
+            nodes,
+            "inventory",
+            "idx_inventory_hospital_group_component_expiry",
+            "idx_inventory_hospital_expiry"
+        )
+    
+    def test_unit_totals(self, db):
+        """Test unit totals for a hospital use the series index."""
+        from backend.app.repositories.inventory import InventoryRepository
+        
+        nodes = plan_nodes(db, lambda: InventoryRepository(db).get_unit_totals("H001"))
+        
+        assert_index_scan(nodes, "inventory", "idx_inventory_hospital_group_component_expiry")
+
+
+class TestOtherQueryPlans:
+    """Tests for donor, forecast, transfer and usage queries."""
+    
+    def test_eligible_donor_search(self, db):
+        """Test eligible donors by blood group use the partial index."""
+        from backend.app.repositories.donor import DonorRepository
+        
+        nodes = plan_nodes(db, lambda: DonorRepository(db).search_donors(blood_group="O-", eligible_only=True))
+        
+        assert_index_scan(nodes, "donors", "idx_donors_eligible_blood_group")
+    
+    def test_forecasts_by_series(self, db):
+        """Test forecast rows of one series use the series/date index."""
+        from backend.app.repositories.forecast import ForecastRepository
+        
+        today = date.today()
+        nodes = plan_nodes(
+            db,
+            lambda: ForecastRepository(db).get_by_hospital("H001", "A+", "RBC", today, today + timedelta(days=7))
+        )
+        
+        assert_index_scan(nodes, "forecasts", "idx_forecasts_series_date")
+    
+    def test_latest_forecasts(self, db):
+        """Test the latest forecasts of a hospital use the primary key."""
+        from backend.app.repositories.forecast import ForecastRepository
+        
+        nodes = plan_nodes(db, lambda: ForecastRepository(db).get_latest("H001"))
+        
+        assert_index_scan(nodes, "forecast_latest", "pk_forecast_latest")
+    
+    def test_transfers_by_hospital(self, db):
+        """Test transfers of a hospital use the source/destination indexes."""
+        from backend.app.repositories.transfer import TransferRepository
+        
+        nodes = plan_nodes(db, lambda: TransferRepository(db).get_all(hospital_id="H001"))
+        
+        assert_index_scan(nodes, "transfers", "idx_transfers_source_created")
+        assert_index_scan(nodes, "transfers", "idx_transfers_destination_created")
+    
+    def test_daily_usage(self, db):
+        """Test daily usage of a hospital uses the hospital/date index."""
+        from backend.app.repositories.usage import UsageRepository
+        
+        nodes = plan_nodes(db, lambda: UsageRepository(db).get_aggregated_daily("H001"))
+        
+        assert_index_scan(nodes, "usage", "idx_usage_hospital_date")
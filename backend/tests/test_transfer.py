@@ -0,0 +1,267 @@
+"""Tests for greedy and optimal transfer recommendations."""
+from datetime import date, datetime, timedelta
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+from test_query_budgets import CORE_METADATA
+from backend.app import models
+from backend.app.schemas.inventory import InventoryFilters
+from backend.app.services.transfer import TransferService
+from backend.app.utils.geo import HospitalDistanceIndex
+
+TODAY = date.today()
+RADIUS_KM = 50.0
+SURPLUS_THRESHOLD = 5
+
+# H1-H3 are within 15 km of each other; H4 is about 180 km away
+HOSPITALS = [
+    ("H1", 19.00, 72.90),
+    ("H2", 19.05, 72.90),
+    ("H3", 19.10, 72.95),
+    ("H4", 20.50, 73.90)
+]
+
+# (hospital, blood group, component, lots as (units, days to expiry), forecast total)
+SERIES = [
+    # H2 has 10.5 spare O+ RBC units that both H1 (8 short) and H3 (7.5
+    # short) want; H4's surplus is out of range
+    ("H1", "O+", "RBC", [(2, 10)], 10.0),
+    ("H2", "O+", "RBC", [(6, 3), (9, 12)], 4.5),
+    ("H3", "O+", "RBC", [(1, 20)], 8.5),
+    ("H4", "O+", "RBC", [(60, 5)], 5.0),
+    # H3 has spare A+ Plasma for H1 and H2; H4 is short but out of range
+    ("H1", "A+", "Plasma", [(1, 8)], 4.0),
+    ("H2", "A+", "Plasma", [(3, 9)], 5.25),
+    ("H3", "A+", "Plasma", [(12, 2), (10, 30)], 3.0),
+    ("H4", "A+", "Plasma", [(1, 8)], 6.0)
+]
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """Session on an in-memory database holding the fixed network."""
+    engine = sa.create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    models.Base.metadata.create_all(engine)
+    CORE_METADATA.create_all(engine)
+    
+    inventory, forecasts = [], []
+    for hospital_id, blood_group, component, lots, forecast in SERIES:
+        for i, (units, days) in enumerate(lots):
+            inventory.append({
+                "record_id": f"{hospital_id}_{blood_group}_{component}_{i}",
+                "hospital_id": hospital_id,
+                "blood_group": blood_group,
+                "component": component,
+                "units": units,
+                "unit_expiry_date": TODAY + timedelta(days=days),
+                "collection_date": TODAY - timedelta(days=10)
+            })
+        forecasts.append({
+            "hospital_id": hospital_id,
+            "blood_group": blood_group,
+            "component": component,
+            "forecast_date": TODAY + timedelta(days=1),
+            "predicted_units": forecast,
+            "generated_at": datetime.now()
+        })
+    
+    with engine.begin() as connection:
+        connection.execute(models.Hospital.__table__.insert(), [
+            {"hospital_id": hospital_id, "name": f"Hospital {hospital_id}", "latitude": lat, "longitude": lon}
+            for hospital_id, lat, lon in HOSPITALS
+        ])
+        connection.execute(models.Inventory.__table__.insert(), inventory)
+        connection.execute(CORE_METADATA.tables["forecast_latest"].insert(), forecasts)
+    
+    # A private index, so hospitals of other tests cannot leak in
+    monkeypatch.setattr(
+        TransferService,
+        "distance_index",
+        lambda self: HospitalDistanceIndex(self.hospital_repo.get_all())
+    )
+    
+    session = Session(bind=engine)
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def service_for(db) -> TransferService:
+    """Transfer service with the radius and threshold the network is built for."""
+    service = TransferService(db)
+    service.radius_km = RADIUS_KM
+    service.surplus_threshold = SURPLUS_THRESHOLD
+    return service
+
+
+def reference_recommendations(service: TransferService, hospital_id=None):
+    """
+    The per-hospital loop generate_recommendations replaced.
+    
+    Every hospital, neighbour and lot is looked up on its own, exactly as
+    before the set-based matcher; only the repository calls are adapted to
+    their current signatures.
+    """
+    def deficit_and_surplus(hospital):
+        inventory_totals, forecast_totals = {}, {}
+        for inv in service.inventory_repo.get_all(InventoryFilters(hospital_id=hospital)):
+            key = f"{inv.blood_group}_{inv.component}"
+            inventory_totals[key] = inventory_totals.get(key, 0) + inv.units
+        for fc in service.forecast_repo.get_latest_forecasts(hospital_id=hospital, days=7):
+            key = f"{fc['blood_group']}_{fc['component']}"
+            forecast_totals[key] = forecast_totals.get(key, 0) + float(fc['predicted_units'])
+        
+        deficits, surpluses = [], []
+        for key in set(inventory_totals) | set(forecast_totals):
+            blood_group, component = key.split("_")
+            diff = inventory_totals.get(key, 0) - forecast_totals.get(key, 0)
+            if diff < 0:
+                deficits.append({"blood_group": blood_group, "component": component, "deficit": abs(diff)})
+            elif diff > service.surplus_threshold:
+                surpluses.append({"blood_group": blood_group, "component": component, "surplus": diff})
+        return deficits, surpluses
+    
+    def nearby_hospitals(source):
+        nearby = []
+        for hospital in service.hospital_repo.get_all():
+            if hospital.hospital_id == source.hospital_id:
+                continue
+            distance = service.haversine_distance(
+                source.latitude, source.longitude, hospital.latitude, hospital.longitude
+            )
+            if distance <= service.radius_km:
+                nearby.append({"hospital_id": hospital.hospital_id, "name": hospital.name, "distance_km": round(distance, 2)})
+        return sorted(nearby, key=lambda x: x["distance_km"])
+    
+    recommendations = []
+    if hospital_id:
+        hospitals = [service.hospital_repo.get_by_id(hospital_id)]
+    else:
+        hospitals = service.hospital_repo.get_all()
+    
+    for hospital in hospitals:
+        deficits, _ = deficit_and_surplus(hospital.hospital_id)
+        for deficit in deficits:
+            for nearby_hospital in nearby_hospitals(hospital):
+                _, surpluses = deficit_and_surplus(nearby_hospital["hospital_id"])
+                for surplus in surpluses:
+                    if (surplus["blood_group"], surplus["component"]) != (deficit["blood_group"], deficit["component"]):
+                        continue
+                    source_inv = service.inventory_repo.get_all(InventoryFilters(
+                        hospital_id=nearby_hospital["hospital_id"],
+                        blood_group=deficit["blood_group"],
+                        component=deficit["component"]
+                    ))
+                    earliest = min(source_inv, key=lambda x: x.unit_expiry_date)
+                    days_to_expiry = (earliest.unit_expiry_date - date.today()).days
+                    recommendations.append({
+                        "source_hospital_id": nearby_hospital["hospital_id"],
+                        "source_hospital_name": nearby_hospital["name"],
+                        "destination_hospital_id": hospital.hospital_id,
+                        "destination_hospital_name": hospital.name,
+                        "blood_group": deficit["blood_group"],
+                        "component": deficit["component"],
+                        "units": int(min(deficit["deficit"], surplus["surplus"], earliest.units)),
+                        "urgency_score": round(service.calculate_urgency_score(
+                            days_to_expiry=days_to_expiry,
+                            distance_km=nearby_hospital["distance_km"],
+                            surplus=surplus["surplus"]
+                        ), 3),
+                        "distance_km": nearby_hospital["distance_km"],
+                        "eta_minutes": service.calculate_eta(nearby_hospital["distance_km"]),
+                        "days_to_expiry": days_to_expiry
+                    })
+    
+    recommendations.sort(key=lambda x: x["urgency_score"], reverse=True)
+    return recommendations
+
+
+def canonical(recommendations):
+    """Recommendations in an order independent of how ties were broken."""
+    return sorted(recommendations, key=lambda r: sorted(r.items()))
+
+
+class TestGreedyRecommendations:
+    """Tests that the set-based matcher reproduces the per-hospital loop."""
+    
+    @pytest.mark.parametrize("hospital_id", [None, "H1", "H3", "H4"])
+    def test_matches_per_hospital_loop(self, db, hospital_id):
+        """Test the same recommendation dictionaries come back, sorted by urgency."""
+        service = service_for(db)
+        expected = reference_recommendations(service, hospital_id)
+        actual = service.generate_recommendations(hospital_id=hospital_id, mode="greedy")
+        
+        assert canonical(actual) == canonical(expected)
+        assert [r["urgency_score"] for r in actual] == [r["urgency_score"] for r in expected]
+    
+    def test_network_has_contested_surplus(self, db):
+        """Test the fixture exercises a surplus promised to two destinations."""
+        recommendations = service_for(db).generate_recommendations(mode="greedy")
+        promised = [r["units"] for r in recommendations if (r["source_hospital_id"], r["blood_group"]) == ("H2", "O+")]
+        
+        assert len(promised) == 2
+        assert sum(promised) > 10
+
+
+class TestOptimalAllocation:
+    """Tests for the linear-programming allocation plan."""
+    
+    @pytest.fixture
+    def plan(self, db):
+        """Optimal plan for the fixed network, with its balances."""
+        service = service_for(db)
+        deficits, surpluses = service.calculate_balance_matrices()
+        return service.generate_recommendations(mode="optimal"), deficits, surpluses
+    
+    def test_sources_ship_at_most_their_whole_surplus(self, plan):
+        """Test no source ships more than floor(surplus) of a product."""
+        recommendations, _, surpluses = plan
+        shipped = {}
+        for r in recommendations:
+            key = (r["source_hospital_id"], r["blood_group"], r["component"])
+            shipped[key] = shipped.get(key, 0) + r["units"]
+        
+        assert shipped
+        for key, units in shipped.items():
+            assert units <= int(surpluses[key])
+    
+    def test_destinations_get_at_most_their_rounded_up_deficit(self, plan):
+        """Test no destination receives more than ceil(deficit) of a product."""
+        recommendations, deficits, _ = plan
+        received = {}
+        for r in recommendations:
+            key = (r["destination_hospital_id"], r["blood_group"], r["component"])
+            received[key] = received.get(key, 0) + r["units"]
+        
+        for key, units in received.items():
+            assert units <= -int(-deficits[key] // 1)
+    
+    def test_nothing_shipped_beyond_radius(self, plan):
+        """Test every transfer stays within the transfer radius."""
+        recommendations, _, _ = plan
+        
+        assert all(r["distance_km"] <= RADIUS_KM for r in recommendations)
+        assert all("H4" not in (r["source_hospital_id"], r["destination_hospital_id"]) for r in recommendations)
+    
+    def test_contested_surplus_is_not_promised_twice(self, plan):
+        """Test the 10 spare O+ RBC units at H2 are split, not given to both H1 and H3."""
+        recommendations, _, _ = plan
+        from_h2 = {
+            r["destination_hospital_id"]: r["units"]
+            for r in recommendations
+            if (r["source_hospital_id"], r["blood_group"], r["component"]) == ("H2", "O+", "RBC")
+        }
+        
+        assert sum(from_h2.values()) == 10
+        assert set(from_h2) == {"H1", "H3"}
+    
+    def test_units_are_whole_and_positive(self, plan):
+        """Test the plan ships whole units on every recommended pair."""
+        recommendations, _, _ = plan
+        
+        assert all(isinstance(r["units"], int) and r["units"] > 0 for r in recommendations)